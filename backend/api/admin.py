@@ -3,8 +3,9 @@ from mysql.connector import Error
 from typing import Optional
 
 # Import the database connection and security functions from your project
-from database.connection import get_db_connection
-from core.security import hash_password, verify_password
+from database.connection import db_connection
+from database.audit import record_login
+from core.security import hash_password, verify_password, needs_rehash, HashingBusyError
 
 # Configure logging for the admin module
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -15,6 +16,8 @@ class Admin:
     including registration, authentication, and logging activities.
     """
 
+    __slots__ = ('ad_ID', 'name', 'username')
+
     def __init__(self, ad_ID, name, username):
         """Initializes an Admin object with data for an existing administrator."""
         self.ad_ID = ad_ID  # CORRECTED: Attribute now matches database column
@@ -34,11 +37,7 @@ class Admin:
         """
         query = "SELECT username FROM ADMIN WHERE username = %s"
         try:
-            conn = get_db_connection()
-            if conn is None:
-                logging.error("Failed to establish database connection.")
-                return False
-            with conn.cursor() as cursor:
+            with db_connection() as conn, conn.cursor() as cursor:
                 cursor.execute(query, (username,))
                 return cursor.fetchone() is not None
         except Error as e:
@@ -69,11 +68,7 @@ class Admin:
         query = "INSERT INTO ADMIN (name, username, password) VALUES (%s, %s, %s)"
         
         try:
-            conn = get_db_connection()
-            if conn is None:
-                logging.error("Failed to establish database connection.")
-                return None
-            with conn.cursor() as cursor:
+            with db_connection() as conn, conn.cursor() as cursor:
                 cursor.execute(query, (name, username, hashed_pw))
                 conn.commit()
                 admin_id = cursor.lastrowid
@@ -98,11 +93,7 @@ class Admin:
         query = "SELECT ad_ID, name, username, password FROM ADMIN WHERE username = %s"
         
         try:
-            conn = get_db_connection()
-            if conn is None:
-                logging.error("Failed to establish database connection.")
-                return None
-            with conn.cursor() as cursor:
+            with db_connection() as conn, conn.cursor() as cursor:
                 cursor.execute(query, (username,))
                 result = cursor.fetchone()
 
@@ -117,6 +108,9 @@ class Admin:
                     logging.info(f"Login successful for admin: {name} ({username})")
                     # Log the successful login attempt
                     cls._log_activity(admin_id, "Login Successful")
+                    # Transparently upgrade hashes made with an older bcrypt cost
+                    if needs_rehash(hashed_password):
+                        cls._rehash_password(admin_id, password)
                     return cls(ad_ID=admin_id, name=name, username=db_username)
                 else:
                     logging.warning(f"Admin login failed: Invalid password for {username}")
@@ -127,6 +121,19 @@ class Admin:
             logging.error(f"Database error during admin authentication for {username}: {e}")
             return None
 
+    @staticmethod
+    def _rehash_password(admin_id: int, password: str):
+        """Private helper to re-hash a password stored with an outdated bcrypt work factor."""
+        query = "UPDATE ADMIN SET password = %s WHERE ad_ID = %s"
+        try:
+            with db_connection() as conn, conn.cursor() as cursor:
+                cursor.execute(query, (hash_password(password), admin_id))
+                conn.commit()
+                logging.info(f"Upgraded password hash for admin ID {admin_id}.")
+        except (Error, HashingBusyError) as e:
+            # Best effort: the login already succeeded, the upgrade is retried next time
+            logging.warning(f"Could not upgrade password hash for admin ID {admin_id}: {e}")
+
     @staticmethod
     def _log_activity(admin_id: int, status: str):
         """
@@ -136,15 +143,6 @@ class Admin:
             admin_id (int): The ID of the admin attempting to log in.
             status (str): The result of the login attempt (e.g., "Login Successful").
         """
-        query = "INSERT INTO ALD (ad_id, login_status) VALUES (%s, %s)"
-        try:
-            conn = get_db_connection()
-            if conn is None:
-                logging.error("Failed to establish database connection.")
-                return None
-            with conn.cursor() as cursor:
-                cursor.execute(query, (admin_id, status))
-                conn.commit()
-        except Error as e:
-            logging.error(f"Failed to log activity for admin ID {admin_id}: {e}")
+        # Queued for the background audit writer so the login doesn't wait on the INSERT
+        record_login('ALD', admin_id, status)
 
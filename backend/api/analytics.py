@@ -0,0 +1,251 @@
+import logging
+from datetime import date
+from mysql.connector import Error
+from typing import Optional
+
+# Import the centralized database connection
+from database.connection import db_connection
+from database.migrations import REVENUE_REBUILD
+from .user import member_stats_cache
+
+# Configure logging for the analytics module
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+class Analytics:
+    """
+    Serves dashboard aggregates from pre-aggregated rollup tables.
+
+    Rollups are maintained incrementally by triggers on their source tables
+    (`attendance_hourly` by migration 10, `revenue_monthly` by migration 4),
+    so a dashboard load only reads summary rows and its cost does not grow
+    with the raw tables.
+    """
+
+    # Columns of `revenue_monthly` that revenue can be broken down by
+    REVENUE_GROUPS = ('month', 'plan_type', 'payment_method')
+    PAYMENT_STATUSES = ('paid', 'pending', 'failed')
+
+    @staticmethod
+    def attendance_heatmap(weeks: Optional[int] = None) -> list[dict]:
+        """
+        Returns visit counts by day of week and hour of day.
+
+        Args:
+            weeks (int): Only include the most recent number of weeks. Includes all history if None.
+
+        Returns:
+            list[dict]: Rows of {day_of_week (1=Sunday), visit_hour, visits}.
+        """
+        query = '''
+            SELECT DAYOFWEEK(visit_date) AS day_of_week, visit_hour, SUM(visits) AS visits
+            FROM attendance_hourly
+        '''
+        params: tuple = ()
+        if weeks is not None:
+            query += " WHERE visit_date >= CURDATE() - INTERVAL %s WEEK"
+            params = (weeks,)
+        query += " GROUP BY day_of_week, visit_hour ORDER BY day_of_week, visit_hour"
+
+        try:
+            with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+                cursor.execute(query, params)
+                return [
+                    {
+                        "day_of_week": int(row['day_of_week']),
+                        "visit_hour": int(row['visit_hour']),
+                        "visits": int(row['visits'])
+                    }
+                    for row in cursor.fetchall()
+                ]
+        except Error as e:
+            logging.error(f"Database error while building the attendance heatmap: {e}")
+        return []
+
+    # --- Members ---
+    # Served through `member_stats_cache`, which Member writes invalidate.
+
+    @staticmethod
+    def member_growth(months: int = 12) -> list[dict]:
+        """
+        Returns the number of members who joined in each of the last `months` calendar months.
+
+        Months are bucketed in SQL over the join_date index; months with no
+        new members are included with a count of 0.
+
+        Returns:
+            list[dict]: Rows of {month ('YYYY-MM'), new_members}, oldest first.
+        """
+        return member_stats_cache.get_or_load(('growth', months), lambda: Analytics._load_member_growth(months)) or []
+
+    @staticmethod
+    def member_plans() -> list[dict]:
+        """
+        Returns the number of members on each membership plan.
+
+        Returns:
+            list[dict]: Rows of {membership_plan, count}, largest plan first.
+        """
+        return member_stats_cache.get_or_load('plans', Analytics._load_member_plans) or []
+
+    # --- Revenue ---
+    # `revenue_monthly` is kept current by triggers on `payments` (migration 4),
+    # so these reads never scan the payments table.
+
+    @staticmethod
+    def rebuild_revenue_summary() -> Optional[dict]:
+        """
+        Recomputes `revenue_monthly` from every row in `payments`.
+
+        Needed only for history loaded while the triggers were missing (e.g. a
+        bulk restore with triggers disabled). The rebuild runs in one
+        transaction with `payments` read-locked, so payments written meanwhile
+        wait for it and are then added by their trigger; none are lost or
+        counted twice.
+
+        Returns:
+            dict: Summary row and payment counts, or None on a database error.
+        """
+        try:
+            with db_connection() as conn, conn.cursor() as cursor:
+                REVENUE_REBUILD(cursor)
+                cursor.execute("SELECT COUNT(*), COALESCE(SUM(payments), 0) FROM revenue_monthly")
+                summary_rows, payments = cursor.fetchone()
+                conn.commit()
+                logging.info(f"Revenue summary rebuilt from {payments} payments.")
+                return {"summary_rows": int(summary_rows), "payments": int(payments)}
+        except Error as e:
+            logging.error(f"Database error while rebuilding the revenue summary: {e}")
+        return None
+
+    @staticmethod
+    def revenue_breakdown(group_by: str, months: Optional[int] = None) -> list[dict]:
+        """
+        Returns revenue totals and payment counts per status, grouped by month, plan type or payment method.
+
+        Args:
+            group_by (str): One of REVENUE_GROUPS.
+            months (int): Only include the most recent number of calendar months. Includes all history if None.
+
+        Returns:
+            list[dict]: Rows of {<group_by>, paid_total, paid_count, pending_total,
+            pending_count, failed_total, failed_count}.
+        """
+        if group_by not in Analytics.REVENUE_GROUPS:
+            raise ValueError(f"Cannot group revenue by {group_by}")
+
+        query = f"SELECT {group_by} AS grp, status, SUM(total) AS total, SUM(payments) AS payments FROM revenue_monthly"
+        params: tuple = ()
+        if months is not None:
+            query += " WHERE month >= CURDATE() - INTERVAL (DAYOFMONTH(CURDATE()) - 1) DAY - INTERVAL %s MONTH"
+            params = (months - 1,)
+        query += " GROUP BY grp, status HAVING SUM(payments) > 0 ORDER BY grp"
+
+        try:
+            with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+                cursor.execute(query, params)
+                groups: dict = {}
+                for row in cursor.fetchall():
+                    key = row['grp'].strftime('%Y-%m') if group_by == 'month' else (row['grp'] or None)
+                    entry = groups.setdefault(key, Analytics._empty_revenue_row(group_by, key))
+                    if row['status'] in Analytics.PAYMENT_STATUSES:
+                        entry[f"{row['status']}_total"] = float(row['total'])
+                        entry[f"{row['status']}_count"] = int(row['payments'])
+                return list(groups.values())
+        except Error as e:
+            logging.error(f"Database error while reading revenue by {group_by}: {e}")
+        return []
+
+    @staticmethod
+    def unsettled_revenue(months: Optional[int] = None) -> list[dict]:
+        """
+        Returns pending and failed payments by month, plan type and payment method.
+
+        Args:
+            months (int): Only include the most recent number of calendar months. Includes all history if None.
+
+        Returns:
+            list[dict]: Rows of {month, status, plan_type, payment_method, total, count}, newest month first.
+        """
+        query = '''
+            SELECT month, status, plan_type, payment_method, total, payments
+            FROM revenue_monthly
+            WHERE status IN ('pending', 'failed') AND payments > 0
+        '''
+        params: tuple = ()
+        if months is not None:
+            query += " AND month >= CURDATE() - INTERVAL (DAYOFMONTH(CURDATE()) - 1) DAY - INTERVAL %s MONTH"
+            params = (months - 1,)
+        query += " ORDER BY month DESC, status, total DESC"
+
+        try:
+            with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+                cursor.execute(query, params)
+                return [
+                    {
+                        "month": row['month'].strftime('%Y-%m'),
+                        "status": row['status'],
+                        "plan_type": row['plan_type'] or None,
+                        "payment_method": row['payment_method'] or None,
+                        "total": float(row['total']),
+                        "count": int(row['payments'])
+                    }
+                    for row in cursor.fetchall()
+                ]
+        except Error as e:
+            logging.error(f"Database error while reading unsettled revenue: {e}")
+        return []
+
+    # --- Private Helper Methods ---
+
+    @staticmethod
+    def _load_member_growth(months: int) -> Optional[list]:
+        """Private helper that runs the growth query. Returns None on a database error so it isn't cached."""
+        query = '''
+            SELECT join_date - INTERVAL (DAYOFMONTH(join_date) - 1) DAY AS month, COUNT(*) AS new_members
+            FROM Members
+            WHERE join_date >= CURDATE() - INTERVAL (DAYOFMONTH(CURDATE()) - 1) DAY - INTERVAL %s MONTH
+            GROUP BY month
+        '''
+        try:
+            with db_connection() as conn, conn.cursor() as cursor:
+                cursor.execute(query, (months - 1,))
+                counts = {month: int(new_members) for month, new_members in cursor.fetchall()}
+        except Error as e:
+            logging.error(f"Database error while reading member growth: {e}")
+            return None
+
+        today = date.today()
+        result = []
+        for offset in range(months - 1, -1, -1):
+            year, month = divmod(today.year * 12 + today.month - 1 - offset, 12)
+            bucket = date(year, month + 1, 1)
+            result.append({"month": bucket.strftime('%Y-%m'), "new_members": counts.get(bucket, 0)})
+        return result
+
+    @staticmethod
+    def _load_member_plans() -> Optional[list]:
+        """Private helper that runs the plan distribution query. Returns None on a database error so it isn't cached."""
+        query = '''
+            SELECT membership_plan, COUNT(*) AS count
+            FROM Members
+            GROUP BY membership_plan
+            ORDER BY count DESC
+        '''
+        try:
+            with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+                cursor.execute(query)
+                return [
+                    {"membership_plan": row['membership_plan'], "count": int(row['count'])}
+                    for row in cursor.fetchall()
+                ]
+        except Error as e:
+            logging.error(f"Database error while reading the membership plan distribution: {e}")
+        return None
+
+    @staticmethod
+    def _empty_revenue_row(group_by: str, key) -> dict:
+        row = {group_by: key}
+        for status in Analytics.PAYMENT_STATUSES:
+            row[f"{status}_total"] = 0.0
+            row[f"{status}_count"] = 0
+        return row
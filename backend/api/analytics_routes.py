@@ -0,0 +1,122 @@
+from flask import Blueprint, request, jsonify
+from .auth_routes import token_required
+from .analytics import Analytics
+from .forecast import forecaster
+
+# Create a Blueprint for dashboard analytics routes
+analytics_bp = Blueprint('analytics_bp', __name__)
+
+def _months_arg():
+    """Parses the optional `months` query parameter. Returns (months, error_response)."""
+    months = request.args.get('months')
+    if months is None:
+        return None, None
+    try:
+        months = int(months)
+    except ValueError:
+        return None, (jsonify({"error": "months must be an integer"}), 400)
+    if months < 1:
+        return None, (jsonify({"error": "months must be positive"}), 400)
+    return months, None
+
+@analytics_bp.route('/attendance/heatmap', methods=['GET'])
+@token_required
+def attendance_heatmap(current_user):
+    """
+    API endpoint for gym traffic by day of week and hour of day.
+    Optional query parameter `weeks` limits the result to recent history.
+    """
+    if current_user.get('role') != 'admin':
+        return jsonify({"error": "Unauthorized access"}), 403
+
+    weeks = request.args.get('weeks')
+    if weeks is not None:
+        try:
+            weeks = int(weeks)
+        except ValueError:
+            return jsonify({"error": "weeks must be an integer"}), 400
+        if weeks < 1:
+            return jsonify({"error": "weeks must be positive"}), 400
+
+    return jsonify(Analytics.attendance_heatmap(weeks)), 200
+
+@analytics_bp.route('/traffic/forecast', methods=['GET'])
+@token_required
+def traffic_forecast(current_user):
+    """
+    API endpoint for predicted visits per hour over the next `days` days (default 7, max 28).
+    Served from the model trained offline by train_forecast.py.
+    """
+    if current_user.get('role') != 'admin':
+        return jsonify({"error": "Unauthorized access"}), 403
+
+    try:
+        days = int(request.args.get('days', 7))
+    except ValueError:
+        return jsonify({"error": "days must be an integer"}), 400
+    if not 1 <= days <= 28:
+        return jsonify({"error": "days must be between 1 and 28"}), 400
+
+    result = forecaster.forecast(days)
+    if result is None:
+        return jsonify({"error": "Forecast model has not been trained yet"}), 503
+    return jsonify(result), 200
+
+@analytics_bp.route('/growth/members', methods=['GET'])
+@token_required
+def member_growth(current_user):
+    """
+    API endpoint for new members per month. Optional query parameter
+    `months` sets how many recent calendar months to return (default 12, max 120).
+    """
+    if current_user.get('role') != 'admin':
+        return jsonify({"error": "Unauthorized access"}), 403
+
+    months, error = _months_arg()
+    if error:
+        return error
+
+    return jsonify(Analytics.member_growth(min(months or 12, 120))), 200
+
+@analytics_bp.route('/members/plans', methods=['GET'])
+@token_required
+def member_plans(current_user):
+    """API endpoint for the number of members on each membership plan."""
+    if current_user.get('role') != 'admin':
+        return jsonify({"error": "Unauthorized access"}), 403
+
+    return jsonify(Analytics.member_plans()), 200
+
+@analytics_bp.route('/revenue/<any(monthly, plans, methods):breakdown>', methods=['GET'])
+@token_required
+def revenue(current_user, breakdown):
+    """
+    API endpoint for revenue totals by month, plan type or payment method,
+    split into paid, pending and failed. Optional query parameter `months`
+    limits the result to recent calendar months.
+    """
+    if current_user.get('role') != 'admin':
+        return jsonify({"error": "Unauthorized access"}), 403
+
+    months, error = _months_arg()
+    if error:
+        return error
+
+    group_by = {'monthly': 'month', 'plans': 'plan_type', 'methods': 'payment_method'}[breakdown]
+    return jsonify(Analytics.revenue_breakdown(group_by, months)), 200
+
+@analytics_bp.route('/revenue/unsettled', methods=['GET'])
+@token_required
+def unsettled_revenue(current_user):
+    """
+    API endpoint for pending and failed payments by month, plan type and payment method.
+    Optional query parameter `months` limits the result to recent calendar months.
+    """
+    if current_user.get('role') != 'admin':
+        return jsonify({"error": "Unauthorized access"}), 403
+
+    months, error = _months_arg()
+    if error:
+        return error
+
+    return jsonify(Analytics.unsettled_revenue(months)), 200
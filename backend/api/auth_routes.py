@@ -1,16 +1,29 @@
 from flask import Blueprint, request, jsonify, current_app
 from functools import wraps
 import jwt
+import os
 from datetime import datetime, timedelta
 
+from core.token_cache import TokenCache
+from core.security import HashingBusyError
+
 # Import the data model classes from your other api files
 from .user import Member
 from .admin import Admin
 from .employee import Employee
+from .password_reset import PasswordReset, MIN_PASSWORD_LENGTH
 
 # A Blueprint organizes a group of related routes.
 auth_bp = Blueprint('auth_bp', __name__)
 
+# Verified token claims, so repeat requests with the same token skip jwt.decode
+token_cache = TokenCache(max_size=int(os.getenv('TOKEN_CACHE_SIZE', '1024')))
+
+@auth_bp.errorhandler(HashingBusyError)
+def hashing_busy(e):
+    """Login and registration answer 503 instead of queueing forever when bcrypt is saturated."""
+    return jsonify({"error": "Server is busy, please try again shortly"}), 503, {'Retry-After': '1'}
+
 def token_required(f):
     """
     Decorator to protect routes with JWT (JSON Web Token) authentication.
@@ -29,15 +42,19 @@ def token_required(f):
         if not token:
             return jsonify({'message': 'Authentication token is missing!'}), 401
 
-        try:
-            # Decode the token using the secret key from the app config
-            data = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256']) # CORRECTED ALGORITHM
-            # The decoded data (user info) is passed to the route
-            current_user = data
-        except jwt.ExpiredSignatureError:
-            return jsonify({'message': 'Token has expired!'}), 401
-        except jwt.InvalidTokenError:
-            return jsonify({'message': 'Token is invalid!'}), 401
+        secret = current_app.config['SECRET_KEY']
+        current_user = token_cache.get(secret, token)
+        if current_user is None:
+            try:
+                # Decode the token using the secret key from the app config
+                data = jwt.decode(token, secret, algorithms=['HS256']) # CORRECTED ALGORITHM
+                # The decoded data (user info) is passed to the route
+                current_user = data
+            except jwt.ExpiredSignatureError:
+                return jsonify({'message': 'Token has expired!'}), 401
+            except jwt.InvalidTokenError:
+                return jsonify({'message': 'Token is invalid!'}), 401
+            token_cache.put(secret, token, current_user)
 
         return f(current_user, *args, **kwargs)
 
@@ -161,3 +178,41 @@ def login_employee():
     
     return jsonify({'message': 'Login successful', 'token': token})
 
+
+@auth_bp.route('/forgot-password', methods=['POST'])
+def forgot_password():
+    """
+    API endpoint for members to request a password reset email.
+
+    Always answers the same way whether or not the email is registered. The
+    email itself is sent in the background from the mail outbox.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+    if not isinstance(data.get('email'), str) or not data['email'].strip():
+        return jsonify({"error": "Missing email"}), 400
+
+    if not PasswordReset.request_reset(data['email'].strip()):
+        return jsonify({"error": "Could not process the request. Please try again."}), 500
+    return jsonify({"message": "If that email is registered, a reset link has been sent."}), 200
+
+
+@auth_bp.route('/reset-password', methods=['POST'])
+def reset_password():
+    """API endpoint that sets a new member password using the token from a reset email."""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+    if not isinstance(data.get('token'), str) or not data['token']:
+        return jsonify({"error": "Invalid or expired reset link"}), 400
+    new_password = data.get('new_password')
+    if not isinstance(new_password, str) or len(new_password) < MIN_PASSWORD_LENGTH:
+        return jsonify({"error": f"Password must be at least {MIN_PASSWORD_LENGTH} characters"}), 422
+
+    result = PasswordReset.reset(data['token'], new_password)
+    if result is None:
+        return jsonify({"error": "Could not reset the password. Please try again."}), 500
+    if not result:
+        return jsonify({"error": "Invalid or expired reset link"}), 400
+    return jsonify({"message": "Password has been reset. You can now log in."}), 200
@@ -3,8 +3,10 @@ from mysql.connector import Error
 from typing import Optional
 
 # Import the centralized database connection and security functions
-from database.connection import get_db_connection
-from core.security import hash_password, verify_password
+from database.connection import db_connection
+from database.audit import record_login
+from core.security import hash_password, verify_password, needs_rehash, HashingBusyError
+from core.serialization import ColumnMap
 
 # Configure logging for the employee module
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -15,6 +17,11 @@ class Employee:
     including registration, authentication, and activity logging.
     """
 
+    # Columns returned by the employee listing, keyed by their API field name
+    LIST_COLUMNS = ColumnMap({'user_id': 'user_id', 'name': 'name', 'email': 'email', 'role': 'role'})
+
+    __slots__ = ('user_id', 'name', 'email', 'password', 'role', 'salary', 'join_date')
+
     def __init__(self, user_id, name, email, password, role, salary=0, join_date=None):
         """Initializes an Employee object with data for an existing employee."""
         self.user_id = user_id
@@ -30,11 +37,7 @@ class Employee:
         """Checks if an employee with the given email already exists."""
         query = "SELECT email FROM Employee WHERE email = %s"
         try:
-            conn = get_db_connection()
-            if conn is None:
-                logging.error("Failed to establish database connection.")
-                return False
-            with conn.cursor() as cursor:
+            with db_connection() as conn, conn.cursor() as cursor:
                 cursor.execute(query, (email,))
                 return cursor.fetchone() is not None
         except Error as e:
@@ -52,11 +55,7 @@ class Employee:
         query = "INSERT INTO Employee (name, email, password, role, salary) VALUES (%s, %s, %s, %s, %s)"
         
         try:
-            conn = get_db_connection()
-            if conn is None:
-                logging.error("Failed to establish database connection.")
-                return None
-            with conn.cursor(dictionary=True) as cursor:
+            with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
                 cursor.execute(query, (name, email, hashed_pw, role, salary))
                 conn.commit()
                 user_id = cursor.lastrowid
@@ -73,11 +72,7 @@ class Employee:
         """Authenticates an employee by verifying their email and password."""
         query = "SELECT * FROM Employee WHERE email = %s"
         try:
-            conn = get_db_connection()
-            if conn is None:         
-                logging.error("Failed to establish database connection.")
-                return None
-            with conn.cursor(dictionary=True) as cursor:
+            with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
                 cursor.execute(query, (email,))
                 result = cursor.fetchone()
                 
@@ -88,6 +83,8 @@ class Employee:
                 if verify_password(password, result['password']):
                     logging.info(f"Login successful for employee: {result['name']} ({email})")
                     cls._log_activity(result['user_id'], "Login Successful")
+                    if needs_rehash(result['password']):
+                        cls._rehash_password(result['user_id'], password)
                     # Unpack the full dictionary into the constructor
                     return cls(**result)
                 else:
@@ -104,11 +101,7 @@ class Employee:
         employees_list = []
         query = "SELECT * FROM Employee ORDER BY name ASC"
         try:
-            conn = get_db_connection()
-            if conn is None:
-                logging.error("Failed to establish database connection.")
-                return []
-            with conn.cursor(dictionary=True) as cursor:
+            with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
                 cursor.execute(query)
                 res = cursor.fetchall()
                 if res:
@@ -118,16 +111,29 @@ class Employee:
             logging.error(f"Database error fetching all employees: {e}")
         return employees_list
 
+    @staticmethod
+    def get_all_json() -> Optional[bytes]:
+        """
+        Returns the employee listing (LIST_COLUMNS, ordered by name) encoded as a JSON array.
+
+        Returns:
+            bytes: The JSON body, or None if a database error occurred.
+        """
+        query = f"SELECT {Employee.LIST_COLUMNS.select_list} FROM Employee ORDER BY name ASC"
+        try:
+            with db_connection() as conn, conn.cursor() as cursor:
+                cursor.execute(query)
+                return Employee.LIST_COLUMNS.encode(cursor.fetchall())
+        except Error as e:
+            logging.error(f"Database error fetching all employees: {e}")
+        return None
+
     @staticmethod
     def find_by_id(user_id: int) -> Optional['Employee']:
         """Finds a single employee by their user_id."""
         query = "SELECT * FROM Employee WHERE user_id = %s"
         try:
-            conn = get_db_connection()
-            if conn is None:    
-                logging.error("Failed to establish database connection.")
-                return None
-            with conn.cursor(dictionary=True) as cursor:
+            with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
                 cursor.execute(query, (user_id,))
                 result = cursor.fetchone()
                 if result:
@@ -156,11 +162,7 @@ class Employee:
         values.append(user_id)
 
         try:
-            conn = get_db_connection()
-            if conn is None:    
-                logging.error("Failed to establish database connection.")
-                return None
-            with conn.cursor() as cursor:
+            with db_connection() as conn, conn.cursor() as cursor:
                 cursor.execute(query, tuple(values))
                 conn.commit()
                 if cursor.rowcount > 0:
@@ -177,11 +179,7 @@ class Employee:
         """Deletes an employee from the database."""
         query = "DELETE FROM Employee WHERE user_id = %s"
         try:
-            conn = get_db_connection()
-            if conn is None:    
-                logging.error("Failed to establish database connection.")
-                return False
-            with conn.cursor() as cursor:
+            with db_connection() as conn, conn.cursor() as cursor:
                 cursor.execute(query, (user_id,))
                 conn.commit()
                 return cursor.rowcount > 0
@@ -190,17 +188,20 @@ class Employee:
         return False
 
     @staticmethod
-    def _log_activity(employee_id: int, status: str):
-        """Private helper to log employee login attempts."""
-        query = "INSERT INTO ELD (emp_id, login_status) VALUES (%s, %s)"
+    def _rehash_password(user_id: int, password: str):
+        """Private helper to re-hash a password stored with an outdated bcrypt work factor."""
+        query = "UPDATE Employee SET password = %s WHERE user_id = %s"
         try:
-            conn = get_db_connection()
-            if conn is None:    
-                logging.error("Failed to establish database connection.")
-                return None
-            with conn.cursor() as cursor:
-                cursor.execute(query, (employee_id, status))
+            with db_connection() as conn, conn.cursor() as cursor:
+                cursor.execute(query, (hash_password(password), user_id))
                 conn.commit()
-        except Error as e:
-            logging.error(f"Failed to log activity for employee ID {employee_id}: {e}")
+                logging.info(f"Upgraded password hash for employee ID {user_id}.")
+        except (Error, HashingBusyError) as e:
+            # Best effort: the login already succeeded, the upgrade is retried next time
+            logging.warning(f"Could not upgrade password hash for employee ID {user_id}: {e}")
+
+    @staticmethod
+    def _log_activity(employee_id: int, status: str):
+        """Private helper to log employee login attempts (written in the background)."""
+        record_login('ELD', employee_id, status)
 
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from .auth_routes import token_required
+from core.serialization import json_response
 from .employee import Employee
 
 # Create a Blueprint for employee-related routes
@@ -13,15 +14,11 @@ def get_all_employees(current_user):
     if current_user.get('role') != 'admin':
         return jsonify({"error": "Unauthorized access"}), 403
 
-    employees = Employee.get_all()
-    
-    # Convert the list of Employee objects into a list of dictionaries
-    employees_list = [
-        {"user_id": emp.user_id, "name": emp.name, "email": emp.email, "role": emp.role} 
-        for emp in employees
-    ]
-    
-    return jsonify(employees_list), 200
+    # Tuple rows are encoded straight to JSON; no Employee objects or per-row dicts
+    body = Employee.get_all_json()
+    if body is None:
+        return jsonify({"error": "Failed to load employees"}), 500
+    return json_response(body)
 
 @employee_bp.route('/<int:employee_id>', methods=['GET'])
 @token_required
@@ -1,19 +1,31 @@
+import hashlib
 import logging
+import os
 from mysql.connector import Error
 from typing import Optional
 
-# Import the centralized database connection
-from database.connection import get_db_connection
+# Import the centralized database connection and the result cache
+from database.connection import db_connection
+from core.cache import ResultCache
+from core.serialization import ColumnMap
 
 # Configure logging for the equipment module
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# The catalogue changes rarely, so the serialized list is cached between writes
+catalogue_cache = ResultCache(ttl=float(os.getenv('EQUIPMENT_CACHE_TTL', '60')))
+
 class Equipment:
     """
     Represents a piece of gym equipment and handles all related database
     operations (CRUD - Create, Read, Update, Delete).
     """
 
+    # Every column, in catalogue order; the catalogue JSON uses the column names as keys
+    COLUMNS = ColumnMap({name: name for name in ('e_code', 'e_name', 'e_qty', 'e_unit_price', 'e_category')})
+
+    __slots__ = ('e_code', 'e_name', 'e_qty', 'e_unit_price', 'e_category')
+
     def __init__(self, e_code, e_name, e_qty, e_unit_price, e_category):
         """Initializes an Equipment object."""
         self.e_code = e_code
@@ -22,17 +34,17 @@ class Equipment:
         self.e_unit_price = e_unit_price
         self.e_category = e_category
 
+    def to_dict(self) -> dict:
+        """Returns the equipment as a JSON-ready dict keyed by column name."""
+        return {key: getattr(self, key) for key in Equipment.COLUMNS.keys}
+
     @staticmethod
     def get_all() -> list['Equipment']:
         """Retrieves all equipment from the database."""
         equipment_list = []
         query = "SELECT * FROM Equipment ORDER BY e_name ASC"
         try:
-            conn = get_db_connection()
-            if conn is None:
-                logging.error("Failed to establish database connection.")
-                return []
-            with conn.cursor(dictionary=True) as cursor:
+            with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
                 cursor.execute(query)
                 res = cursor.fetchall()
                 if res:
@@ -42,16 +54,51 @@ class Equipment:
             logging.error(f"Database error fetching all equipment: {e}")
         return equipment_list
 
+    @staticmethod
+    def get_all_json() -> Optional[tuple]:
+        """
+        Returns the equipment catalogue serialized as JSON, served from the cache when possible.
+
+        Returns:
+            tuple: (body bytes, ETag derived from the body), or None if the catalogue could not be loaded.
+        """
+        return catalogue_cache.get_or_load('all', Equipment._load_catalogue_json)
+
+    @staticmethod
+    def known_ids() -> Optional[frozenset]:
+        """Returns every equipment code, cached alongside the catalogue. None if it could not be loaded."""
+        return catalogue_cache.get_or_load('ids', Equipment._load_ids)
+
+    @staticmethod
+    def _load_ids() -> Optional[frozenset]:
+        try:
+            with db_connection() as conn, conn.cursor() as cursor:
+                cursor.execute("SELECT e_code FROM Equipment")
+                return frozenset(row[0] for row in cursor.fetchall())
+        except Error as e:
+            logging.error(f"Database error fetching equipment codes: {e}")
+        return None
+
+    @staticmethod
+    def _load_catalogue_json() -> Optional[tuple]:
+        """Reads the catalogue from the database and serializes it once for the cache."""
+        query = f"SELECT {Equipment.COLUMNS.select_list} FROM Equipment ORDER BY e_name ASC"
+        try:
+            with db_connection() as conn, conn.cursor() as cursor:
+                cursor.execute(query)
+                body = Equipment.COLUMNS.encode(cursor.fetchall())
+        except Error as e:
+            logging.error(f"Database error fetching all equipment: {e}")
+            # Don't cache a failure as an empty catalogue
+            return None
+        return body, hashlib.sha1(body).hexdigest()
+
     @staticmethod
     def find_by_id(e_code: int) -> Optional['Equipment']:
         """Finds a single piece of equipment by its code."""
         query = "SELECT * FROM Equipment WHERE e_code = %s"
         try:
-            conn = get_db_connection()
-            if conn is None:
-                logging.error("Failed to establish database connection.")
-                return None
-            with conn.cursor(dictionary=True) as cursor:
+            with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
                 cursor.execute(query, (e_code,))
                 result = cursor.fetchone()
                 if result:
@@ -65,13 +112,10 @@ class Equipment:
         """Adds a new piece of equipment to the database."""
         query = "INSERT INTO Equipment (e_name, e_qty, e_unit_price, e_category) VALUES (%s, %s, %s, %s)"
         try:
-            conn = get_db_connection()
-            if conn is None:
-                logging.error("Failed to establish database connection.")
-                return None
-            with conn.cursor() as cursor:
+            with db_connection() as conn, conn.cursor() as cursor:
                 cursor.execute(query, (e_name, e_qty, e_unit_price, e_category))
                 conn.commit()
+                catalogue_cache.invalidate()
                 new_id = cursor.lastrowid
                 return Equipment(new_id, e_name, e_qty, e_unit_price, e_category)
         except Error as e:
@@ -91,13 +135,10 @@ class Equipment:
         values = list(updates.values()) + [e_code]
 
         try:
-            conn = get_db_connection()
-            if conn is None:
-                logging.error("Failed to establish database connection.")
-                return None
-            with conn.cursor() as cursor:
+            with db_connection() as conn, conn.cursor() as cursor:
                 cursor.execute(query, tuple(values))
                 conn.commit()
+                catalogue_cache.invalidate()
                 if cursor.rowcount > 0:
                     return Equipment.find_by_id(e_code)
         except Error as e:
@@ -109,13 +150,10 @@ class Equipment:
         """Deletes a piece of equipment from the database."""
         query = "DELETE FROM Equipment WHERE e_code = %s"
         try:
-            conn = get_db_connection()
-            if conn is None:
-                logging.error("Failed to establish database connection.")
-                return False
-            with conn.cursor() as cursor:
+            with db_connection() as conn, conn.cursor() as cursor:
                 cursor.execute(query, (e_code,))
                 conn.commit()
+                catalogue_cache.invalidate()
                 return cursor.rowcount > 0
         except Error as e:
             logging.error(f"Database error deleting equipment {e_code}: {e}")
@@ -1,21 +1,34 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
+from datetime import datetime, timedelta
 from .auth_routes import token_required
 from .equipment import Equipment
+from .equipment_usage import EquipmentUsage
 
 # Create a Blueprint for equipment-related routes
 equipment_bp = Blueprint('equipment_bp', __name__)
 
+# Largest batch of usage sessions accepted in one request
+MAX_USAGE_ITEMS = 5000
+# Look-back limits for the utilization endpoints, in days
+DEFAULT_USAGE_DAYS = 30
+MAX_USAGE_DAYS = 366
+
 @equipment_bp.route('/', methods=['GET'])
 @token_required
 def get_all_equipment(current_user):
     """API endpoint to get a list of all equipment."""
     # Any authenticated user (admin, employee, or member) can view equipment
-    all_equipment = Equipment.get_all()
-    
-    # Convert the list of Equipment objects into a list of dictionaries
-    equipment_list = [eq.__dict__ for eq in all_equipment]
-    
-    return jsonify(equipment_list), 200
+    catalogue = Equipment.get_all_json()
+    if catalogue is None:
+        return jsonify({"error": "Failed to load equipment"}), 500
+
+    # Serve the pre-serialized list; a matching If-None-Match gets 304 Not Modified
+    body, etag = catalogue
+    response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    # Browsers must revalidate, so a write is visible on the next load
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
 
 @equipment_bp.route('/<int:equipment_id>', methods=['GET'])
 @token_required
@@ -23,7 +36,7 @@ def get_equipment_by_id(current_user, equipment_id):
     """API endpoint to get a single piece of equipment by its ID."""
     equipment = Equipment.find_by_id(equipment_id)
     if equipment:
-        return jsonify(equipment.__dict__), 200
+        return jsonify(equipment.to_dict()), 200
     else:
         return jsonify({"error": "Equipment not found"}), 404
 
@@ -45,7 +58,7 @@ def add_equipment(current_user):
     if new_equipment:
         return jsonify({
             "message": "Equipment added successfully",
-            "equipment": new_equipment.__dict__
+            "equipment": new_equipment.to_dict()
         }), 201
     else:
         return jsonify({"error": "Failed to add equipment"}), 500
@@ -64,7 +77,7 @@ def update_equipment(current_user, equipment_id):
     updated_equipment = Equipment.update(equipment_id, data)
     
     if updated_equipment:
-        return jsonify({"message": "Equipment updated successfully", "equipment": updated_equipment.__dict__}), 200
+        return jsonify({"message": "Equipment updated successfully", "equipment": updated_equipment.to_dict()}), 200
     else:
         return jsonify({"error": "Equipment not found or update failed"}), 404
 
@@ -81,3 +94,125 @@ def delete_equipment(current_user, equipment_id):
         return jsonify({"message": f"Equipment with ID {equipment_id} deleted successfully."}), 200
     else:
         return jsonify({"error": "Equipment not found or deletion failed"}), 404
+
+# --- Usage and Utilization ---
+
+def _days_arg(default: int = DEFAULT_USAGE_DAYS):
+    """Parses the optional `days` query parameter. Returns (days, error_response)."""
+    try:
+        days = int(request.args.get('days', default))
+    except ValueError:
+        return None, (jsonify({"error": "days must be an integer"}), 400)
+    if not 1 <= days <= MAX_USAGE_DAYS:
+        return None, (jsonify({"error": f"days must be between 1 and {MAX_USAGE_DAYS}"}), 400)
+    return days, None
+
+@equipment_bp.route('/usage', methods=['POST'])
+@token_required
+def ingest_usage(current_user):
+    """
+    API endpoint for machine usage sessions reported by equipment sensors.
+
+    Accepts one session or a list of sessions:
+    {"equipment_id", "duration_mins", "used_by" (optional member id),
+     "used_at" (optional session start; defaults to now minus the duration)}.
+    Sessions are queued and batch-inserted in the background. If the queue
+    is full the response is 503 with Retry-After; the first `accepted`
+    sessions were queued and only the rest should be resent.
+    """
+    if current_user.get('role') not in ['admin', 'IT']:
+        return jsonify({"error": "Unauthorized: Only admins or IT can submit equipment usage"}), 403
+
+    data = request.get_json(silent=True)
+    if data is None:
+        return jsonify({"error": "No usage data provided"}), 400
+    sessions = data if isinstance(data, list) else [data]
+    if len(sessions) > MAX_USAGE_ITEMS:
+        return jsonify({"error": f"At most {MAX_USAGE_ITEMS} sessions per request"}), 413
+
+    known_ids = Equipment.known_ids()
+    if known_ids is None:
+        return jsonify({"error": "Equipment catalogue unavailable, try again shortly"}), 503
+
+    # Validate the whole batch before queueing any of it
+    parsed = []
+    now = datetime.now()
+    for index, session in enumerate(sessions):
+        try:
+            equipment_id = int(session['equipment_id'])
+            duration = int(session['duration_mins'])
+            used_by = int(session['used_by']) if session.get('used_by') is not None else None
+            used_at = (datetime.fromisoformat(session['used_at']) if session.get('used_at')
+                       else now - timedelta(minutes=duration))
+        except (KeyError, TypeError, ValueError):
+            return jsonify({"error": f"Session {index}: invalid equipment_id, duration_mins, used_by or used_at"}), 400
+        if equipment_id not in known_ids:
+            return jsonify({"error": f"Session {index}: unknown equipment_id {equipment_id}"}), 400
+        if not 1 <= duration <= 24 * 60:
+            return jsonify({"error": f"Session {index}: duration_mins must be between 1 and 1440"}), 400
+        parsed.append((equipment_id, used_by, used_at, duration))
+
+    accepted = 0
+    for equipment_id, used_by, used_at, duration in parsed:
+        if not EquipmentUsage.record(equipment_id, used_by, used_at, duration):
+            return jsonify({"error": "Usage queue is full, resend the sessions that were not accepted shortly",
+                            "accepted": accepted}), 503, {'Retry-After': '1'}
+        accepted += 1
+
+    return jsonify({"accepted": accepted}), 202
+
+@equipment_bp.route('/usage/hourly', methods=['GET'])
+@token_required
+def usage_by_hour(current_user):
+    """
+    API endpoint for busy minutes per machine per hour.
+    Query parameters: `days` (default 7), optional `equipment_id`.
+    """
+    if current_user.get('role') not in ['admin', 'IT']:
+        return jsonify({"error": "Unauthorized access"}), 403
+
+    days, error = _days_arg(default=7)
+    if error:
+        return error
+    equipment_id = request.args.get('equipment_id')
+    if equipment_id is not None:
+        try:
+            equipment_id = int(equipment_id)
+        except ValueError:
+            return jsonify({"error": "equipment_id must be an integer"}), 400
+
+    return jsonify(EquipmentUsage.busy_minutes_by_hour(days, equipment_id)), 200
+
+@equipment_bp.route('/usage/categories', methods=['GET'])
+@token_required
+def utilization_by_category(current_user):
+    """API endpoint for utilization % per equipment category over the last `days` days (default 30)."""
+    if current_user.get('role') not in ['admin', 'IT']:
+        return jsonify({"error": "Unauthorized access"}), 403
+
+    days, error = _days_arg()
+    if error:
+        return error
+    return jsonify(EquipmentUsage.utilization_by_category(days)), 200
+
+@equipment_bp.route('/usage/underused', methods=['GET'])
+@token_required
+def underused_equipment(current_user):
+    """
+    API endpoint for machines used less than `threshold` percent (default 10)
+    of the available time over the last `days` days (default 30).
+    """
+    if current_user.get('role') not in ['admin', 'IT']:
+        return jsonify({"error": "Unauthorized access"}), 403
+
+    days, error = _days_arg()
+    if error:
+        return error
+    try:
+        threshold = float(request.args.get('threshold', 10))
+    except ValueError:
+        return jsonify({"error": "threshold must be a number"}), 400
+    if not 0 < threshold <= 100:
+        return jsonify({"error": "threshold must be between 0 and 100"}), 400
+
+    return jsonify(EquipmentUsage.underused(days, threshold)), 200
@@ -0,0 +1,161 @@
+import logging
+import os
+from datetime import datetime
+from mysql.connector import Error
+from typing import Optional
+
+# Import the centralized database connection and the background batch writer
+from database.connection import db_connection
+from database.batch_writer import BatchWriter
+
+# Configure logging for the equipment usage module
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Sensor sessions are buffered and written in multi-row INSERTs off the request path
+usage_writer = BatchWriter(
+    'equipment-usage',
+    batch_size=int(os.getenv('USAGE_BATCH_SIZE', '500')),
+    flush_interval=float(os.getenv('USAGE_FLUSH_INTERVAL', '1')),
+    max_queue=int(os.getenv('USAGE_MAX_QUEUE', '50000'))
+)
+
+INSERT_USAGE = "INSERT INTO equipment_usage (equipment_id, used_by, used_at, duration_mins) VALUES (%s, %s, %s, %s)"
+
+# Hours a day the gym is open; the capacity that utilization percentages are measured against
+OPEN_HOURS_PER_DAY = float(os.getenv('GYM_OPEN_HOURS_PER_DAY', '16'))
+
+class EquipmentUsage:
+    """
+    Ingests machine usage sessions and serves utilization from the
+    `equipment_usage_hourly` rollup.
+
+    The rollup is maintained by triggers on `equipment_usage` (migration 11)
+    that spread every session across the clock hours it overlaps, so reads
+    never scan the raw sensor table.
+    """
+
+    @staticmethod
+    def record(equipment_id: int, used_by: Optional[int], used_at: datetime, duration_mins: int) -> bool:
+        """Queues one usage session for the background batch insert; returns False if the queue is full."""
+        return usage_writer.submit(INSERT_USAGE, (equipment_id, used_by, used_at, duration_mins), block=False)
+
+    @staticmethod
+    def busy_minutes_by_hour(days: int, equipment_id: Optional[int] = None) -> list[dict]:
+        """
+        Returns busy minutes and session counts per machine per clock hour over the last `days` days.
+
+        Returns:
+            list[dict]: Rows of {equipment_id, e_name, hour, busy_minutes, sessions}, oldest hour first.
+        """
+        query = '''
+            SELECT u.equipment_id, e.e_name, u.usage_hour, u.busy_minutes, u.sessions
+            FROM equipment_usage_hourly u
+            JOIN Equipment e ON e.e_code = u.equipment_id
+            WHERE u.usage_hour >= NOW() - INTERVAL %s DAY
+        '''
+        params: tuple = (days,)
+        if equipment_id is not None:
+            query += " AND u.equipment_id = %s"
+            params += (equipment_id,)
+        query += " ORDER BY u.usage_hour, u.equipment_id"
+
+        try:
+            with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+                cursor.execute(query, params)
+                return [
+                    {
+                        "equipment_id": row['equipment_id'],
+                        "e_name": row['e_name'],
+                        "hour": row['usage_hour'].strftime('%Y-%m-%d %H:00'),
+                        "busy_minutes": float(row['busy_minutes']),
+                        "sessions": int(row['sessions'])
+                    }
+                    for row in cursor.fetchall()
+                ]
+        except Error as e:
+            logging.error(f"Database error while reading hourly equipment usage: {e}")
+        return []
+
+    @staticmethod
+    def utilization_by_category(days: int) -> list[dict]:
+        """
+        Returns utilization per e_category over the last `days` days.
+
+        Utilization is busy minutes divided by the available machine minutes
+        (units in stock x open hours x days).
+
+        Returns:
+            list[dict]: Rows of {e_category, units, busy_minutes, utilization_pct}, busiest first.
+        """
+        capacity_per_unit = days * OPEN_HOURS_PER_DAY * 60
+        query = '''
+            SELECT e.e_category, SUM(GREATEST(e.e_qty, 1)) AS units, COALESCE(SUM(u.busy_minutes), 0) AS busy_minutes
+            FROM Equipment e
+            LEFT JOIN (
+                SELECT equipment_id, SUM(busy_minutes) AS busy_minutes
+                FROM equipment_usage_hourly
+                WHERE usage_hour >= NOW() - INTERVAL %s DAY
+                GROUP BY equipment_id
+            ) u ON u.equipment_id = e.e_code
+            GROUP BY e.e_category
+        '''
+        try:
+            with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+                cursor.execute(query, (days,))
+                result = [
+                    {
+                        "e_category": row['e_category'],
+                        "units": int(row['units']),
+                        "busy_minutes": float(row['busy_minutes']),
+                        "utilization_pct": round(float(row['busy_minutes']) / (int(row['units']) * capacity_per_unit) * 100, 2)
+                    }
+                    for row in cursor.fetchall()
+                ]
+                return sorted(result, key=lambda r: r['utilization_pct'], reverse=True)
+        except Error as e:
+            logging.error(f"Database error while computing equipment utilization by category: {e}")
+        return []
+
+    @staticmethod
+    def underused(days: int, threshold_pct: float, limit: int = 100) -> list[dict]:
+        """
+        Returns machines whose utilization over the last `days` days is below `threshold_pct`,
+        including machines with no recorded use at all.
+
+        Returns:
+            list[dict]: Rows of {equipment_id, e_name, e_category, units, busy_minutes,
+            utilization_pct}, least used first.
+        """
+        capacity_per_unit = days * OPEN_HOURS_PER_DAY * 60
+        query = '''
+            SELECT e.e_code, e.e_name, e.e_category, GREATEST(e.e_qty, 1) AS units,
+                   COALESCE(u.busy_minutes, 0) AS busy_minutes,
+                   COALESCE(u.busy_minutes, 0) / (GREATEST(e.e_qty, 1) * %s) * 100 AS utilization_pct
+            FROM Equipment e
+            LEFT JOIN (
+                SELECT equipment_id, SUM(busy_minutes) AS busy_minutes
+                FROM equipment_usage_hourly
+                WHERE usage_hour >= NOW() - INTERVAL %s DAY
+                GROUP BY equipment_id
+            ) u ON u.equipment_id = e.e_code
+            HAVING utilization_pct < %s
+            ORDER BY utilization_pct, e.e_code
+            LIMIT %s
+        '''
+        try:
+            with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+                cursor.execute(query, (capacity_per_unit, days, threshold_pct, limit))
+                return [
+                    {
+                        "equipment_id": row['e_code'],
+                        "e_name": row['e_name'],
+                        "e_category": row['e_category'],
+                        "units": int(row['units']),
+                        "busy_minutes": float(row['busy_minutes']),
+                        "utilization_pct": round(float(row['utilization_pct']), 2)
+                    }
+                    for row in cursor.fetchall()
+                ]
+        except Error as e:
+            logging.error(f"Database error while finding underused equipment: {e}")
+        return []
@@ -0,0 +1,155 @@
+import csv
+import io
+import logging
+import os
+import zlib
+from datetime import date
+from mysql.connector import Error
+from typing import Iterator, Optional
+
+# Import the dedicated (non request-scoped) connection and the JSON encoder
+from database.connection import dedicated_connection
+from core.serialization import ColumnMap, dumps
+
+# Configure logging for the export module
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Rows read from the server per round trip; memory use is bounded by this, not by the table size
+EXPORT_FETCH_SIZE = int(os.getenv('EXPORT_FETCH_SIZE', '2000'))
+# Seconds MySQL waits on a slow client before aborting an export (the server default is 60)
+EXPORT_NET_WRITE_TIMEOUT = int(os.getenv('EXPORT_NET_WRITE_TIMEOUT', '600'))
+EXPORT_FORMATS = ('csv', 'ndjson')
+
+
+class _Table:
+    """What one export reads: the columns (never passwords), the table, its date filter column and its key."""
+
+    __slots__ = ('columns', 'table', 'date_column', 'key')
+
+    def __init__(self, columns: ColumnMap, table: str, date_column: str, key: str):
+        self.columns = columns
+        self.table = table
+        self.date_column = date_column
+        self.key = key
+
+
+EXPORT_TABLES = {
+    'members': _Table(ColumnMap({
+        'member_id': 'member_ID', 'name': 'name', 'email': 'email', 'phone_number': 'phone_number',
+        'membership_plan': 'membership_plan', 'join_date': 'join_date', 'status': 'status',
+        'created_at': 'created_at', 'updated_at': 'updated_at',
+    }), 'Members', 'join_date', 'member_ID'),
+    'attendance': _Table(ColumnMap({
+        'id': 'id', 'member_id': 'mem_id', 'check_in': 'check_in', 'check_out': 'check_out',
+    }), 'attendance', 'check_in', 'id'),
+    'payments': _Table(ColumnMap({
+        'id': 'id', 'member_id': 'mem_id', 'amount': 'amount', 'payment_date': 'payment_date',
+        'payment_method': 'payment_method', 'plan_type': 'plan_type', 'status': 'status',
+    }), 'payments', 'payment_date', 'id'),
+}
+
+
+class Export:
+    """
+    Streams whole tables as CSV or NDJSON.
+
+    Rows are read through an unbuffered (server-side) cursor EXPORT_FETCH_SIZE
+    at a time and encoded chunk by chunk, so memory stays flat however big
+    the table is and the first bytes go out while MySQL is still sending the
+    rest. The generator holds its own pooled connection until it finishes
+    or the client goes away.
+    """
+
+    @staticmethod
+    def stream(name: str, fmt: str, start: Optional[date] = None, end: Optional[date] = None) -> Iterator[bytes]:
+        """
+        Yields the export of `name` (a key of EXPORT_TABLES) in `fmt` ('csv' or 'ndjson').
+
+        The query runs when the first chunk is requested, which is the CSV
+        header (or an empty chunk for NDJSON), so callers can prime the
+        generator to surface connection and query errors before responding.
+
+        Args:
+            start, end: Optional inclusive date range on the table's date column.
+        """
+        spec = EXPORT_TABLES[name]
+        conditions, params = [], []
+        if start is not None:
+            conditions.append(f"{spec.date_column} >= %s")
+            params.append(start)
+        if end is not None:
+            # Inclusive end date, also for DATETIME columns
+            conditions.append(f"{spec.date_column} < %s + INTERVAL 1 DAY")
+            params.append(end)
+        query = f"SELECT {spec.columns.select_list} FROM {spec.table}"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        # Primary key order is a plain clustered index scan, no sort
+        query += f" ORDER BY {spec.key}"
+
+        encode = Export._csv_encoder(spec.columns.keys) if fmt == 'csv' else Export._ndjson_encoder(spec.columns.keys)
+        rows = 0
+        with dedicated_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SET SESSION net_write_timeout = %s", (EXPORT_NET_WRITE_TIMEOUT,))
+            # Unbuffered, so rows are read from the socket as they are fetched instead of all at once
+            cursor = conn.cursor(buffered=False)
+            try:
+                cursor.execute(query, tuple(params))
+                yield encode(None)
+                while True:
+                    batch = cursor.fetchmany(EXPORT_FETCH_SIZE)
+                    if not batch:
+                        break
+                    rows += len(batch)
+                    yield encode(batch)
+            finally:
+                try:
+                    cursor.close()
+                except Error:
+                    # Rows left unread by an abandoned stream; dedicated_connection discards the connection
+                    pass
+            with conn.cursor() as cursor:
+                cursor.execute("SET SESSION net_write_timeout = DEFAULT")
+        logging.info(f"Exported {rows} {name} rows as {fmt}.")
+
+    @staticmethod
+    def gzip(chunks: Iterator[bytes], level: int = 6) -> Iterator[bytes]:
+        """
+        Gzips a stream of chunks on the fly.
+
+        Each chunk is sync-flushed so compressed data keeps flowing to the
+        client instead of sitting in the compressor until the end.
+        """
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            if chunk:
+                yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+    # --- Private Helper Methods ---
+
+    @staticmethod
+    def _csv_encoder(keys: tuple):
+        """Returns a function encoding a batch of rows as CSV lines; None encodes the header."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def encode(batch) -> bytes:
+            buffer.seek(0)
+            buffer.truncate()
+            if batch is None:
+                writer.writerow(keys)
+            else:
+                writer.writerows(batch)
+            return buffer.getvalue().encode('utf-8')
+        return encode
+
+    @staticmethod
+    def _ndjson_encoder(keys: tuple):
+        """Returns a function encoding a batch of rows as one JSON object per line."""
+        def encode(batch) -> bytes:
+            if batch is None:
+                return b''
+            return b''.join(dumps(dict(zip(keys, row))) + b'\n' for row in batch)
+        return encode
@@ -0,0 +1,57 @@
+import itertools
+from datetime import date
+from flask import Blueprint, Response, request, jsonify
+from mysql.connector import Error
+from .auth_routes import token_required
+from .export import Export, EXPORT_FORMATS
+
+# Create a Blueprint for the bulk export routes
+export_bp = Blueprint('export_bp', __name__)
+
+_MIMETYPES = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+
+@export_bp.route('/<any(members, attendance, payments):table>', methods=['GET'])
+@token_required
+def export_table(current_user, table):
+    """
+    API endpoint streaming a full table export as a file download.
+
+    Query parameters:
+        format: csv (default) or ndjson.
+        gzip:   1 to download a gzip-compressed file.
+        from, to: Optional YYYY-MM-DD range on join_date, check_in or payment_date.
+    Password hashes are never exported.
+    """
+    if current_user.get('role') != 'admin':
+        return jsonify({"error": "Unauthorized access"}), 403
+
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": f"format must be one of {', '.join(EXPORT_FORMATS)}"}), 400
+    try:
+        start = date.fromisoformat(request.args['from']) if request.args.get('from') else None
+        end = date.fromisoformat(request.args['to']) if request.args.get('to') else None
+    except ValueError:
+        return jsonify({"error": "from/to must be YYYY-MM-DD"}), 400
+    compress = request.args.get('gzip', '').lower() in ('1', 'true', 'yes')
+
+    # Run the query now so a database error is still a proper 500 instead of a truncated file
+    rows = Export.stream(table, fmt, start=start, end=end)
+    try:
+        first = next(rows)
+    except Error:
+        return jsonify({"error": f"Could not export {table}"}), 500
+    chunks = itertools.chain([first], rows)
+
+    filename = f"{table}-{date.today():%Y%m%d}.{fmt}"
+    if compress:
+        chunks = Export.gzip(chunks)
+        filename += '.gz'
+    response = Response(chunks, mimetype='application/gzip' if compress else _MIMETYPES[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    # Ask reverse proxies to pass chunks through instead of buffering the whole file
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.headers['Cache-Control'] = 'no-store'
+    # Closing the generator when the client disconnects releases its database connection right away
+    response.call_on_close(rows.close)
+    return response
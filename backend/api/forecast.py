@@ -0,0 +1,182 @@
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from mysql.connector import Error
+from typing import Optional
+
+# Import the centralized database connection
+from database.connection import db_connection
+
+# Configure logging for the forecast module
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Where the fitted model is stored between training runs
+MODEL_PATH = os.getenv(
+    'FORECAST_MODEL_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models', 'traffic_forecast.joblib')
+)
+
+# pandas and scikit-learn are imported inside the functions that need them so
+# the API starts quickly and only pays for them once a forecast is requested.
+
+def hourly_visits_from_csv(path: str):
+    """
+    Counts swipe_in events per hour in a turnstile dump (timestamp,member_id,event_type).
+
+    Returns:
+        pandas.Series: Visits indexed by hour, with empty hours filled with 0.
+    """
+    import pandas as pd
+
+    df = pd.read_csv(path, usecols=['timestamp', 'event_type'], parse_dates=['timestamp'])
+    hours = df.loc[df['event_type'] == 'swipe_in', 'timestamp'].dt.floor('h')
+    counts = hours.value_counts().sort_index()
+    full_range = pd.date_range(counts.index.min(), counts.index.max(), freq='h')
+    return counts.reindex(full_range, fill_value=0).rename('visits')
+
+def hourly_visits_from_db():
+    """
+    Reads visits per hour from the trigger-maintained attendance rollup.
+
+    Returns:
+        pandas.Series: Visits indexed by hour, with empty hours filled with 0.
+    """
+    import pandas as pd
+
+    rows = []
+    try:
+        with db_connection() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT visit_date, visit_hour, visits FROM attendance_hourly")
+            rows = cursor.fetchall()
+    except Error as e:
+        logging.error(f"Database error while reading the attendance rollup: {e}")
+        raise
+
+    df = pd.DataFrame(rows, columns=['visit_date', 'visit_hour', 'visits'])
+    if df.empty:
+        return pd.Series(dtype='int64', name='visits')
+    index = pd.to_datetime(df['visit_date']) + pd.to_timedelta(df['visit_hour'].astype('int64'), unit='h')
+    counts = pd.Series(df['visits'].astype('int64').to_numpy(), index=index).sort_index()
+    full_range = pd.date_range(counts.index.min(), counts.index.max(), freq='h')
+    return counts.reindex(full_range, fill_value=0).rename('visits')
+
+def hour_of_week_features(index):
+    """
+    Builds the model's feature matrix for a DatetimeIndex without looping over rows.
+
+    Columns: hour of week (0 = Monday 00:00, used as a categorical feature),
+    hour of day, day of week and a weekend flag.
+    """
+    import numpy as np
+
+    hour = index.hour.to_numpy()
+    dow = index.dayofweek.to_numpy()
+    return np.column_stack([dow * 24 + hour, hour, dow, (dow >= 5).astype(int)])
+
+def train(counts, path: str = MODEL_PATH) -> dict:
+    """
+    Fits the traffic model on hourly visit counts and saves it to `path`.
+
+    The file is written next to the target and renamed into place, so a
+    running server never loads a half-written model.
+
+    Returns:
+        dict: Summary of the training run.
+    """
+    import joblib
+    from sklearn.ensemble import HistGradientBoostingRegressor
+
+    if len(counts) < 24 * 7:
+        raise ValueError("At least one week of hourly history is needed to train the forecast")
+
+    model = HistGradientBoostingRegressor(categorical_features=[0], max_iter=200, random_state=0)
+    model.fit(hour_of_week_features(counts.index), counts.to_numpy())
+
+    bundle = {
+        "model": model,
+        "trained_at": datetime.now().isoformat(timespec='seconds'),
+        "history_start": counts.index.min().isoformat(),
+        "history_end": counts.index.max().isoformat(),
+        "hours": int(len(counts)),
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    joblib.dump(bundle, tmp_path)
+    os.replace(tmp_path, path)
+    logging.info(f"Trained traffic forecast on {bundle['hours']} hours of history -> {path}")
+    return {k: v for k, v in bundle.items() if k != 'model'}
+
+
+class TrafficForecaster:
+    """
+    Serves forecasts from the model saved by `train`.
+
+    The model is loaded lazily and reloaded only when the file on disk
+    changes (i.e. after a scheduled retrain). Forecasts are cached per
+    starting hour, so repeat requests within the same hour cost a dict lookup.
+    """
+
+    def __init__(self, path: str = MODEL_PATH, cache_size: int = 32):
+        self.path = path
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._bundle = None
+        self._mtime = None
+        self._cache: dict = {}
+
+    def forecast(self, days: int, start: Optional[datetime] = None) -> Optional[dict]:
+        """
+        Predicts visits for each hour of the next `days` days.
+
+        Returns:
+            dict: The forecast, or None if no model has been trained yet.
+        """
+        import pandas as pd
+
+        bundle, mtime = self._load()
+        if bundle is None:
+            return None
+
+        start = (start or datetime.now()).replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        key = (mtime, start, days)
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        index = pd.date_range(start, periods=days * 24, freq='h')
+        predictions = bundle['model'].predict(hour_of_week_features(index)).clip(min=0).round(1)
+        result = {
+            "model_trained_at": bundle['trained_at'],
+            "forecast": [
+                {"hour": ts, "expected_visits": value}
+                for ts, value in zip(index.strftime('%Y-%m-%d %H:00').tolist(), predictions.tolist())
+            ],
+        }
+
+        with self._lock:
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[key] = result
+        return result
+
+    def _load(self):
+        """Returns the current model bundle, reloading it if the file changed since the last load."""
+        import joblib
+
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return None, None
+        with self._lock:
+            if mtime != self._mtime:
+                self._bundle = joblib.load(self.path)
+                self._mtime = mtime
+                self._cache.clear()
+                logging.info(f"Loaded traffic forecast model trained at {self._bundle['trained_at']}.")
+            return self._bundle, self._mtime
+
+
+# Shared forecaster used by the analytics routes
+forecaster = TrafficForecaster()
@@ -1,9 +1,45 @@
 from flask import Blueprint, request, jsonify
+import base64
+import binascii
+import json
 from .auth_routes import token_required
-from .user import Member
+from core.security import HashingBusyError
+from core.serialization import json_response
+from .user import Member, MEMBER_STATUSES
 
 member_bp = Blueprint('member_bp', __name__)
 
+@member_bp.errorhandler(HashingBusyError)
+def hashing_busy(e):
+    """Bulk registration answers 503, like login, when its bcrypt jobs cannot get a slot in time."""
+    return jsonify({"error": "Server is busy, please try again shortly"}), 503, {'Retry-After': '1'}
+
+# Page size limits for the paginated member listing
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Result limits for member search
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 50
+
+# Largest array accepted by the bulk endpoints in one request
+MAX_BULK_ITEMS = 5000
+
+def _encode_cursor(name: str, member_ID: int) -> str:
+    """Encodes the sort key of the last row on a page into an opaque cursor string."""
+    raw = json.dumps([name, member_ID]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+def _decode_cursor(cursor: str) -> tuple:
+    """Decodes a cursor produced by _encode_cursor. Raises ValueError if it is malformed."""
+    try:
+        name, member_ID = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (binascii.Error, UnicodeError, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(name, str) or not isinstance(member_ID, int):
+        raise ValueError("Invalid cursor")
+    return name, member_ID
+
 @member_bp.route('/', methods=['GET'])
 @token_required
 def get_all_members(current_user):
@@ -15,25 +51,92 @@ def get_all_members(current_user):
     if current_user['role'] not in ['admin', 'IT', 'Trainer']:
         return jsonify({"error": "Unauthorized access"}), 403
 
-    members = Member.get_all()
-    
-    # Convert the list of Member objects into a list of dictionaries
-    members_list = [
-        {
-            "member_id": m.member_ID, 
-            "name": m.name, 
-            "email": m.email, 
-            "status": m.status,
-            "phone_number": m.phone_number,
-            "membership_plan": m.membership_plan,
-            "join_date": m.join_date.strftime('%Y-%m-%d') if m.join_date else None
-        } 
-        for m in members
-    ]
-    
-    return jsonify(members_list), 200
+    # Any pagination parameter switches to the keyset-paginated, projected listing
+    if any(param in request.args for param in ('limit', 'cursor', 'fields')):
+        return _get_members_page()
+
+    # Tuple rows are encoded straight to JSON; no Member objects or per-row dicts
+    body = Member.get_all_json()
+    if body is None:
+        return jsonify({"error": "Failed to load members"}), 500
+    return json_response(body)
+
+def _get_members_page():
+    """
+    Returns one page of members ordered by name.
+
+    Query parameters:
+        limit:  Page size (default 50, max 500).
+        cursor: The `next_cursor` value from the previous page.
+        fields: Comma separated list of fields to return, e.g. `name,email`.
+    """
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    if limit < 1:
+        return jsonify({"error": "limit must be positive"}), 400
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    after = None
+    if request.args.get('cursor'):
+        try:
+            after = _decode_cursor(request.args['cursor'])
+        except ValueError:
+            return jsonify({"error": "Invalid cursor"}), 400
+
+    fields = None
+    if request.args.get('fields'):
+        fields = [f.strip() for f in request.args['fields'].split(',') if f.strip()]
+        unknown = [f for f in fields if f not in Member.LIST_FIELDS]
+        if unknown:
+            return jsonify({"error": f"Unknown fields: {', '.join(unknown)}"}), 400
+
+    # Fetch one extra row to find out whether another page exists
+    rows = Member.get_page(limit + 1, after=after, fields=fields)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        next_cursor = _encode_cursor(rows[-1]['name'], rows[-1]['member_id'])
+
+    for row in rows:
+        if row.get('join_date'):
+            row['join_date'] = row['join_date'].strftime('%Y-%m-%d')
+        # The sort keys are always selected, but only returned when asked for
+        if fields:
+            for key in ('member_id', 'name'):
+                if key not in fields:
+                    row.pop(key)
 
-@member_bp.route('/<int:member_id>', methods=['GET'])
+    return jsonify({"members": rows, "next_cursor": next_cursor}), 200
+
+@member_bp.route('/search', methods=['GET'])
+@token_required
+def search_members(current_user):
+    """
+    API endpoint to search members by name, email or phone number.
+
+    Query parameters:
+        q:     Search text (at least 2 characters).
+        limit: Maximum results (default 20, max 50).
+    """
+    if current_user['role'] not in ['admin', 'IT', 'Trainer']:
+        return jsonify({"error": "Unauthorized access"}), 403
+
+    q = request.args.get('q', '').strip()
+    if len(q) < 2:
+        return jsonify({"error": "q must be at least 2 characters"}), 400
+    try:
+        limit = int(request.args.get('limit', DEFAULT_SEARCH_LIMIT))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+
+    return jsonify(Member.search(q, limit)), 200
+
+@member_bp.route('/<int:member_ID>', methods=['GET'])
 @token_required
 def get_member_by_id(current_user, member_ID):
     """API endpoint to get a single member by their ID."""
@@ -69,7 +172,7 @@ def update_member(current_user, member_ID):
     else:
         return jsonify({"error": "Member not found or update failed"}), 404
 
-@member_bp.route('/<int:member_id>', methods=['DELETE'])
+@member_bp.route('/<int:member_ID>', methods=['DELETE'])
 @token_required
 def delete_member(current_user, member_ID):
     """API endpoint to delete a member."""
@@ -82,3 +185,75 @@ def delete_member(current_user, member_ID):
         return jsonify({"message": f"Member with ID {member_ID} deleted successfully."}), 200
     else:
         return jsonify({"error": "Member not found or deletion failed"}), 404
+
+# --- Bulk Operations ---
+
+def _bulk_items():
+    """Reads and size-checks the JSON array sent to a bulk endpoint. Returns (items, error_response)."""
+    data = request.get_json(silent=True)
+    if not isinstance(data, list) or not data:
+        return None, (jsonify({"error": "Expected a non-empty JSON array"}), 400)
+    if len(data) > MAX_BULK_ITEMS:
+        return None, (jsonify({"error": f"At most {MAX_BULK_ITEMS} items per request"}), 413)
+    return data, None
+
+def _bulk_response(results: list, ok_statuses: tuple):
+    """Wraps per-item results with success/failure counts."""
+    succeeded = sum(1 for r in results if r['status'] in ok_statuses)
+    return jsonify({"succeeded": succeeded, "failed": len(results) - succeeded, "results": results}), 200
+
+@member_bp.route('/bulk', methods=['POST'])
+@token_required
+def bulk_create_members(current_user):
+    """API endpoint to register an array of members in one request."""
+    if current_user['role'] not in ['admin', 'IT']:
+        return jsonify({"error": "Unauthorized: Only admins or IT can add members"}), 403
+
+    items, error = _bulk_items()
+    if error:
+        return error
+    return _bulk_response(Member.bulk_create(items), ('created',))
+
+@member_bp.route('/bulk', methods=['PATCH'])
+@token_required
+def bulk_update_members(current_user):
+    """API endpoint to update an array of members, each item being {member_id, ...fields}."""
+    if current_user['role'] not in ['admin', 'IT']:
+        return jsonify({"error": "Unauthorized: Only admins or IT can update member details"}), 403
+
+    items, error = _bulk_items()
+    if error:
+        return error
+    return _bulk_response(Member.bulk_update(items), ('updated',))
+
+@member_bp.route('/bulk/status', methods=['POST'])
+@token_required
+def bulk_change_status(current_user):
+    """
+    API endpoint to change the status of many members at once.
+    Body: {"status": "frozen", "member_ids": [...]} or {"status": "frozen", "membership_plan": "Gold"}.
+    """
+    if current_user['role'] not in ['admin', 'IT']:
+        return jsonify({"error": "Unauthorized: Only admins or IT can update member details"}), 403
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+    status = data.get('status')
+    member_ids = data.get('member_ids')
+    membership_plan = data.get('membership_plan')
+
+    if status not in MEMBER_STATUSES:
+        return jsonify({"error": f"status must be one of {', '.join(MEMBER_STATUSES)}"}), 400
+    if (member_ids is None) == (membership_plan is None):
+        return jsonify({"error": "Provide exactly one of member_ids or membership_plan"}), 400
+    if member_ids is not None:
+        if not isinstance(member_ids, list) or not all(isinstance(i, int) for i in member_ids):
+            return jsonify({"error": "member_ids must be an array of integers"}), 400
+        if len(member_ids) > MAX_BULK_ITEMS:
+            return jsonify({"error": f"At most {MAX_BULK_ITEMS} member_ids per request"}), 413
+
+    result = Member.bulk_set_status(status, member_ids=member_ids, membership_plan=membership_plan)
+    if result is None:
+        return jsonify({"error": "Status change failed"}), 500
+    return jsonify(result), 200
@@ -0,0 +1,170 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from mysql.connector import Error, errorcode, errors
+from typing import Any, Dict, List, Optional, Tuple
+
+# Import the centralized database connection
+from database.connection import db_connection
+
+# Configure logging for the occupancy module
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Seconds a worker reuses the head count it last read before asking the database again
+OCCUPANCY_CACHE_TTL = float(os.getenv('OCCUPANCY_CACHE_TTL', '1'))
+# Times a swipe batch is retried when InnoDB picks it as a deadlock victim
+DEADLOCK_RETRIES = 3
+
+class OccupancyTracker:
+    """
+    Tracks who is inside the gym, fed by turnstile swipes.
+
+    `occupancy_inside` is the source of truth: every swipe batch is applied
+    to it in one transaction that locks the rows of the members involved, so
+    a swipe-in handled by one worker process and the matching swipe-out
+    handled by another always pair up, and completed visits are written to
+    `attendance` in the same transaction. Each process only caches the head
+    count for OCCUPANCY_CACHE_TTL seconds, which keeps dashboard polling off
+    the database.
+    """
+
+    def __init__(self, cache_ttl: float = OCCUPANCY_CACHE_TTL):
+        self.cache_ttl = cache_ttl
+
+        self._lock = threading.Lock()
+        self._count: Optional[int] = None
+        self._count_at = 0.0
+
+    def record_many(self, events: List[Tuple[int, str, datetime]]) -> Optional[Dict[str, int]]:
+        """
+        Applies swipe events, in order, in one transaction.
+
+        Args:
+            events (list): (member_id, 'swipe_in' | 'swipe_out', timestamp) tuples.
+
+        Returns:
+            dict: Counts of applied, unmatched and unknown-member events, or
+            None if the batch could not be written (nothing was applied).
+        """
+        if not events:
+            return {"applied": 0, "unmatched_in": 0, "unmatched_out": 0, "unknown_member": 0}
+        for attempt in range(DEADLOCK_RETRIES):
+            try:
+                result = self._apply(events)
+                self.invalidate()
+                return result
+            except errors.DatabaseError as e:
+                if e.errno == errorcode.ER_LOCK_DEADLOCK and attempt + 1 < DEADLOCK_RETRIES:
+                    logging.warning(f"Swipe batch hit a deadlock, retrying: {e}")
+                    continue
+                logging.error(f"Database error while recording {len(events)} swipes: {e}")
+                return None
+            except Error as e:
+                logging.error(f"Database error while recording {len(events)} swipes: {e}")
+                return None
+        return None
+
+    def record(self, member_id: int, event_type: str, timestamp: datetime) -> Optional[Dict[str, int]]:
+        """Applies one swipe event."""
+        return self.record_many([(member_id, event_type, timestamp)])
+
+    def current(self) -> Optional[Dict[str, Any]]:
+        """Returns the head count, at most OCCUPANCY_CACHE_TTL seconds old, or None on a database error."""
+        with self._lock:
+            if self._count is not None and time.monotonic() - self._count_at < self.cache_ttl:
+                count = self._count
+            else:
+                count = None
+        if count is None:
+            try:
+                with db_connection() as conn, conn.cursor() as cursor:
+                    cursor.execute("SELECT COUNT(*) FROM occupancy_inside")
+                    count = int(cursor.fetchone()[0])
+            except Error as e:
+                logging.error(f"Database error while reading occupancy: {e}")
+                return None
+            with self._lock:
+                self._count, self._count_at = count, time.monotonic()
+        return {"occupancy": count, "as_of": datetime.now().isoformat(timespec='seconds')}
+
+    def is_inside(self, member_id: int) -> Optional[bool]:
+        """Checks whether a member is currently inside. Returns None on a database error."""
+        try:
+            with db_connection() as conn, conn.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM occupancy_inside WHERE member_id = %s", (member_id,))
+                return cursor.fetchone() is not None
+        except Error as e:
+            logging.error(f"Database error while checking occupancy of member {member_id}: {e}")
+            return None
+
+    def invalidate(self) -> None:
+        """Drops the cached head count so the next read goes to the database."""
+        with self._lock:
+            self._count = None
+
+    # --- Private Helper Methods ---
+
+    @staticmethod
+    def _apply(events: list) -> Dict[str, int]:
+        """Runs one swipe batch against `occupancy_inside` and `attendance`. Raises on a database error."""
+        member_ids = sorted({member_id for member_id, _, _ in events})
+        placeholders = ', '.join(['%s'] * len(member_ids))
+        counts = {"applied": 0, "unmatched_in": 0, "unmatched_out": 0, "unknown_member": 0}
+
+        with db_connection() as conn, conn.cursor() as cursor:
+            try:
+                cursor.execute(f"SELECT member_ID FROM Members WHERE member_ID IN ({placeholders})", tuple(member_ids))
+                known = {int(row[0]) for row in cursor.fetchall()}
+                # Locks these members' rows (and the gaps where absent ones would go) until commit,
+                # so concurrent swipes for the same member from other workers wait for this batch
+                cursor.execute(
+                    f"SELECT member_id, checked_in_at FROM occupancy_inside "
+                    f"WHERE member_id IN ({placeholders}) FOR UPDATE",
+                    tuple(member_ids)
+                )
+                inside = {int(row[0]): row[1] for row in cursor.fetchall()}
+                was_inside = dict(inside)
+
+                sessions = []
+                for member_id, event_type, timestamp in events:
+                    if member_id not in known:
+                        counts["unknown_member"] += 1
+                        continue
+                    if event_type == 'swipe_in':
+                        if member_id in inside:
+                            # The previous visit never got a swipe_out; it is superseded by this one
+                            counts["unmatched_in"] += 1
+                        inside[member_id] = timestamp
+                    else:
+                        check_in = inside.pop(member_id, None)
+                        if check_in is None:
+                            counts["unmatched_out"] += 1
+                            continue
+                        sessions.append((member_id, check_in, timestamp))
+                    counts["applied"] += 1
+
+                deletes = [(m,) for m in was_inside if m not in inside]
+                upserts = [(m, inside[m]) for m in member_ids if m in inside and was_inside.get(m) != inside[m]]
+                if deletes:
+                    cursor.executemany("DELETE FROM occupancy_inside WHERE member_id = %s", deletes)
+                if upserts:
+                    cursor.executemany(
+                        "INSERT INTO occupancy_inside (member_id, checked_in_at) VALUES (%s, %s) "
+                        "ON DUPLICATE KEY UPDATE checked_in_at = VALUES(checked_in_at)",
+                        upserts
+                    )
+                if sessions:
+                    cursor.executemany(
+                        "INSERT INTO attendance (mem_id, check_in, check_out) VALUES (%s, %s, %s)", sessions
+                    )
+                conn.commit()
+            except Error:
+                conn.rollback()
+                raise
+        return counts
+
+
+# Shared tracker used by the occupancy routes
+occupancy = OccupancyTracker()
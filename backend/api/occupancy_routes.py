@@ -0,0 +1,71 @@
+from flask import Blueprint, request, jsonify
+from datetime import datetime
+from .auth_routes import token_required
+from .occupancy import occupancy
+
+# Create a Blueprint for live occupancy routes
+occupancy_bp = Blueprint('occupancy_bp', __name__)
+
+SWIPE_EVENTS = ('swipe_in', 'swipe_out')
+
+@occupancy_bp.route('', methods=['GET'])
+@token_required
+def get_occupancy(current_user):
+    """
+    API endpoint for the number of people currently in the gym.
+    Pass `member_id` to also check whether that member is inside.
+    """
+    if current_user.get('role') not in ['admin', 'IT', 'Trainer']:
+        return jsonify({"error": "Unauthorized access"}), 403
+
+    result = occupancy.current()
+    if result is None:
+        return jsonify({"error": "Could not read occupancy"}), 500
+    member_id = request.args.get('member_id')
+    if member_id is not None:
+        try:
+            result['member_id'] = int(member_id)
+        except ValueError:
+            return jsonify({"error": "member_id must be an integer"}), 400
+        result['inside'] = occupancy.is_inside(result['member_id'])
+        if result['inside'] is None:
+            return jsonify({"error": "Could not read occupancy"}), 500
+    return jsonify(result), 200
+
+@occupancy_bp.route('/swipes', methods=['POST'])
+@token_required
+def ingest_swipes(current_user):
+    """
+    API endpoint for turnstile swipe events.
+
+    Accepts one event or a list of events shaped like the rows of
+    gym_traffic_data.csv: {"timestamp", "member_id", "event_type"}.
+    `timestamp` is optional and defaults to the time of receipt.
+    """
+    if current_user.get('role') not in ['admin', 'IT']:
+        return jsonify({"error": "Unauthorized: Only admins or IT can submit swipes"}), 403
+
+    data = request.get_json(silent=True)
+    if data is None:
+        return jsonify({"error": "No swipe data provided"}), 400
+    events = data if isinstance(data, list) else [data]
+    if not events:
+        return jsonify({"error": "No swipe data provided"}), 400
+
+    # Validate the whole batch before applying any of it
+    parsed = []
+    for index, event in enumerate(events):
+        if not isinstance(event, dict) or event.get('event_type') not in SWIPE_EVENTS:
+            return jsonify({"error": f"Event {index}: event_type must be swipe_in or swipe_out"}), 400
+        try:
+            member_id = int(event['member_id'])
+            timestamp = datetime.fromisoformat(event['timestamp']) if event.get('timestamp') else datetime.now()
+        except (KeyError, TypeError, ValueError):
+            return jsonify({"error": f"Event {index}: invalid member_id or timestamp"}), 400
+        parsed.append((member_id, event['event_type'], timestamp))
+
+    # The batch is applied atomically, so a failed request can simply be resent
+    counts = occupancy.record_many(parsed)
+    if counts is None:
+        return jsonify({"error": "Could not record swipes, resend the batch"}), 500
+    return jsonify({"accepted": len(parsed), **counts, **(occupancy.current() or {})}), 200
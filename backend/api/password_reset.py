@@ -0,0 +1,141 @@
+import hashlib
+import logging
+import os
+import secrets
+from mysql.connector import Error
+from typing import Optional
+
+# Import the centralized database connection, password hashing and the mail outbox
+from database.connection import db_connection
+from core.security import hash_password
+from core.mail_outbox import enqueue_mail, outbox_sender
+
+# Configure logging for the password reset module
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Page of the frontend that reads ?token= and posts it to /api/auth/reset-password
+PASSWORD_RESET_URL = os.getenv('PASSWORD_RESET_URL', 'http://127.0.0.1:5500/frontend/reset_password.html')
+# Minutes a reset link stays valid
+RESET_TOKEN_TTL_MINUTES = int(os.getenv('RESET_TOKEN_TTL_MINUTES', '30'))
+# Seconds after a reset email before another one is sent to the same member
+RESET_REQUEST_COOLDOWN = int(os.getenv('RESET_REQUEST_COOLDOWN', '60'))
+# Shortest password accepted by a reset, matching the reset page
+MIN_PASSWORD_LENGTH = 8
+
+RESET_SUBJECT = "Reset your GymMonk password"
+
+def _hash_token(token: str) -> str:
+    """Reset tokens are long and random, so a fast SHA-256 is enough to keep them out of the database."""
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+def _email_ref(email: str) -> str:
+    """A short, stable digest of a submitted email, so logs can correlate requests without storing the address."""
+    return hashlib.sha256(email.strip().lower().encode('utf-8')).hexdigest()[:12]
+
+
+class PasswordReset:
+    """
+    Handles the member password reset flow.
+
+    Requesting a reset only writes a hashed, expiring token and a
+    `mail_outbox` row in one transaction; the email is sent by the
+    background outbox sender, so the request never waits on the mail server.
+    """
+
+    @staticmethod
+    def request_reset(email: str) -> bool:
+        """
+        Creates a reset token for the member with `email` and queues the reset email.
+
+        Unknown emails are ignored so callers can't learn which addresses are
+        registered, and a member gets at most one email per RESET_REQUEST_COOLDOWN.
+
+        Returns:
+            bool: False if a database error occurred, True otherwise.
+        """
+        try:
+            with db_connection() as conn, conn.cursor() as cursor:
+                cursor.execute("SELECT member_ID, name FROM Members WHERE email = %s", (email,))
+                member = cursor.fetchone()
+                if member is None:
+                    logging.info(f"Password reset requested for an unknown email (ref {_email_ref(email)}).")
+                    return True
+                member_ID, name = member
+
+                cursor.execute(
+                    "SELECT 1 FROM password_resets WHERE member_id = %s AND created_at > NOW() - INTERVAL %s SECOND LIMIT 1",
+                    (member_ID, RESET_REQUEST_COOLDOWN)
+                )
+                if cursor.fetchone():
+                    logging.info(f"Password reset for member ID {member_ID} skipped: one was just sent.")
+                    return True
+
+                token = secrets.token_urlsafe(32)
+                cursor.execute(
+                    "INSERT INTO password_resets (member_id, token_hash, expires_at) "
+                    "VALUES (%s, %s, NOW() + INTERVAL %s MINUTE)",
+                    (member_ID, _hash_token(token), RESET_TOKEN_TTL_MINUTES)
+                )
+                enqueue_mail(cursor, email, RESET_SUBJECT, PasswordReset._email_body(name, token))
+                conn.commit()
+                logging.info(f"Queued a password reset email for member ID {member_ID}.")
+        except Error as e:
+            logging.error(f"Database error while requesting a password reset (ref {_email_ref(email)}): {e}")
+            return False
+
+        outbox_sender.wake()
+        return True
+
+    @staticmethod
+    def reset(token: str, new_password: str) -> Optional[bool]:
+        """
+        Sets a new password if `token` is a valid, unused and unexpired reset token.
+
+        Every outstanding token of the member is used up with it.
+
+        Returns:
+            bool: True on success, False if the token is invalid or expired,
+            or None if a database error occurred.
+        """
+        token_hash = _hash_token(token)
+        lookup = "SELECT member_id FROM password_resets WHERE token_hash = %s AND used_at IS NULL AND expires_at > NOW()"
+        try:
+            # Check the token before paying for bcrypt, so bad tokens are cheap to reject
+            with db_connection() as conn, conn.cursor() as cursor:
+                cursor.execute(lookup, (token_hash,))
+                if cursor.fetchone() is None:
+                    return False
+
+            hashed_pw = hash_password(new_password)
+
+            with db_connection() as conn, conn.cursor() as cursor:
+                # Lock the token so two concurrent resets with it can't both succeed
+                cursor.execute(f"{lookup} FOR UPDATE", (token_hash,))
+                row = cursor.fetchone()
+                if row is None:
+                    conn.rollback()
+                    return False
+                member_ID = row[0]
+                cursor.execute("UPDATE Members SET password = %s WHERE member_ID = %s", (hashed_pw, member_ID))
+                cursor.execute(
+                    "UPDATE password_resets SET used_at = NOW() WHERE member_id = %s AND used_at IS NULL",
+                    (member_ID,)
+                )
+                conn.commit()
+                logging.info(f"Password reset completed for member ID {member_ID}.")
+                return True
+        except Error as e:
+            logging.error(f"Database error while resetting a password: {e}")
+        return None
+
+    # --- Private Helper Methods ---
+
+    @staticmethod
+    def _email_body(name: str, token: str) -> str:
+        return (
+            f"Hi {name},\n\n"
+            f"We received a request to reset your GymMonk password. Open this link to choose a new one:\n\n"
+            f"{PASSWORD_RESET_URL}?token={token}\n\n"
+            f"The link expires in {RESET_TOKEN_TTL_MINUTES} minutes and can only be used once. "
+            f"If you didn't ask for a reset, you can ignore this email.\n"
+        )
@@ -0,0 +1,217 @@
+import logging
+from datetime import date
+from mysql.connector import Error
+from typing import Optional
+
+# Import the centralized database connection
+from database.connection import db_connection
+
+# Configure logging for the progress module
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Rows written per INSERT/transaction by bulk logging
+PROGRESS_CHUNK_SIZE = 500
+
+# Period start for each trend bucket, computed in SQL from log_date
+TREND_BUCKETS = {
+    'day': "log_date",
+    'week': "log_date - INTERVAL WEEKDAY(log_date) DAY",
+    'month': "log_date - INTERVAL (DAYOFMONTH(log_date) - 1) DAY",
+}
+
+class ProgressLog:
+    """
+    Handles trainer-recorded body measurements (`progress_logs`): batch
+    logging for whole classes and downsampled per-member trends.
+    """
+
+    @staticmethod
+    def bulk_log(items: list, logged_by: int, default_date: Optional[date] = None,
+                 chunk_size: int = PROGRESS_CHUNK_SIZE) -> list[dict]:
+        """
+        Records many measurements at once.
+
+        Items are validated in one pass (one query checks every member id),
+        then written with one multi-row INSERT per chunk, each chunk in its
+        own transaction.
+
+        Args:
+            items (list): Dicts with `member_id` and at least one of `weight_kg`
+                or `body_fat_pct`, plus optional `log_date` and `notes`.
+            logged_by (int): user_id of the trainer recording the session.
+            default_date (date): log_date for items that don't give one. Defaults to today.
+
+        Returns:
+            list[dict]: One result per input item, in input order, with
+            `status` 'logged' or 'error' (and `error`).
+        """
+        default_date = default_date or date.today()
+        results: list = [None] * len(items)
+        valid = []
+
+        for index, item in enumerate(items):
+            try:
+                row = ProgressLog._parse_item(item, default_date)
+            except ValueError as e:
+                results[index] = {"index": index, "status": "error", "error": str(e)}
+                continue
+            valid.append((index, row))
+
+        try:
+            known = ProgressLog._existing_members([row[0] for _, row in valid])
+        except Error as e:
+            logging.error(f"Database error while validating progress logs: {e}")
+            for index, _ in valid:
+                results[index] = {"index": index, "status": "error", "error": "Database error"}
+            return results
+
+        to_insert = []
+        for index, row in valid:
+            if row[0] in known:
+                to_insert.append((index, row))
+            else:
+                results[index] = {"index": index, "status": "error", "error": "Member not found"}
+
+        query = """
+            INSERT INTO progress_logs (mem_id, log_date, weight_kg, body_fat_pct, notes, logged_by)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """
+        for start in range(0, len(to_insert), chunk_size):
+            chunk = to_insert[start:start + chunk_size]
+            try:
+                with db_connection() as conn, conn.cursor() as cursor:
+                    try:
+                        cursor.executemany(query, [row + (logged_by,) for _, row in chunk])
+                        conn.commit()
+                    except Error:
+                        conn.rollback()
+                        raise
+                for index, row in chunk:
+                    results[index] = {"index": index, "status": "logged", "member_id": row[0]}
+            except Error as e:
+                logging.error(f"Database error during bulk progress logging: {e}")
+                for index, _ in chunk:
+                    results[index] = {"index": index, "status": "error", "error": "Database error, chunk rolled back"}
+
+        logging.info(f"Trainer {logged_by} logged {sum(1 for r in results if r['status'] == 'logged')} progress entries.")
+        return results
+
+    @staticmethod
+    def trend(member_id: int, bucket: str = 'auto', window: int = 4,
+              start: Optional[date] = None, end: Optional[date] = None) -> Optional[dict]:
+        """
+        Returns a member's measurements downsampled into day, week or month buckets.
+
+        Each point holds the bucket means and a rolling mean over the last
+        `window` buckets, all computed in one query with window functions,
+        so the payload size depends on the time span, not on how often the
+        member was measured. With bucket='auto' the granularity is picked
+        from the span: daily up to 90 days, weekly up to 3 years, then monthly.
+
+        Returns:
+            dict: {member_id, bucket, window, first_log, last_log, logs, points},
+            or None if a database error occurred.
+        """
+        conditions, params = ["mem_id = %s"], [member_id]
+        if start is not None:
+            conditions.append("log_date >= %s")
+            params.append(start)
+        if end is not None:
+            conditions.append("log_date <= %s")
+            params.append(end)
+        where = ' AND '.join(conditions)
+
+        try:
+            with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+                cursor.execute(
+                    f"SELECT MIN(log_date) AS first_log, MAX(log_date) AS last_log, COUNT(*) AS logs "
+                    f"FROM progress_logs WHERE {where}",
+                    tuple(params)
+                )
+                span = cursor.fetchone()
+                result = {
+                    "member_id": member_id,
+                    "first_log": span['first_log'].isoformat() if span['first_log'] else None,
+                    "last_log": span['last_log'].isoformat() if span['last_log'] else None,
+                    "logs": int(span['logs']),
+                    "window": window,
+                    "points": [],
+                }
+                if bucket == 'auto':
+                    days = (span['last_log'] - span['first_log']).days if span['logs'] else 0
+                    bucket = 'day' if days <= 90 else 'week' if days <= 3 * 365 else 'month'
+                result["bucket"] = bucket
+                if not span['logs']:
+                    return result
+
+                # `window` is a validated int; frame bounds must be literals
+                frame = f"OVER (ORDER BY period_start ROWS BETWEEN {int(window) - 1} PRECEDING AND CURRENT ROW)"
+                cursor.execute(f'''
+                    SELECT period_start, weight_kg, body_fat_pct, logs,
+                           AVG(weight_kg) {frame} AS weight_kg_rolling,
+                           AVG(body_fat_pct) {frame} AS body_fat_pct_rolling
+                    FROM (
+                        SELECT {TREND_BUCKETS[bucket]} AS period_start,
+                               AVG(weight_kg) AS weight_kg, AVG(body_fat_pct) AS body_fat_pct, COUNT(*) AS logs
+                        FROM progress_logs
+                        WHERE {where}
+                        GROUP BY period_start
+                    ) AS buckets
+                    ORDER BY period_start
+                ''', tuple(params))
+                result["points"] = [
+                    {
+                        "period_start": row['period_start'].isoformat(),
+                        "logs": int(row['logs']),
+                        **{key: ProgressLog._round(row[key]) for key in (
+                            'weight_kg', 'body_fat_pct', 'weight_kg_rolling', 'body_fat_pct_rolling')},
+                    }
+                    for row in cursor.fetchall()
+                ]
+                return result
+        except Error as e:
+            logging.error(f"Database error while building the progress trend for member {member_id}: {e}")
+        return None
+
+    # --- Private Helper Methods ---
+
+    @staticmethod
+    def _parse_item(item, default_date: date) -> tuple:
+        """Validates one logging item. Returns the row to insert (without logged_by) or raises ValueError."""
+        if not isinstance(item, dict) or not isinstance(item.get('member_id'), int):
+            raise ValueError("member_id must be an integer")
+        weight, body_fat = item.get('weight_kg'), item.get('body_fat_pct')
+        if weight is None and body_fat is None:
+            raise ValueError("Provide weight_kg or body_fat_pct")
+        try:
+            weight = None if weight is None else float(weight)
+            body_fat = None if body_fat is None else float(body_fat)
+            log_date = date.fromisoformat(item['log_date']) if item.get('log_date') else default_date
+        except (TypeError, ValueError):
+            raise ValueError("Invalid weight_kg, body_fat_pct or log_date")
+        if weight is not None and not 0 < weight < 1000:
+            raise ValueError("weight_kg must be between 0 and 1000")
+        if body_fat is not None and not 0 <= body_fat < 100:
+            raise ValueError("body_fat_pct must be between 0 and 100")
+        if log_date > date.today():
+            raise ValueError("log_date cannot be in the future")
+        return (item['member_id'], log_date, weight, body_fat, item.get('notes'))
+
+    @staticmethod
+    def _existing_members(member_ids: list) -> set:
+        """Private helper returning which of `member_ids` exist in Members."""
+        ids = list(set(member_ids))
+        existing = set()
+        if not ids:
+            return existing
+        with db_connection() as conn, conn.cursor() as cursor:
+            for start in range(0, len(ids), PROGRESS_CHUNK_SIZE):
+                chunk = ids[start:start + PROGRESS_CHUNK_SIZE]
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(f"SELECT member_ID FROM Members WHERE member_ID IN ({placeholders})", tuple(chunk))
+                existing.update(row[0] for row in cursor.fetchall())
+        return existing
+
+    @staticmethod
+    def _round(value) -> Optional[float]:
+        return None if value is None else round(float(value), 2)
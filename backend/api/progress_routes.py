@@ -0,0 +1,75 @@
+from flask import Blueprint, request, jsonify
+from datetime import date
+from .auth_routes import token_required
+from .progress import ProgressLog, TREND_BUCKETS
+
+# Create a Blueprint for member progress routes
+progress_bp = Blueprint('progress_bp', __name__)
+
+# Largest class session accepted in one request
+MAX_LOG_ITEMS = 1000
+# Rolling average window limits, in buckets
+DEFAULT_TREND_WINDOW = 4
+MAX_TREND_WINDOW = 52
+
+@progress_bp.route('/logs', methods=['POST'])
+@token_required
+def log_progress(current_user):
+    """
+    API endpoint for trainers to record measurements for a whole class at once.
+
+    Body: a JSON array of {member_id, weight_kg, body_fat_pct, notes, log_date},
+    or {"log_date": "YYYY-MM-DD", "entries": [...]} to give the whole session one date.
+    """
+    if current_user.get('role') != 'Trainer':
+        return jsonify({"error": "Unauthorized: Only trainers can log progress"}), 403
+
+    data = request.get_json(silent=True)
+    default_date = None
+    if isinstance(data, dict):
+        try:
+            default_date = date.fromisoformat(data['log_date']) if data.get('log_date') else None
+        except (TypeError, ValueError):
+            return jsonify({"error": "log_date must be YYYY-MM-DD"}), 400
+        data = data.get('entries')
+    if not isinstance(data, list) or not data:
+        return jsonify({"error": "Expected a non-empty array of entries"}), 400
+    if len(data) > MAX_LOG_ITEMS:
+        return jsonify({"error": f"At most {MAX_LOG_ITEMS} entries per request"}), 413
+
+    results = ProgressLog.bulk_log(data, logged_by=current_user['user_id'], default_date=default_date)
+    succeeded = sum(1 for r in results if r['status'] == 'logged')
+    return jsonify({"succeeded": succeeded, "failed": len(results) - succeeded, "results": results}), 200
+
+@progress_bp.route('/members/<int:member_id>/trend', methods=['GET'])
+@token_required
+def progress_trend(current_user, member_id):
+    """
+    API endpoint for a member's downsampled weight and body fat trend.
+
+    Query parameters:
+        bucket: day, week, month or auto (default; picked from the time span).
+        window: Buckets in the rolling average (default 4, max 52).
+        from, to: Optional YYYY-MM-DD date range.
+    Members may only read their own trend.
+    """
+    role = current_user.get('role')
+    if role not in ['admin', 'Trainer'] and not (role == 'member' and current_user.get('user_id') == member_id):
+        return jsonify({"error": "Unauthorized access"}), 403
+
+    bucket = request.args.get('bucket', 'auto')
+    if bucket != 'auto' and bucket not in TREND_BUCKETS:
+        return jsonify({"error": f"bucket must be auto or one of {', '.join(TREND_BUCKETS)}"}), 400
+    try:
+        window = int(request.args.get('window', DEFAULT_TREND_WINDOW))
+        start = date.fromisoformat(request.args['from']) if request.args.get('from') else None
+        end = date.fromisoformat(request.args['to']) if request.args.get('to') else None
+    except ValueError:
+        return jsonify({"error": "window must be an integer and from/to must be YYYY-MM-DD"}), 400
+    if not 1 <= window <= MAX_TREND_WINDOW:
+        return jsonify({"error": f"window must be between 1 and {MAX_TREND_WINDOW}"}), 400
+
+    result = ProgressLog.trend(member_id, bucket=bucket, window=window, start=start, end=end)
+    if result is None:
+        return jsonify({"error": "Could not load the progress trend"}), 500
+    return jsonify(result), 200
@@ -0,0 +1,161 @@
+import logging
+from datetime import date, timedelta
+from mysql.connector import Error
+from typing import Optional
+
+# Import the centralized database connection
+from database.connection import db_connection
+
+# Configure logging for the review module
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Categories members can review; stored with this exact casing
+REVIEW_CATEGORIES = ('Equipment', 'Trainer', 'Cleanliness', 'Facilities', 'Other')
+# Longest review text accepted
+MAX_REVIEW_LENGTH = 2000
+
+_STAT_COLUMNS = "reviews, rated, rating_sum, stars_1, stars_2, stars_3, stars_4, stars_5"
+
+class Review:
+    """
+    Handles member reviews: submission, the latest-reviews feed and rating statistics.
+
+    Statistics are read from `review_stats` (all time, per category) and
+    `review_stats_weekly` (per category and week), which triggers on
+    `reviews` keep up to date as running sums and histogram counters, so
+    a stats call reads one row per category (or category-week) instead
+    of scanning every review.
+    """
+
+    @staticmethod
+    def create(member_id: int, rating: int, category: str, review_text: Optional[str] = None) -> Optional[dict]:
+        """
+        Stores a review. The stats tables are updated by trigger in the same transaction.
+
+        Returns:
+            dict: The stored review, or None if a database error occurred.
+        """
+        try:
+            with db_connection() as conn, conn.cursor() as cursor:
+                cursor.execute(
+                    "INSERT INTO reviews (member_id, rating, category, review_text) VALUES (%s, %s, %s, %s)",
+                    (member_id, rating, category, review_text)
+                )
+                review_id = cursor.lastrowid
+                cursor.execute("SELECT submitted_at FROM reviews WHERE id = %s", (review_id,))
+                submitted_at = cursor.fetchone()[0]
+                conn.commit()
+                logging.info(f"Member {member_id} submitted review {review_id} ({category}, {rating}).")
+                return {
+                    "id": review_id,
+                    "member_id": member_id,
+                    "rating": rating,
+                    "category": category,
+                    "review_text": review_text,
+                    "submitted_at": submitted_at.strftime('%Y-%m-%d %H:%M:%S')
+                }
+        except Error as e:
+            logging.error(f"Database error while creating a review for member {member_id}: {e}")
+        return None
+
+    @staticmethod
+    def latest(limit: int, after: Optional[tuple] = None, category: Optional[str] = None) -> list[dict]:
+        """
+        Retrieves one page of reviews, newest first, using keyset pagination on (submitted_at, id).
+
+        Args:
+            limit (int): Maximum number of rows to return.
+            after (tuple): The (submitted_at, id) of the last row of the previous page, if any.
+            category (str): Only return reviews in this category.
+
+        Returns:
+            list[dict]: Rows of {id, member_id, member_name, rating, category, review_text, submitted_at}.
+        """
+        # Rows without a submission time can't be placed on the (submitted_at, id) keyset
+        conditions, params = ["r.submitted_at IS NOT NULL"], []
+        if category is not None:
+            conditions.append("r.category = %s")
+            params.append(category)
+        if after is not None:
+            # Expanded form of (submitted_at, id) < (%s, %s) so MySQL can range-scan the index
+            conditions.append("(r.submitted_at < %s OR (r.submitted_at = %s AND r.id < %s))")
+            params.extend([after[0], after[0], after[1]])
+
+        query = '''
+            SELECT r.id, r.member_id, m.name AS member_name, r.rating, r.category, r.review_text, r.submitted_at
+            FROM reviews r
+            LEFT JOIN Members m ON m.member_ID = r.member_id
+        '''
+        query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY r.submitted_at DESC, r.id DESC LIMIT %s"
+        params.append(limit)
+
+        try:
+            with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+                cursor.execute(query, tuple(params))
+                return list(cursor.fetchall())
+        except Error as e:
+            logging.error(f"Database error while fetching the latest reviews: {e}")
+        return []
+
+    @staticmethod
+    def stats_by_category() -> Optional[list]:
+        """
+        Returns all-time rating statistics for every category.
+
+        Returns:
+            list[dict]: Rows of {category, reviews, average_rating, histogram}, or None on a database error.
+        """
+        try:
+            with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+                cursor.execute(f"SELECT category, {_STAT_COLUMNS} FROM review_stats WHERE reviews > 0 ORDER BY category")
+                return [{"category": row['category'] or None, **Review._summarize(row)} for row in cursor.fetchall()]
+        except Error as e:
+            logging.error(f"Database error while reading review statistics by category: {e}")
+        return None
+
+    @staticmethod
+    def stats_by_week(weeks: int, category: Optional[str] = None) -> Optional[list]:
+        """
+        Returns rating statistics per category for each of the last `weeks` weeks (weeks start on Monday).
+
+        Returns:
+            list[dict]: Rows of {week_start, category, reviews, average_rating, histogram},
+            oldest week first, or None on a database error.
+        """
+        today = date.today()
+        first_week = today - timedelta(days=today.weekday(), weeks=weeks - 1)
+
+        query = f"SELECT week_start, category, {_STAT_COLUMNS} FROM review_stats_weekly WHERE week_start >= %s AND reviews > 0"
+        params: tuple = (first_week,)
+        if category is not None:
+            query += " AND category = %s"
+            params += (category,)
+        query += " ORDER BY week_start, category"
+
+        try:
+            with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+                cursor.execute(query, params)
+                return [
+                    {
+                        "week_start": row['week_start'].isoformat(),
+                        "category": row['category'] or None,
+                        **Review._summarize(row)
+                    }
+                    for row in cursor.fetchall()
+                ]
+        except Error as e:
+            logging.error(f"Database error while reading weekly review statistics: {e}")
+        return None
+
+    # --- Private Helper Methods ---
+
+    @staticmethod
+    def _summarize(row: dict) -> dict:
+        """Turns one stats row into {reviews, average_rating, histogram}."""
+        rated = int(row['rated'])
+        return {
+            "reviews": int(row['reviews']),
+            "average_rating": round(int(row['rating_sum']) / rated, 2) if rated else None,
+            "histogram": {str(n): int(row[f'stars_{n}']) for n in range(1, 6)}
+        }
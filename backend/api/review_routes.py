@@ -0,0 +1,166 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from flask import Blueprint, request, jsonify
+from .auth_routes import token_required
+from .review import Review, REVIEW_CATEGORIES, MAX_REVIEW_LENGTH
+
+# Create a Blueprint for review routes
+review_bp = Blueprint('review_bp', __name__)
+
+# Feed page size limits
+DEFAULT_FEED_SIZE = 20
+MAX_FEED_SIZE = 100
+# Weekly statistics range limits, in weeks
+DEFAULT_STATS_WEEKS = 12
+MAX_STATS_WEEKS = 104
+
+_CURSOR_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def _encode_cursor(submitted_at: datetime, review_id: int) -> str:
+    """Encodes the sort key of the last review on a page into an opaque cursor string."""
+    raw = json.dumps([submitted_at.strftime(_CURSOR_TIME_FORMAT), review_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+def _decode_cursor(cursor: str) -> tuple:
+    """Decodes a cursor produced by _encode_cursor. Raises ValueError if it is malformed."""
+    try:
+        submitted_at, review_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        submitted_at = datetime.strptime(submitted_at, _CURSOR_TIME_FORMAT)
+    except (binascii.Error, UnicodeError, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(review_id, int):
+        raise ValueError("Invalid cursor")
+    return submitted_at, review_id
+
+def _match_category(value):
+    """Returns the REVIEW_CATEGORIES entry matching `value` case-insensitively, or None."""
+    value = str(value or '').strip().lower()
+    return next((category for category in REVIEW_CATEGORIES if category.lower() == value), None)
+
+def _category_arg():
+    """Returns (category, error) for the optional `category` query parameter."""
+    if not request.args.get('category'):
+        return None, None
+    category = _match_category(request.args['category'])
+    if category is None:
+        return None, (jsonify({"error": f"category must be one of {', '.join(REVIEW_CATEGORIES)}"}), 400)
+    return category, None
+
+@review_bp.route('/', methods=['POST'])
+@token_required
+def submit_review(current_user):
+    """
+    API endpoint for members to submit a review.
+
+    Body: {"rating": 1-5, "category": "Equipment", "review_text": "..."}
+    """
+    if current_user.get('role') != 'member':
+        return jsonify({"error": "Unauthorized: Only members can submit reviews"}), 403
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+
+    rating = data.get('rating')
+    if not isinstance(rating, int) or isinstance(rating, bool) or not 1 <= rating <= 5:
+        return jsonify({"error": "rating must be an integer from 1 to 5"}), 400
+    category = _match_category(data.get('category'))
+    if category is None:
+        return jsonify({"error": f"category must be one of {', '.join(REVIEW_CATEGORIES)}"}), 400
+    review_text = data.get('review_text')
+    if review_text is not None:
+        if not isinstance(review_text, str):
+            return jsonify({"error": "review_text must be a string"}), 400
+        review_text = review_text.strip() or None
+        if review_text and len(review_text) > MAX_REVIEW_LENGTH:
+            return jsonify({"error": f"review_text must be at most {MAX_REVIEW_LENGTH} characters"}), 400
+
+    review = Review.create(current_user['user_id'], rating, category, review_text)
+    if review is None:
+        return jsonify({"error": "Could not save the review"}), 500
+    return jsonify(review), 201
+
+@review_bp.route('/', methods=['GET'])
+@token_required
+def latest_reviews(current_user):
+    """
+    API endpoint for the latest-reviews feed, newest first.
+
+    Query parameters:
+        limit:    Page size (default 20, max 100).
+        cursor:   The `next_cursor` value from the previous page.
+        category: Only return reviews in this category.
+    """
+    if current_user.get('role') not in ['admin', 'IT', 'Trainer']:
+        return jsonify({"error": "Unauthorized access"}), 403
+
+    try:
+        limit = int(request.args.get('limit', DEFAULT_FEED_SIZE))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    if limit < 1:
+        return jsonify({"error": "limit must be positive"}), 400
+    limit = min(limit, MAX_FEED_SIZE)
+
+    after = None
+    if request.args.get('cursor'):
+        try:
+            after = _decode_cursor(request.args['cursor'])
+        except ValueError:
+            return jsonify({"error": "Invalid cursor"}), 400
+    category, error = _category_arg()
+    if error:
+        return error
+
+    # Fetch one extra row to find out whether another page exists
+    rows = Review.latest(limit + 1, after=after, category=category)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = _encode_cursor(rows[-1]['submitted_at'], rows[-1]['id']) if has_more else None
+    for row in rows:
+        row['submitted_at'] = row['submitted_at'].strftime(_CURSOR_TIME_FORMAT)
+
+    return jsonify({"reviews": rows, "next_cursor": next_cursor}), 200
+
+@review_bp.route('/stats', methods=['GET'])
+@token_required
+def review_stats(current_user):
+    """API endpoint for all-time average rating, review count and rating histogram per category."""
+    if current_user.get('role') != 'admin':
+        return jsonify({"error": "Unauthorized access"}), 403
+
+    stats = Review.stats_by_category()
+    if stats is None:
+        return jsonify({"error": "Could not load review statistics"}), 500
+    return jsonify({"categories": stats}), 200
+
+@review_bp.route('/stats/weekly', methods=['GET'])
+@token_required
+def review_stats_weekly(current_user):
+    """
+    API endpoint for average rating, review count and rating histogram per category and week.
+
+    Query parameters:
+        weeks:    Number of weeks back, including the current one (default 12, max 104).
+        category: Only return this category.
+    """
+    if current_user.get('role') != 'admin':
+        return jsonify({"error": "Unauthorized access"}), 403
+
+    try:
+        weeks = int(request.args.get('weeks', DEFAULT_STATS_WEEKS))
+    except ValueError:
+        return jsonify({"error": "weeks must be an integer"}), 400
+    if not 1 <= weeks <= MAX_STATS_WEEKS:
+        return jsonify({"error": f"weeks must be between 1 and {MAX_STATS_WEEKS}"}), 400
+    category, error = _category_arg()
+    if error:
+        return error
+
+    stats = Review.stats_by_week(weeks, category=category)
+    if stats is None:
+        return jsonify({"error": "Could not load review statistics"}), 500
+    return jsonify({"weeks": weeks, "stats": stats}), 200
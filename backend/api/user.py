@@ -1,20 +1,53 @@
 import logging
-from mysql.connector import Error
+import os
+import re
+from datetime import date
+from mysql.connector import Error, IntegrityError
 from typing import Dict, Any, Optional, cast
 
 # Import the database connection and security functions
-from database.connection import get_db_connection
-from core.security import hash_password, verify_password
+from database.connection import db_connection
+from database.audit import record_login
+from core.cache import ResultCache
+from core.serialization import ColumnMap
+from core.security import hash_password, hash_passwords, verify_password, needs_rehash, HashingBusyError
 
 # Configure logging for this module
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Rows written per statement/transaction by the bulk operations
+BULK_CHUNK_SIZE = 500
+MEMBER_STATUSES = ('active', 'inactive', 'frozen')
+
+# Dashboard aggregates over Members (growth, plan mix); every member write invalidates it
+member_stats_cache = ResultCache(ttl=float(os.getenv('MEMBER_STATS_CACHE_TTL', '30')))
+
+def _escape_like(value: str) -> str:
+    """Escapes LIKE wildcards so user input only ever matches literally."""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
 class Member:
     """
     Represents a gym member and handles all related database operations
     such as registration, authentication, and data management (CRUD).
     """
 
+    # Columns that may be listed through the API, keyed by their API field name
+    LIST_FIELDS = {
+        'member_id': 'member_ID',
+        'name': 'name',
+        'email': 'email',
+        'status': 'status',
+        'phone_number': 'phone_number',
+        'membership_plan': 'membership_plan',
+        'join_date': 'join_date',
+    }
+    # SELECT list and JSON keys for LIST_FIELDS, built once
+    LIST_COLUMNS = ColumnMap(LIST_FIELDS)
+
+    __slots__ = ('member_ID', 'name', 'email', 'password', 'status', 'phone_number',
+                 'membership_plan', 'join_date', 'created_at', 'updated_at')
+
     def __init__(self, member_ID, name, email, password, status, phone_number=None, membership_plan=None, join_date=None, created_at=None, updated_at=None):
         """Initializes a Member object with data for an existing member."""
         self.member_ID = member_ID
@@ -35,11 +68,7 @@ class Member:
         """Checks if a member with the given email already exists."""
         query = "SELECT email FROM Members WHERE email = %s"
         try:
-            conn = get_db_connection()
-            if conn is None:
-                logging.error("Failed to establish database connection.")
-                return True # Fail safely
-            with conn.cursor() as cursor:
+            with db_connection() as conn, conn.cursor() as cursor:
                 cursor.execute(query, (email,))
                 return cursor.fetchone() is not None
         except Error as e:
@@ -51,11 +80,7 @@ class Member:
         """Checks and ensures that all members have distinct mobile numbers"""
         query = "SELECT phone_number FROM Members WHERE phone_number = %s"
         try:
-            conn = get_db_connection()
-            if conn is None:
-                logging.error("Failed to establish database connection.")
-                return True #Fail safety
-            with conn.cursor() as cursor:
+            with db_connection() as conn, conn.cursor() as cursor:
                 cursor.execute(query, (phone_number,))
                 return cursor.fetchone() is not None
         except Error as e:
@@ -81,13 +106,10 @@ class Member:
         """
         
         try:
-            conn = get_db_connection()
-            if conn is None:
-                logging.error("Failed to establish database connection.")
-                return None
-            with conn.cursor() as cursor:
+            with db_connection() as conn, conn.cursor() as cursor:
                 cursor.execute(query, (name, email, hashed_pw, phone_number, membership_plan, join_date))
                 conn.commit()
+                member_stats_cache.invalidate()
                 member_ID = cursor.lastrowid
                 if member_ID is None:
                     logging.error("Failed to retrieve member ID after registration.")
@@ -104,11 +126,7 @@ class Member:
         query = "SELECT * FROM Members WHERE email = %s"
         
         try:
-            conn = get_db_connection()
-            if conn is None:
-                logging.error("Failed to establish database connection.")
-                return None
-            with conn.cursor(dictionary=True) as cursor:
+            with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
                 cursor.execute(query, (email,))
                 result = cursor.fetchone()
                 
@@ -124,6 +142,8 @@ class Member:
                 if verify_password(password, result['password']):
                     logging.info(f"Login successful for member: {result['name']} ({email})")
                     cls._log_activity(result['member_ID'], "Login Successful")
+                    if needs_rehash(result['password']):
+                        cls._rehash_password(member_ID, password)
                     return cls(**result)
                 else:
                     logging.warning(f"Login failed: Invalid password for {email}")
@@ -141,11 +161,7 @@ class Member:
         query = "SELECT * FROM Members ORDER BY name ASC"
         members_list = []
         try:
-            conn = get_db_connection()
-            if conn is None:
-                logging.error("Failed to establish database connection.")
-                return []
-            with conn.cursor(dictionary=True) as cursor:
+            with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
                 cursor.execute(query)
                 res = cursor.fetchall()
                 if res:
@@ -155,16 +171,127 @@ class Member:
             logging.error(f"Database error while fetching all members: {e}")
         return members_list
 
+    @staticmethod
+    def get_all_json() -> Optional[bytes]:
+        """
+        Returns every member's LIST_FIELDS, ordered by name, encoded as a JSON array.
+
+        Rows are read with a tuple cursor and encoded directly, without
+        building Member objects, so large listings stay cheap.
+
+        Returns:
+            bytes: The JSON body, or None if a database error occurred.
+        """
+        query = f"SELECT {Member.LIST_COLUMNS.select_list} FROM Members ORDER BY name ASC"
+        try:
+            with db_connection() as conn, conn.cursor() as cursor:
+                cursor.execute(query)
+                return Member.LIST_COLUMNS.encode(cursor.fetchall())
+        except Error as e:
+            logging.error(f"Database error while fetching all members: {e}")
+        return None
+
+    @staticmethod
+    def get_page(limit: int, after: Optional[tuple] = None, fields: Optional[list] = None) -> list[dict]:
+        """
+        Retrieves one page of members ordered by (name, member_ID) using keyset pagination.
+
+        Args:
+            limit (int): Maximum number of rows to return.
+            after (tuple): The (name, member_ID) of the last row of the previous page, if any.
+            fields (list): API field names to select. Defaults to all of LIST_FIELDS.
+
+        Returns:
+            list[dict]: Rows keyed by API field name. Always includes 'name' and 'member_id'
+            so the caller can build the next cursor.
+        """
+        requested = fields or list(Member.LIST_FIELDS)
+        columns = [f for f in Member.LIST_FIELDS if f in requested or f in ('member_id', 'name')]
+        select_list = ', '.join(f"{Member.LIST_FIELDS[f]} AS {f}" for f in columns)
+
+        query = f"SELECT {select_list} FROM Members"
+        params: list = []
+        if after is not None:
+            # Expanded form of (name, member_ID) > (%s, %s) so MySQL can range-scan the index
+            query += " WHERE name > %s OR (name = %s AND member_ID > %s)"
+            params.extend([after[0], after[0], after[1]])
+        query += " ORDER BY name ASC, member_ID ASC LIMIT %s"
+        params.append(limit)
+
+        try:
+            with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+                cursor.execute(query, tuple(params))
+                return cast(list, cursor.fetchall())
+        except Error as e:
+            logging.error(f"Database error while fetching a page of members: {e}")
+        return []
+
+    @staticmethod
+    def search(q: str, limit: int = 20) -> list[dict]:
+        """
+        Finds members by name, email or phone number.
+
+        Prefix matches on name, email and phone each use their own index and
+        rank above fuzzy matches from the FULLTEXT index on name, which are
+        ordered by relevance. Every branch is capped at `limit` rows.
+
+        Returns:
+            list[dict]: At most `limit` members, best matches first, without password hashes.
+        """
+        prefix = _escape_like(q) + '%'
+        columns = "member_ID AS member_id, name, email, phone_number, membership_plan, status"
+        branches = [
+            f"(SELECT {columns}, 1 AS rank_group, 0 AS score FROM Members WHERE name LIKE %s ORDER BY name LIMIT %s)",
+            f"(SELECT {columns}, 2 AS rank_group, 0 AS score FROM Members WHERE email LIKE %s ORDER BY email LIMIT %s)",
+        ]
+        params: list = [prefix, limit, prefix, limit]
+
+        if any(ch.isdigit() for ch in q):
+            branches.append(
+                f"(SELECT {columns}, 3 AS rank_group, 0 AS score FROM Members "
+                f"WHERE phone_number LIKE %s ORDER BY phone_number LIMIT %s)"
+            )
+            params.extend([prefix, limit])
+
+        # Words shorter than InnoDB's default minimum token size are not in the FULLTEXT index
+        words = [w for w in re.findall(r'\w+', q) if len(w) >= 3]
+        if words:
+            boolean_query = ' '.join(f"{w}*" for w in words)
+            branches.append(
+                f"(SELECT {columns}, 4 AS rank_group, MATCH(name) AGAINST (%s IN BOOLEAN MODE) AS score "
+                f"FROM Members WHERE MATCH(name) AGAINST (%s IN BOOLEAN MODE) ORDER BY score DESC LIMIT %s)"
+            )
+            params.extend([boolean_query, boolean_query, limit])
+
+        query = " UNION ALL ".join(branches) + " ORDER BY rank_group, score DESC"
+
+        try:
+            with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+                cursor.execute(query, tuple(params))
+                rows = cursor.fetchall()
+        except Error as e:
+            logging.error(f"Database error while searching members for '{q}': {e}")
+            return []
+
+        # A member can match several branches; keep its best-ranked row
+        results, seen = [], set()
+        for row in rows:
+            if row['member_id'] in seen:
+                continue
+            seen.add(row['member_id'])
+            row.pop('rank_group')
+            row.pop('score')
+            results.append(row)
+            if len(results) == limit:
+                break
+        return results
+
     @staticmethod
     def find_by_id(member_ID: int) -> Optional['Member']:
         """Finds a single member by their ID."""
         query = "SELECT * FROM Members WHERE member_ID = %s"
         try:
-            conn = get_db_connection()
-            if conn is None:
-                logging.error("Failed to establish database connection.")
-                return None
-            with conn.cursor(dictionary=True) as cursor:
+            with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
                 cursor.execute(query, (member_ID,))
                 result = cursor.fetchone()
                 """Casting the result into Dictionary as the type checker might infer it 
@@ -190,14 +317,11 @@ class Member:
         values = [updates[key] for key in updates if key in valid_columns] + [member_ID]
 
         try:
-            conn = get_db_connection()
-            if conn is None:
-                logging.error("Failed to establish database connection.")
-                return None
-            with conn.cursor() as cursor:
+            with db_connection() as conn, conn.cursor() as cursor:
                 cursor.execute(query, tuple(values))
                 conn.commit()
                 if cursor.rowcount > 0:
+                    member_stats_cache.invalidate()
                     return Member.find_by_id(member_ID)
         except Error as e:
             logging.error(f"Database error updating member {member_ID}: {e}")
@@ -208,32 +332,306 @@ class Member:
         """Deletes a member from the database."""
         query = "DELETE FROM Members WHERE member_ID = %s"
         try:
-            conn = get_db_connection()
-            if conn is None:
-                logging.error("Failed to establish database connection.")
-                return False
-            with conn.cursor() as cursor:
+            with db_connection() as conn, conn.cursor() as cursor:
                 cursor.execute(query, (member_ID,))
                 conn.commit()
-                return cursor.rowcount > 0
+                if cursor.rowcount > 0:
+                    member_stats_cache.invalidate()
+                    return True
         except Error as e:
             logging.error(f"Database error deleting member {member_ID}: {e}")
         return False
 
+    # --- Bulk Methods ---
+
+    @staticmethod
+    def bulk_create(items: list, chunk_size: int = BULK_CHUNK_SIZE) -> list[dict]:
+        """
+        Registers many members at once.
+
+        All items are validated in one pass (required string fields, join_date,
+        duplicates inside the batch and against the database, with emails
+        compared case-insensitively like the UNIQUE column), passwords are
+        hashed in parallel across the bcrypt worker pool, and valid rows are
+        inserted with one multi-row INSERT per chunk, each chunk in its own
+        transaction. A chunk that still hits a unique key (a member registered
+        concurrently) is retried row by row so only the conflicting items fail.
+
+        Args:
+            items (list): Member dicts with the same fields as registration.
+            chunk_size (int): Rows per INSERT/transaction.
+
+        Returns:
+            list[dict]: One result per input item, in input order, with
+            `status` 'created' (and `member_id`) or 'error' (and `error`).
+
+        Raises:
+            HashingBusyError: If the bcrypt pool stayed saturated; nothing is inserted.
+        """
+        required_fields = ['name', 'email', 'password', 'phone_number', 'membership_plan']
+        results: list = [None] * len(items)
+        seen_emails, seen_phones = set(), set()
+        valid = []
+
+        for index, item in enumerate(items):
+            if not isinstance(item, dict) or not all(item.get(f) for f in required_fields):
+                results[index] = {"index": index, "status": "error", "error": "Missing required fields"}
+            elif not all(isinstance(item[f], str) for f in required_fields) or \
+                    not isinstance(item.get('join_date') or '', str):
+                results[index] = {"index": index, "status": "error", "error": "Fields must be strings"}
+            elif item.get('join_date') and not Member._is_iso_date(item['join_date']):
+                results[index] = {"index": index, "status": "error", "error": "join_date must be YYYY-MM-DD"}
+            elif Member._email_key(item['email']) in seen_emails:
+                results[index] = {"index": index, "status": "error", "error": "Duplicate email in request"}
+            elif item['phone_number'] in seen_phones:
+                results[index] = {"index": index, "status": "error", "error": "Duplicate phone number in request"}
+            else:
+                seen_emails.add(Member._email_key(item['email']))
+                seen_phones.add(item['phone_number'])
+                valid.append((index, item))
+
+        try:
+            existing_emails = Member._existing_values('email', [item['email'] for _, item in valid])
+            existing_phones = Member._existing_values('phone_number', [item['phone_number'] for _, item in valid])
+        except Error as e:
+            logging.error(f"Database error while validating bulk member registration: {e}")
+            for index, _ in valid:
+                results[index] = {"index": index, "status": "error", "error": "Database error"}
+            return results
+
+        existing_emails = {Member._email_key(email) for email in existing_emails}
+        to_insert = []
+        for index, item in valid:
+            if Member._email_key(item['email']) in existing_emails:
+                results[index] = {"index": index, "status": "error", "error": "Email already in use"}
+            elif item['phone_number'] in existing_phones:
+                results[index] = {"index": index, "status": "error", "error": "Phone number already in use"}
+            else:
+                to_insert.append((index, item))
+
+        hashes = hash_passwords([item['password'] for _, item in to_insert])
+        today = date.today().isoformat()
+        query = """
+            INSERT INTO Members (name, email, password, phone_number, membership_plan, join_date)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """
+
+        for start in range(0, len(to_insert), chunk_size):
+            chunk = to_insert[start:start + chunk_size]
+            rows = [
+                (item['name'], item['email'], hashed, item['phone_number'],
+                 item['membership_plan'], item.get('join_date') or today)
+                for (_, item), hashed in zip(chunk, hashes[start:start + chunk_size])
+            ]
+            try:
+                with db_connection() as conn, conn.cursor() as cursor:
+                    try:
+                        cursor.executemany(query, rows)
+                        conn.commit()
+                        inserted = list(chunk)
+                    except IntegrityError as e:
+                        conn.rollback()
+                        logging.warning(f"Bulk member chunk hit a unique key, inserting it row by row: {e}")
+                        inserted = []
+                        for (index, item), row in zip(chunk, rows):
+                            try:
+                                cursor.execute(query, row)
+                                conn.commit()
+                                inserted.append((index, item))
+                            except IntegrityError:
+                                conn.rollback()
+                                results[index] = {"index": index, "status": "error",
+                                                  "error": "Email or phone number already in use"}
+                            except Error as row_error:
+                                conn.rollback()
+                                logging.error(f"Database error during bulk member registration: {row_error}")
+                                results[index] = {"index": index, "status": "error", "error": "Database error"}
+                    except Error:
+                        conn.rollback()
+                        raise
+                    if inserted:
+                        member_stats_cache.invalidate()
+                        # Read the generated ids back by the unique email column
+                        emails = [item['email'] for _, item in inserted]
+                        placeholders = ', '.join(['%s'] * len(emails))
+                        cursor.execute(f"SELECT email, member_ID FROM Members WHERE email IN ({placeholders})",
+                                       tuple(emails))
+                        ids = {Member._email_key(email): member_ID for email, member_ID in cursor.fetchall()}
+                for index, item in inserted:
+                    results[index] = {"index": index, "status": "created",
+                                      "member_id": ids.get(Member._email_key(item['email']))}
+                logging.info(f"Bulk registered {len(inserted)} members.")
+            except Error as e:
+                logging.error(f"Database error during bulk member registration: {e}")
+                for index, _ in chunk:
+                    if results[index] is None:
+                        results[index] = {"index": index, "status": "error", "error": "Database error, chunk rolled back"}
+
+        return results
+
+    @staticmethod
+    def bulk_update(items: list, chunk_size: int = BULK_CHUNK_SIZE) -> list[dict]:
+        """
+        Updates many members at once with one CASE-based UPDATE per chunk.
+
+        Args:
+            items (list): Dicts with `member_id` plus the fields to change
+                (name, email, phone_number, membership_plan, status).
+            chunk_size (int): Members per UPDATE/transaction.
+
+        Returns:
+            list[dict]: One result per input item with `status` 'updated',
+            'not_found' or 'error'.
+        """
+        valid_columns = ['name', 'email', 'phone_number', 'membership_plan', 'status']
+        results: list = [None] * len(items)
+        seen_ids = set()
+        valid = []
+
+        for index, item in enumerate(items):
+            member_ID = item.get('member_id') if isinstance(item, dict) else None
+            changes = {k: v for k, v in item.items() if k in valid_columns} if isinstance(item, dict) else {}
+            if not isinstance(member_ID, int):
+                results[index] = {"index": index, "status": "error", "error": "member_id must be an integer"}
+            elif member_ID in seen_ids:
+                results[index] = {"index": index, "status": "error", "error": "Duplicate member_id in request"}
+            elif not changes:
+                results[index] = {"index": index, "status": "error", "error": "No valid fields to update"}
+            elif 'status' in changes and changes['status'] not in MEMBER_STATUSES:
+                results[index] = {"index": index, "status": "error", "error": "Invalid status"}
+            else:
+                seen_ids.add(member_ID)
+                valid.append((index, member_ID, changes))
+
+        for start in range(0, len(valid), chunk_size):
+            chunk = valid[start:start + chunk_size]
+            ids = [member_ID for _, member_ID, _ in chunk]
+            id_placeholders = ', '.join(['%s'] * len(ids))
+
+            # One CASE expression per column that any item in the chunk changes
+            set_parts, params = [], []
+            for column in valid_columns:
+                cases = [(member_ID, changes[column]) for _, member_ID, changes in chunk if column in changes]
+                if not cases:
+                    continue
+                set_parts.append(f"{column} = CASE member_ID {' '.join(['WHEN %s THEN %s'] * len(cases))} ELSE {column} END")
+                for member_ID, value in cases:
+                    params.extend([member_ID, value])
+            query = f"UPDATE Members SET {', '.join(set_parts)} WHERE member_ID IN ({id_placeholders})"
+
+            try:
+                with db_connection() as conn, conn.cursor() as cursor:
+                    try:
+                        cursor.execute(f"SELECT member_ID FROM Members WHERE member_ID IN ({id_placeholders})", tuple(ids))
+                        found = {row[0] for row in cursor.fetchall()}
+                        cursor.execute(query, tuple(params + ids))
+                        conn.commit()
+                        member_stats_cache.invalidate()
+                    except Error:
+                        conn.rollback()
+                        raise
+                for index, member_ID, _ in chunk:
+                    results[index] = {"index": index, "member_id": member_ID,
+                                      "status": "updated" if member_ID in found else "not_found"}
+            except Error as e:
+                logging.error(f"Database error during bulk member update: {e}")
+                for index, member_ID, _ in chunk:
+                    results[index] = {"index": index, "member_id": member_ID, "status": "error",
+                                      "error": "Database error, chunk rolled back"}
+
+        return results
+
+    @staticmethod
+    def bulk_set_status(status: str, member_ids: Optional[list] = None, membership_plan: Optional[str] = None,
+                        chunk_size: int = BULK_CHUNK_SIZE) -> Optional[dict]:
+        """
+        Changes the status of a list of members, or of every member on a plan.
+
+        Plan-wide changes run as repeated `UPDATE ... LIMIT chunk_size`
+        statements, each committed on its own, so freezing a large plan never
+        holds row locks on the whole table in one long transaction.
+
+        Returns:
+            dict: 'updated' count, plus per-id 'not_found' list when ids were given.
+            None if a database error occurred.
+        """
+        try:
+            with db_connection() as conn, conn.cursor() as cursor:
+                if membership_plan is not None:
+                    updated = 0
+                    while True:
+                        cursor.execute(
+                            "UPDATE Members SET status = %s WHERE membership_plan = %s AND status <> %s LIMIT %s",
+                            (status, membership_plan, status, chunk_size)
+                        )
+                        conn.commit()
+                        updated += cursor.rowcount
+                        if cursor.rowcount < chunk_size:
+                            break
+                    return {"updated": updated}
+
+                ids = list(dict.fromkeys(member_ids or []))
+                found = set()
+                for start in range(0, len(ids), chunk_size):
+                    chunk = ids[start:start + chunk_size]
+                    placeholders = ', '.join(['%s'] * len(chunk))
+                    cursor.execute(f"SELECT member_ID FROM Members WHERE member_ID IN ({placeholders})", tuple(chunk))
+                    found.update(row[0] for row in cursor.fetchall())
+                    cursor.execute(
+                        f"UPDATE Members SET status = %s WHERE member_ID IN ({placeholders})",
+                        (status, *chunk)
+                    )
+                    conn.commit()
+                return {"updated": len(found), "not_found": [i for i in ids if i not in found]}
+        except Error as e:
+            logging.error(f"Database error during bulk status change to {status}: {e}")
+        return None
+
     # --- Private Helper Methods ---
-    
+
     @staticmethod
-    def _log_activity(member_ID: int, status: str):
-        """Private helper to log login attempts to the MLD table."""
-        query = "INSERT INTO MLD (mem_id, login_status) VALUES (%s, %s)"
+    def _email_key(email: str) -> str:
+        """Private helper normalising an email the way the case-insensitive UNIQUE column compares it."""
+        return email.strip().lower()
+
+    @staticmethod
+    def _is_iso_date(value: str) -> bool:
+        """Private helper checking that `value` is a YYYY-MM-DD date."""
+        try:
+            date.fromisoformat(value)
+            return True
+        except ValueError:
+            return False
+
+    @staticmethod
+    def _existing_values(column: str, values: list) -> set:
+        """Private helper returning which of `values` already exist in a unique-ish Members column."""
+        existing = set()
+        if not values:
+            return existing
+        with db_connection() as conn, conn.cursor() as cursor:
+            for start in range(0, len(values), BULK_CHUNK_SIZE):
+                chunk = values[start:start + BULK_CHUNK_SIZE]
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(f"SELECT {column} FROM Members WHERE {column} IN ({placeholders})", tuple(chunk))
+                existing.update(row[0] for row in cursor.fetchall())
+        return existing
+
+    @staticmethod
+    def _rehash_password(member_ID: int, password: str):
+        """Private helper to re-hash a password stored with an outdated bcrypt work factor."""
+        query = "UPDATE Members SET password = %s WHERE member_ID = %s"
         try:
-            conn = get_db_connection()
-            if conn is None:
-                logging.error("Failed to establish database connection.")
-                return
-            with conn.cursor() as cursor:
-                cursor.execute(query, (member_ID, status))
+            with db_connection() as conn, conn.cursor() as cursor:
+                cursor.execute(query, (hash_password(password), member_ID))
                 conn.commit()
-        except Error as e:
-            logging.error(f"Failed to log activity for member ID {member_ID}: {e}")
+                logging.info(f"Upgraded password hash for member ID {member_ID}.")
+        except (Error, HashingBusyError) as e:
+            # Best effort: the login already succeeded, the upgrade is retried next time
+            logging.warning(f"Could not upgrade password hash for member ID {member_ID}: {e}")
+    
+    @staticmethod
+    def _log_activity(member_ID: int, status: str):
+        """Private helper to log login attempts to the MLD table (written in the background)."""
+        record_login('MLD', member_ID, status)
 
@@ -0,0 +1,33 @@
+import logging
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+from database.connection import setup_database
+from api.analytics import Analytics
+
+# Configure logging for the backfill script
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def main():
+    """
+    Rebuilds the revenue summary from the full payments history.
+
+    The summary is kept current by triggers, so this is only needed after
+    loading historical payments with triggers bypassed (e.g. a restore).
+    """
+    setup_database()
+
+    summary = Analytics.rebuild_revenue_summary()
+    if summary is None:
+        raise SystemExit(1)
+
+    print("--- Revenue summary rebuilt ---")
+    for key, value in summary.items():
+        print(f"   - {key}: {value}")
+
+
+if __name__ == '__main__':
+    main()
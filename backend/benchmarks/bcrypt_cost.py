@@ -0,0 +1,60 @@
+"""
+Micro-benchmark for bcrypt work factors.
+
+Reports hashes per second at each cost, both in a single thread and through
+the bcrypt worker pool used by the API, to help pick BCRYPT_ROUNDS and
+BCRYPT_WORKERS for a given machine.
+
+Run from the backend folder:
+    python -m benchmarks.bcrypt_cost --min-rounds 10 --max-rounds 13
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import security
+
+
+def single_thread_rate(rounds: int, seconds: float) -> float:
+    """Hashes per second using bcrypt directly in this thread."""
+    count = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        security._hashpw(b'benchmark-password', rounds)
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+def pool_rate(rounds: int, batch: int) -> float:
+    """Hashes per second when a batch is spread across the worker pool."""
+    executor = security._get_executor()
+    started = time.perf_counter()
+    futures = [executor.submit(security._hashpw, b'benchmark-password', rounds) for _ in range(batch)]
+    for f in futures:
+        f.result()
+    return batch / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure bcrypt hashes per second at each work factor.")
+    parser.add_argument('--min-rounds', type=int, default=10)
+    parser.add_argument('--max-rounds', type=int, default=13)
+    parser.add_argument('--seconds', type=float, default=2.0, help="Time spent per single-thread measurement")
+    args = parser.parse_args()
+
+    workers = max(security.BCRYPT_WORKERS, 1)
+    # Warm up the pool so process start-up is not counted
+    security._get_executor().submit(security._hashpw, b'warm-up', 4).result()
+
+    print(f"{'rounds':>6} {'ms/hash':>9} {'1 thread/s':>11} {f'pool({workers})/s':>12}")
+    for rounds in range(args.min_rounds, args.max_rounds + 1):
+        single = single_thread_rate(rounds, args.seconds)
+        pooled = pool_rate(rounds, batch=max(workers * 4, int(single * args.seconds)))
+        print(f"{rounds:>6} {1000 / single:>9.1f} {single:>11.1f} {pooled:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,409 @@
+"""
+Load test for the API against a local MySQL/MariaDB stand-in.
+
+`seed` fills the database with synthetic members, employees and equipment
+plus the attendance history in gym_traffic_data.csv. `run` drives the real
+Flask app with concurrent keep-alive clients, one endpoint at a time, and
+reports throughput and p50/p95/p99 latency per endpoint. Results are saved
+as JSON so `compare` can diff two runs (e.g. before and after a commit).
+A run exits non-zero if any endpoint answered with a non-2xx status, since
+its latencies would describe an error path rather than the endpoint.
+
+Point MYSQL_HOST/MYSQL_PORT at a throwaway instance, never production, e.g.
+    docker run -d -p 3307:3306 -e MYSQL_ROOT_PASSWORD=bench mysql:8
+
+Run from the backend folder:
+    MYSQL_PORT=3307 MYSQL_PASSWORD=bench python -m benchmarks.load_test seed
+    MYSQL_PORT=3307 MYSQL_PASSWORD=bench python -m benchmarks.load_test run --concurrency 16
+    python -m benchmarks.load_test compare old.json new.json
+
+Member search is expected to answer with p99 < 20 ms on 100,000 members;
+check that with
+    python -m benchmarks.load_test seed --search-scale
+    python -m benchmarks.load_test run --members 100000 --endpoints members_search --max-p99 20
+
+By default `run` serves the app in-process on a threaded Werkzeug server,
+so clients and server share one interpreter. Pass --url to measure a
+separately started server instead (e.g. a production WSGI server).
+"""
+import argparse
+import http.client
+import json
+import logging
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import db_connection, setup_database
+from core.security import hash_password
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRAFFIC_CSV = os.path.join(os.path.dirname(BACKEND_DIR), 'gym_traffic_data.csv')
+RESULTS_DIR = os.path.join(BACKEND_DIR, 'benchmarks', 'results')
+
+# Every synthetic account shares this password; seeded emails use the example.test domain
+BENCH_PASSWORD = 'bench-password'
+BENCH_ADMIN = 'bench-admin'
+
+# Dataset size and p99 budget that member search is expected to meet
+SEARCH_MEMBERS = 100_000
+SEARCH_P99_TARGET_MS = 20
+
+FIRST_NAMES = ['Aarav', 'Maya', 'Liam', 'Zara', 'Noah', 'Isha', 'Omar', 'Chloe', 'Ravi', 'Elena', 'Kenji', 'Sara']
+LAST_NAMES = ['Sharma', 'Smith', 'Khan', 'Garcia', 'Chen', 'Patel', 'Nguyen', 'Silva', 'Mehta', 'Brown']
+PLANS = ['Monthly', 'Quarterly', 'Yearly']
+EQUIPMENT = [('Treadmill', 'Cardio'), ('Rowing Machine', 'Cardio'), ('Spin Bike', 'Cardio'),
+             ('Squat Rack', 'Strength'), ('Bench Press', 'Strength'), ('Cable Machine', 'Strength'),
+             ('Dumbbell Set', 'Free Weights'), ('Kettlebell Set', 'Free Weights'), ('Yoga Mat', 'Accessories')]
+
+
+# --- Seeding ---
+
+def seed(members: int, employees: int, equipment: int, traffic_csv: str, seed_value: int = 42) -> dict:
+    """
+    Inserts the synthetic data set. Safe to re-run: accounts are keyed by
+    unique emails/usernames, equipment is topped up to the requested count,
+    and the attendance import resumes from its checkpoint.
+
+    Members are inserted first so that, on an empty database, their ids
+    line up with the member ids in the traffic history.
+    """
+    from import_attendance import SwipeImporter
+
+    setup_database()
+    rng = random.Random(seed_value)
+    hashed = hash_password(BENCH_PASSWORD)
+    today = date.today()
+    summary = {}
+
+    member_rows = [
+        (f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", f"bench.member{i}@example.test", hashed,
+         f"555{i:07d}", rng.choice(PLANS), today - timedelta(days=rng.randrange(3 * 365)),
+         rng.choices(['active', 'inactive', 'frozen'], weights=[85, 10, 5])[0])
+        for i in range(1, members + 1)
+    ]
+    employee_rows = [
+        (f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", f"bench.employee{i}@example.test", hashed,
+         rng.randrange(25000, 60000), 'Trainer' if i % 4 else 'IT')
+        for i in range(1, employees + 1)
+    ]
+
+    with db_connection() as conn, conn.cursor() as cursor:
+        for start in range(0, len(member_rows), 1000):
+            cursor.executemany(
+                "INSERT IGNORE INTO Members (name, email, password, phone_number, membership_plan, join_date, status) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                member_rows[start:start + 1000]
+            )
+            conn.commit()
+        cursor.executemany(
+            "INSERT IGNORE INTO Employee (name, email, password, salary, role) VALUES (%s, %s, %s, %s, %s)",
+            employee_rows
+        )
+        cursor.execute(
+            "INSERT IGNORE INTO ADMIN (name, username, password) VALUES (%s, %s, %s)",
+            ('Benchmark Admin', BENCH_ADMIN, hashed)
+        )
+
+        cursor.execute("SELECT COUNT(*) FROM Equipment")
+        missing = equipment - cursor.fetchone()[0]
+        if missing > 0:
+            cursor.executemany(
+                "INSERT INTO Equipment (e_name, e_qty, e_unit_price, e_category) VALUES (%s, %s, %s, %s)",
+                [(f"{name} {i}", rng.randrange(1, 12), rng.randrange(50, 5000), category)
+                 for i, (name, category) in enumerate(rng.choices(EQUIPMENT, k=missing), start=1)]
+            )
+        conn.commit()
+
+        for table in ('Members', 'Employee', 'Equipment'):
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            summary[table.lower()] = cursor.fetchone()[0]
+
+    if traffic_csv:
+        counts = SwipeImporter(traffic_csv, source='benchmark:gym_traffic_data.csv').run()
+        summary['attendance_sessions_written'] = counts['sessions_written']
+    return summary
+
+
+# --- Load generation ---
+
+def scenarios(members: int) -> dict:
+    """
+    Endpoint name -> function(rng) returning (method, path, body, needs_token).
+    Logins pick a random seeded account, so they exercise bcrypt like real traffic.
+    """
+    return {
+        'ping': lambda rng: ('GET', '/api/ping', None, False),
+        'login_member': lambda rng: ('POST', '/api/auth/login/member',
+                                     {"email": f"bench.member{rng.randint(1, members)}@example.test",
+                                      "password": BENCH_PASSWORD}, False),
+        'members_list': lambda rng: ('GET', '/api/members/?limit=50', None, True),
+        'members_get': lambda rng: ('GET', f"/api/members/{rng.randint(1, members)}", None, True),
+        'members_search': lambda rng: ('GET', f"/api/members/search?q={search_term(rng, members)}", None, True),
+        'employees_list': lambda rng: ('GET', '/api/employees/', None, True),
+        'equipment_list': lambda rng: ('GET', '/api/equipment/', None, True),
+        'occupancy': lambda rng: ('GET', '/api/occupancy', None, True),
+        'attendance_heatmap': lambda rng: ('GET', '/api/analytics/attendance/heatmap', None, True),
+        'member_growth': lambda rng: ('GET', '/api/analytics/growth/members', None, True),
+        'member_plans': lambda rng: ('GET', '/api/analytics/members/plans', None, True),
+        'revenue_monthly': lambda rng: ('GET', '/api/analytics/revenue/monthly', None, True),
+    }
+
+
+def search_term(rng: random.Random, members: int) -> str:
+    """A search box query: a name prefix, a whole first name, or the start of a seeded email or phone number."""
+    kind = rng.randrange(4)
+    if kind == 0:
+        return rng.choice(FIRST_NAMES)[:3]
+    if kind == 1:
+        return rng.choice(FIRST_NAMES)
+    member = rng.randint(1, members)
+    if kind == 2:
+        return f"bench.member{member}"[:rng.randint(13, 16)]
+    return f"555{member:07d}"[:rng.randint(5, 8)]
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+class _Client:
+    """One keep-alive HTTP connection that records the latency of each request."""
+
+    def __init__(self, base_url: str, token: str):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        self.token = token
+
+    def request(self, method: str, path: str, body, needs_token: bool) -> int:
+        headers = {'Content-Type': 'application/json'}
+        if needs_token:
+            headers['Authorization'] = f"Bearer {self.token}"
+        try:
+            self.conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+            response = self.conn.getresponse()
+            response.read()
+            return response.status
+        except (OSError, http.client.HTTPException):
+            # Drop the broken connection; http.client reconnects on the next request
+            self.conn.close()
+            return 0
+
+
+def run_endpoint(base_url: str, token: str, make_request, concurrency: int, duration: float, warmup: float) -> dict:
+    """Hammers one endpoint with `concurrency` clients for `duration` seconds after a warm-up."""
+    latencies: list = []
+    errors = [0]
+    lock = threading.Lock()
+    start_at = time.perf_counter() + warmup
+    stop_at = start_at + duration
+
+    def worker(worker_id: int):
+        rng = random.Random(worker_id)
+        client = _Client(base_url, token)
+        local, local_errors = [], 0
+        while True:
+            began = time.perf_counter()
+            if began >= stop_at:
+                break
+            status = client.request(*make_request(rng))
+            if began >= start_at:
+                local.append(time.perf_counter() - began)
+                if not 200 <= status < 300:
+                    local_errors += 1
+        client.conn.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "throughput_rps": round(len(latencies) / duration, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round((latencies[-1] if latencies else 0) * 1000, 2),
+    }
+
+
+def _serve_in_process():
+    """Starts the app from main.create_app on a threaded Werkzeug server on a free port. Returns (url, server)."""
+    from werkzeug.serving import make_server
+    from main import create_app
+
+    # Per-request access logs would dominate the run
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+
+    server = make_server('127.0.0.1', 0, create_app(), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", server
+
+
+def needs_token(scenario_map: dict, names: list) -> bool:
+    """True if any of the named scenarios calls an authenticated endpoint."""
+    return any(scenario_map[name](random.Random())[3] for name in names)
+
+
+def admin_token(base_url: str) -> str:
+    client = _Client(base_url, token='')
+    client.conn.request('POST', '/api/auth/login/admin',
+                        body=json.dumps({"username": BENCH_ADMIN, "password": BENCH_PASSWORD}),
+                        headers={'Content-Type': 'application/json'})
+    response = client.conn.getresponse()
+    payload = json.loads(response.read() or b'{}')
+    client.conn.close()
+    if response.status != 200:
+        raise SystemExit(f"Admin login failed ({response.status}); run the `seed` command first.")
+    return payload['token']
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args) -> dict:
+    scenario_map = scenarios(args.members)
+    names = args.endpoints or list(scenario_map)
+    unknown = [name for name in names if name not in scenario_map]
+    if unknown:
+        raise SystemExit(f"Unknown endpoints: {', '.join(unknown)}. Choose from: {', '.join(scenario_map)}")
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        base_url, server = _serve_in_process()
+    token = admin_token(base_url) if needs_token(scenario_map, names) else ''
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": datetime.now().isoformat(timespec='seconds'),
+            "url": args.url or 'in-process',
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "python": platform.python_version(),
+            "env": {k: os.getenv(k) for k in ('DB_POOL_SIZE', 'BCRYPT_ROUNDS', 'BCRYPT_WORKERS', 'TOKEN_CACHE_SIZE')},
+        },
+        "endpoints": {},
+    }
+
+    print(f"{'endpoint':<20} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name in names:
+        result = run_endpoint(base_url, token, scenario_map[name], args.concurrency, args.duration, args.warmup)
+        report["endpoints"][name] = result
+        print(f"{name:<20} {result['throughput_rps']:>9.1f} {result['p50_ms']:>8.2f} "
+              f"{result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['errors']:>7}")
+
+    if server is not None:
+        server.shutdown()
+    return report
+
+
+def compare(old_path: str, new_path: str):
+    """Prints the per-endpoint change in throughput and latency between two saved runs."""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    def change(before, after):
+        return f"{(after - before) / before * 100:+.1f}%" if before else 'n/a'
+
+    print(f"{old['meta']['commit']} -> {new['meta']['commit']}")
+    print(f"{'endpoint':<20} {'req/s':>9} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for name, after in new['endpoints'].items():
+        before = old['endpoints'].get(name)
+        if before is None:
+            print(f"{name:<20} (new)")
+            continue
+        print(f"{name:<20} {change(before['throughput_rps'], after['throughput_rps']):>9} "
+              f"{change(before['p50_ms'], after['p50_ms']):>9} {change(before['p95_ms'], after['p95_ms']):>9} "
+              f"{change(before['p99_ms'], after['p99_ms']):>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a benchmark database and load-test the API.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    seed_parser = commands.add_parser('seed', help="Insert synthetic members, staff, equipment and traffic history")
+    seed_parser.add_argument('--members', type=int, default=2000)
+    seed_parser.add_argument('--search-scale', action='store_true',
+                             help=f"Seed {SEARCH_MEMBERS} members and skip the traffic import, "
+                                  f"the data set the member search target is set against")
+    seed_parser.add_argument('--employees', type=int, default=40)
+    seed_parser.add_argument('--equipment', type=int, default=200)
+    seed_parser.add_argument('--traffic-csv', default=TRAFFIC_CSV, help="Turnstile dump to import ('' to skip)")
+
+    run_parser = commands.add_parser('run', help="Load-test each endpoint and save the results as JSON")
+    run_parser.add_argument('--url', help="Base URL of a running server (default: serve the app in-process)")
+    run_parser.add_argument('--concurrency', type=int, default=8, help="Concurrent keep-alive clients")
+    run_parser.add_argument('--duration', type=float, default=10.0, help="Measured seconds per endpoint")
+    run_parser.add_argument('--warmup', type=float, default=2.0, help="Unmeasured seconds before each endpoint")
+    run_parser.add_argument('--members', type=int, default=2000, help="Number of seeded members to pick from")
+    run_parser.add_argument('--endpoints', nargs='+', help="Subset of endpoints to test")
+    run_parser.add_argument('--max-p99', type=float,
+                            help=f"Fail the run if an endpoint's p99 exceeds this many ms "
+                                 f"(member search target: {SEARCH_P99_TARGET_MS})")
+    run_parser.add_argument('--output', help="Where to save the JSON report (default: benchmarks/results/)")
+
+    compare_parser = commands.add_parser('compare', help="Diff two saved reports")
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+
+    args = parser.parse_args()
+
+    if args.command == 'seed':
+        if args.search_scale:
+            args.members, args.traffic_csv = max(args.members, SEARCH_MEMBERS), ''
+        summary = seed(args.members, args.employees, args.equipment, args.traffic_csv)
+        print("--- Benchmark data seeded ---")
+        for key, value in summary.items():
+            print(f"   - {key}: {value}")
+    elif args.command == 'run':
+        report = run(args)
+        output = args.output or os.path.join(
+            RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{report['meta']['commit'] or 'nogit'}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved results to {output}")
+        failing = [name for name, result in report['endpoints'].items() if result['errors']]
+        if failing:
+            raise SystemExit(f"Non-2xx responses from: {', '.join(failing)}")
+        if args.max_p99 is not None:
+            slow = [f"{name} ({result['p99_ms']} ms)" for name, result in report['endpoints'].items()
+                    if result['p99_ms'] > args.max_p99]
+            if slow:
+                raise SystemExit(f"p99 above {args.max_p99} ms: {', '.join(slow)}")
+    else:
+        compare(args.old, args.new)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""
+Micro-benchmark for serializing large listings.
+
+Compares the member listing as it used to be built (dictionary cursor rows
+-> Member objects -> one response dict per member with strftime -> jsonify)
+with the lean path (tuple cursor rows zipped with precomputed keys and
+encoded once by core.serialization, orjson when installed). Rows are
+synthetic, so no database is needed; converting tuples to dicts is counted
+in the old path because the dictionary cursor does that work per row.
+
+Also reports the memory held by model instances with and without __slots__.
+
+Run from the backend folder:
+    python -m benchmarks.serialization --rows 100000
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify
+
+from api.user import Member
+from core import serialization
+
+# Column order of SELECT * FROM Members
+MEMBER_COLUMNS = ('member_ID', 'name', 'email', 'password', 'phone_number', 'membership_plan',
+                  'join_date', 'status', 'created_at', 'updated_at')
+PLANS = ('Basic', 'Standard', 'Premium', 'Annual')
+
+
+def member_rows(count: int):
+    """Returns (full rows as SELECT * returns them, projected rows as the lean query returns them)."""
+    start, stamp = date(2020, 1, 1), datetime(2024, 1, 1, 9, 30)
+    full, projected = [], []
+    for i in range(1, count + 1):
+        joined = start + timedelta(days=i % 1500)
+        name, email, phone, plan = f"Member {i:06d}", f"member{i}@example.com", f"+9198{i:08d}", PLANS[i % 4]
+        status = 'active' if i % 7 else 'inactive'
+        full.append((i, name, email, '$2b$12$' + 'x' * 53, phone, plan, joined, status, stamp, stamp))
+        projected.append((i, name, email, status, phone, plan, joined))
+    return full, projected
+
+
+def legacy_path(rows) -> bytes:
+    """The previous GET /api/members: dict rows, Member objects, a dict per member, jsonify."""
+    dict_rows = [dict(zip(MEMBER_COLUMNS, row)) for row in rows]
+    members = [Member(**row) for row in dict_rows]
+    members_list = [
+        {
+            "member_id": m.member_ID,
+            "name": m.name,
+            "email": m.email,
+            "status": m.status,
+            "phone_number": m.phone_number,
+            "membership_plan": m.membership_plan,
+            "join_date": m.join_date.strftime('%Y-%m-%d') if m.join_date else None
+        }
+        for m in members
+    ]
+    return jsonify(members_list).get_data()
+
+
+def lean_path(rows) -> bytes:
+    """The current GET /api/members: tuple rows encoded with precomputed keys."""
+    return Member.LIST_COLUMNS.encode(rows)
+
+
+def lean_stdlib_path(rows) -> bytes:
+    """The lean path with the stdlib json fallback, as used when orjson is not installed."""
+    encoder = json.JSONEncoder(separators=(',', ':'), default=serialization._default, ensure_ascii=False)
+    keys = Member.LIST_COLUMNS.keys
+    return encoder.encode([dict(zip(keys, row)) for row in rows]).encode('utf-8')
+
+
+def measure(func, rows, repeat: int) -> dict:
+    """Best wall time over `repeat` runs, then peak traced memory of one more run."""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        body = func(rows)
+        timings.append(time.perf_counter() - started)
+    del body
+    gc.collect()
+    tracemalloc.start()
+    func(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"best_ms": round(min(timings) * 1000, 1), "peak_mib": round(peak / 2 ** 20, 1)}
+
+
+def instance_memory(rows) -> dict:
+    """MiB held by one model instance per row, with __slots__ and with a per-instance __dict__."""
+    DictMember = type('DictMember', (), {'__init__': Member.__init__})
+    dict_rows = [dict(zip(MEMBER_COLUMNS, row)) for row in rows]
+    result = {}
+    for label, cls in (('slots', Member), ('dict', DictMember)):
+        gc.collect()
+        tracemalloc.start()
+        instances = [cls(**row) for row in dict_rows]
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del instances
+        result[label] = round(current / 2 ** 20, 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare listing serialization paths on synthetic rows.")
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per path; the best is reported")
+    args = parser.parse_args()
+
+    full, projected = member_rows(args.rows)
+    app = Flask(__name__)
+    with app.app_context():
+        results = {
+            "legacy (dict cursor + objects + jsonify)": measure(legacy_path, full, args.repeat),
+            f"lean ({'orjson' if serialization.orjson else 'json'})": measure(lean_path, projected, args.repeat),
+        }
+        if serialization.orjson:
+            results["lean (stdlib json fallback)"] = measure(lean_stdlib_path, projected, args.repeat)
+        # Sanity check: both paths produce the same members
+        legacy = sorted(json.loads(legacy_path(full[:100])), key=lambda m: m['member_id'])
+        lean = json.loads(lean_path(projected[:100]))
+        assert legacy == lean, "legacy and lean output differ"
+
+    print(f"{args.rows} members, best of {args.repeat}")
+    print(f"{'path':<42} {'time ms':>9} {'peak MiB':>9}")
+    for name, result in results.items():
+        print(f"{name:<42} {result['best_ms']:>9.1f} {result['peak_mib']:>9.1f}")
+    memory = instance_memory(full)
+    print(f"Member instances: {memory['slots']} MiB with __slots__, {memory['dict']} MiB with __dict__")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Throughput scaling with the number of gunicorn workers.
+
+Starts the production server (gunicorn.conf.py, wsgi:app) once per worker
+count, load-tests the same endpoints against each with the clients from
+benchmarks.load_test, and reports requests per second and p99 latency,
+plus the speed-up relative to the smallest worker count. Seed the database
+with `python -m benchmarks.load_test seed` first. The clients run in this
+one interpreter, so for very cheap endpoints (ping) the client side can
+saturate before the server does; DB- and bcrypt-bound endpoints show the
+server's scaling.
+
+Run from the backend folder:
+    python -m benchmarks.worker_scaling --workers 1 2 4 8 --endpoints ping members_list login_member
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.load_test import BACKEND_DIR, RESULTS_DIR, admin_token, git_commit, needs_token, run_endpoint, scenarios
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers: int, threads: int, app: str, ready_timeout: float = 60.0):
+    """Starts gunicorn with `workers` workers and waits until it answers /api/ping. Returns (process, url)."""
+    port = _free_port()
+    env = dict(os.environ, WEB_WORKERS=str(workers), WEB_THREADS=str(threads), WEB_BIND=f"127.0.0.1:{port}")
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', app],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + ready_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"gunicorn exited with code {process.returncode} while starting {workers} workers")
+        try:
+            with urllib.request.urlopen(f"{url}/api/ping", timeout=1):
+                return process, url
+        except OSError:
+            time.sleep(0.2)
+    stop_server(process)
+    raise SystemExit(f"gunicorn with {workers} workers did not become ready in {ready_timeout}s")
+
+
+def stop_server(process, timeout: float = 40.0):
+    """Sends SIGTERM (graceful drain) and waits for gunicorn to exit."""
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API throughput at several gunicorn worker counts.")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--threads', type=int, default=4, help="Threads per worker")
+    parser.add_argument('--concurrency', type=int, default=32, help="Concurrent keep-alive clients")
+    parser.add_argument('--duration', type=float, default=10.0, help="Measured seconds per endpoint")
+    parser.add_argument('--warmup', type=float, default=2.0, help="Unmeasured seconds before each endpoint")
+    parser.add_argument('--members', type=int, default=2000, help="Number of seeded members to pick from")
+    parser.add_argument('--endpoints', nargs='+', default=['ping', 'members_list', 'login_member'])
+    parser.add_argument('--app', default='wsgi:app', help="WSGI app to serve")
+    parser.add_argument('--output', help="Where to save the JSON report (default: benchmarks/results/)")
+    args = parser.parse_args()
+
+    scenario_map = scenarios(args.members)
+    unknown = [name for name in args.endpoints if name not in scenario_map]
+    if unknown:
+        raise SystemExit(f"Unknown endpoints: {', '.join(unknown)}. Choose from: {', '.join(scenario_map)}")
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": datetime.now().isoformat(timespec='seconds'),
+            "cpu_count": os.cpu_count(),
+            "threads": args.threads,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+        },
+        "runs": {},
+    }
+
+    for workers in sorted(args.workers):
+        process, url = start_server(workers, args.threads, args.app)
+        try:
+            token = admin_token(url) if needs_token(scenario_map, args.endpoints) else ''
+            report["runs"][workers] = {
+                name: run_endpoint(url, token, scenario_map[name], args.concurrency, args.duration, args.warmup)
+                for name in args.endpoints
+            }
+        finally:
+            stop_server(process)
+        print(f"Measured {workers} worker(s).")
+
+    baseline = report["runs"][min(report["runs"])]
+    print(f"{'workers':>7} {'endpoint':<20} {'req/s':>9} {'p99 ms':>8} {'speed-up':>9}")
+    for workers, results in report["runs"].items():
+        for name, result in results.items():
+            base_rps = baseline[name]['throughput_rps']
+            speedup = result['throughput_rps'] / base_rps if base_rps else 0.0
+            print(f"{workers:>7} {name:<20} {result['throughput_rps']:>9.1f} {result['p99_ms']:>8.2f} {speedup:>8.2f}x")
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"workers-{datetime.now():%Y%m%d-%H%M%S}-{report['meta']['commit'] or 'nogit'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved results to {output}")
+
+
+if __name__ == '__main__':
+    main()
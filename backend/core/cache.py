@@ -0,0 +1,74 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable
+
+
+class ResultCache:
+    """
+    A small thread-safe, in-process cache for expensive query results.
+
+    Entries expire after `ttl` seconds, and `invalidate` drops them at once
+    and bumps `version`, so write paths can make the next read reload.
+    Loads for a missing key are serialized, so a burst of requests after an
+    invalidation runs the loader once rather than once per request.
+
+    The cache is per process: with several workers, a write in one worker
+    is seen by the others after at most `ttl` seconds.
+    """
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Hashable, tuple] = {}
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Returns the cached value for `key`, calling `loader` to fill it if missing or expired."""
+        value = self._get(key)
+        if value is not None:
+            return value
+
+        with self._load_lock:
+            # Another thread may have loaded it while we waited
+            value = self._get(key, count=False)
+            if value is not None:
+                return value
+            with self._lock:
+                version = self.version
+                self.misses += 1
+            value = loader()
+            with self._lock:
+                # Don't store a result that an invalidation made stale mid-load
+                if version == self.version and value is not None:
+                    self._entries[key] = (time.monotonic() + self.ttl, value)
+            return value
+
+    def invalidate(self, key: Hashable = None) -> None:
+        """Drops one key, or every entry if no key is given, and bumps the version."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            self.version += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the entry count, version and hit/miss counters."""
+        with self._lock:
+            return {"entries": len(self._entries), "version": self.version, "hits": self.hits, "misses": self.misses}
+
+    def _get(self, key: Hashable, count: bool = True) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            if count:
+                self.hits += 1
+            return value
@@ -0,0 +1,250 @@
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional
+
+from dotenv import load_dotenv
+from flask import Response, g, has_request_context, request
+
+# Load environment variables from a .env file
+load_dotenv()
+
+# Configure logging for the instrumentation module
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Instrumentation is opt-in; when disabled, connections are not wrapped and no hooks are installed
+INSTRUMENTATION_ENABLED = os.getenv('INSTRUMENTATION_ENABLED', '').lower() in ('1', 'true', 'yes')
+# A statement run this many times in one request is reported as a likely N+1 pattern
+N_PLUS_ONE_THRESHOLD = int(os.getenv('N_PLUS_ONE_THRESHOLD', '5'))
+
+# Upper bounds (seconds) of the request duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_WHITESPACE = re.compile(r'\s+')
+_PLACEHOLDER_LIST = re.compile(r'%s(\s*,\s*%s)+')
+
+def _normalize(statement) -> str:
+    """Collapses whitespace and placeholder lists so repeats of one statement compare equal."""
+    if isinstance(statement, (bytes, bytearray)):
+        statement = statement.decode('utf-8', 'replace')
+    return _PLACEHOLDER_LIST.sub('%s, ...', _WHITESPACE.sub(' ', str(statement)).strip())
+
+
+class RequestTiming:
+    """Time spent by one request in the handler, in SQL and waiting for a pooled connection."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_seconds = 0.0
+        self.acquire_seconds = 0.0
+        self.queries = 0
+        self.statements: Dict[str, int] = defaultdict(int)
+
+
+class Metrics:
+    """
+    Process-wide request and query counters, exported in the Prometheus text format.
+
+    Counters are per process: with several workers, each one reports its own
+    and the scraper sums them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Dict[tuple, int] = defaultdict(int)              # (method, endpoint, status)
+        self.duration_buckets: Dict[tuple, list] = {}                    # (method, endpoint) -> counts
+        self.duration_sum: Dict[tuple, float] = defaultdict(float)
+        self.duration_count: Dict[tuple, int] = defaultdict(int)
+        self.queries: Dict[str, int] = defaultdict(int)                  # endpoint -> statements
+        self.db_seconds: Dict[str, float] = defaultdict(float)
+        self.acquire_seconds: Dict[str, float] = defaultdict(float)
+        self.n_plus_one: Dict[str, int] = defaultdict(int)
+
+    def observe_request(self, method: str, endpoint: str, status: int, seconds: float, timing: RequestTiming):
+        key = (method, endpoint)
+        with self._lock:
+            self.requests[(method, endpoint, status)] += 1
+            buckets = self.duration_buckets.setdefault(key, [0] * len(DURATION_BUCKETS))
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    buckets[i] += 1
+            self.duration_sum[key] += seconds
+            self.duration_count[key] += 1
+            self.queries[endpoint] += timing.queries
+            self.db_seconds[endpoint] += timing.db_seconds
+            self.acquire_seconds[endpoint] += timing.acquire_seconds
+
+    def observe_background_query(self, seconds: float):
+        """Counts a statement run outside any request (scripts, background writers)."""
+        with self._lock:
+            self.queries['(background)'] += 1
+            self.db_seconds['(background)'] += seconds
+
+    def observe_n_plus_one(self, endpoint: str):
+        with self._lock:
+            self.n_plus_one[endpoint] += 1
+
+    def render(self, gauges: Optional[Dict[str, Any]] = None) -> str:
+        """Returns every metric in the Prometheus text exposition format."""
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            family('gymmonk_http_requests_total', 'counter', 'HTTP requests by method, endpoint and status.')
+            for (method, endpoint, status), value in sorted(self.requests.items()):
+                lines.append(f'gymmonk_http_requests_total{{method="{method}",endpoint="{endpoint}",status="{status}"}} {value}')
+
+            family('gymmonk_http_request_duration_seconds', 'histogram', 'Time from request start to response.')
+            for (method, endpoint), buckets in sorted(self.duration_buckets.items()):
+                labels = f'method="{method}",endpoint="{endpoint}"'
+                for bound, count in zip(DURATION_BUCKETS, buckets):
+                    lines.append(f'gymmonk_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                count = self.duration_count[(method, endpoint)]
+                lines.append(f'gymmonk_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+                lines.append(f'gymmonk_http_request_duration_seconds_sum{{{labels}}} {self.duration_sum[(method, endpoint)]:.6f}')
+                lines.append(f'gymmonk_http_request_duration_seconds_count{{{labels}}} {count}')
+
+            for name, values, help_text in (
+                ('gymmonk_db_queries_total', self.queries, 'SQL statements executed, by endpoint.'),
+                ('gymmonk_db_query_seconds_total', self.db_seconds, 'Time spent executing SQL, by endpoint.'),
+                ('gymmonk_db_acquire_seconds_total', self.acquire_seconds, 'Time spent waiting for a pooled connection, by endpoint.'),
+                ('gymmonk_db_n_plus_one_total', self.n_plus_one, 'Requests that repeated one statement at least N_PLUS_ONE_THRESHOLD times.'),
+            ):
+                family(name, 'counter', help_text)
+                for endpoint, value in sorted(values.items()):
+                    lines.append(f'{name}{{endpoint="{endpoint}"}} {value:.6f}' if isinstance(value, float)
+                                 else f'{name}{{endpoint="{endpoint}"}} {value}')
+
+        for key, value in (gauges or {}).items():
+            if isinstance(value, (int, float)):
+                family(f'gymmonk_db_pool_{key}', 'gauge', f'Connection pool {key.replace("_", " ")}.')
+                lines.append(f'gymmonk_db_pool_{key} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+# Shared registry used by the Flask hooks and the instrumented cursors
+metrics = Metrics()
+
+
+# --- Cursor and connection wrappers ---
+
+class _TimedCursor:
+    """Delegates to a real cursor, timing every execute/executemany call."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(operation, params, *args, **kwargs)
+        finally:
+            record_query(operation, time.perf_counter() - started)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(operation, seq_params, *args, **kwargs)
+        finally:
+            record_query(operation, time.perf_counter() - started)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._cursor.__exit__(exc_type, exc, tb)
+
+
+class _TimedConnection:
+    """Delegates to a real connection, handing out timed cursors."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self, *args, **kwargs):
+        return _TimedCursor(self._conn.cursor(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def instrument_connection(conn):
+    """Returns `conn` wrapped so its cursors are timed, or unchanged when instrumentation is off."""
+    return _TimedConnection(conn) if INSTRUMENTATION_ENABLED else conn
+
+def record_query(statement, seconds: float):
+    """Adds one SQL statement to the current request's timing (or the background counters)."""
+    timing = g.get('_timing') if has_request_context() else None
+    if timing is None:
+        metrics.observe_background_query(seconds)
+        return
+    timing.queries += 1
+    timing.db_seconds += seconds
+    timing.statements[_normalize(statement)] += 1
+
+def record_acquire(seconds: float):
+    """Adds time spent waiting for a pooled connection to the current request's timing."""
+    if not INSTRUMENTATION_ENABLED or not has_request_context():
+        return
+    timing = g.get('_timing')
+    if timing is not None:
+        timing.acquire_seconds += seconds
+
+
+# --- Flask integration ---
+
+def init_app(app, pool_stats: Optional[Callable[[], dict]] = None):
+    """
+    Installs the request hooks and the `/api/metrics` endpoint when
+    INSTRUMENTATION_ENABLED is set. Does nothing otherwise.
+
+    Args:
+        pool_stats: Optional callable whose numeric values are exported as pool gauges.
+    """
+    if not INSTRUMENTATION_ENABLED:
+        return
+
+    @app.before_request
+    def _start_timing():
+        g._timing = RequestTiming()
+
+    @app.after_request
+    def _finish_timing(response):
+        timing = g.pop('_timing', None)
+        if timing is None:
+            return response
+        elapsed = time.perf_counter() - timing.started
+        endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+        repeated = {statement: count for statement, count in timing.statements.items() if count >= N_PLUS_ONE_THRESHOLD}
+        for statement, count in repeated.items():
+            logging.warning(f"Possible N+1 in {request.method} {endpoint}: ran {count}x: {statement[:200]}")
+        if repeated:
+            metrics.observe_n_plus_one(endpoint)
+
+        metrics.observe_request(request.method, endpoint, response.status_code, elapsed, timing)
+        response.headers.add('Server-Timing', ', '.join([
+            f"handler;dur={elapsed * 1000:.2f}",
+            f"db;dur={timing.db_seconds * 1000:.2f};desc=\"{timing.queries} queries\"",
+            f"db-acquire;dur={timing.acquire_seconds * 1000:.2f}",
+        ]))
+        return response
+
+    @app.route('/api/metrics', methods=['GET'])
+    def prometheus_metrics():
+        body = metrics.render(pool_stats() if pool_stats else None)
+        return Response(body, mimetype='text/plain; version=0.0.4')
+
+    logging.info(f"Request instrumentation enabled (N+1 threshold {N_PLUS_ONE_THRESHOLD}).")
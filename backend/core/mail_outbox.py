@@ -0,0 +1,274 @@
+import atexit
+import logging
+import os
+import smtplib
+import threading
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+from flask_mail import Mail, Message
+from mysql.connector import Error
+
+from database.connection import db_connection
+
+# Load environment variables from a .env file
+load_dotenv()
+
+# Configure logging for the mail outbox module
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Messages claimed and sent per round trip to the outbox table
+MAIL_BATCH_SIZE = int(os.getenv('MAIL_BATCH_SIZE', '50'))
+# Seconds between outbox polls when nothing wakes the sender (retries, rows queued by other workers)
+MAIL_POLL_INTERVAL = float(os.getenv('MAIL_POLL_INTERVAL', '5'))
+# Delivery attempts before a message is marked failed
+MAIL_MAX_ATTEMPTS = int(os.getenv('MAIL_MAX_ATTEMPTS', '5'))
+# Retry delay after the first failure, doubled after each further one, capped at MAIL_RETRY_MAX
+MAIL_RETRY_BASE = int(os.getenv('MAIL_RETRY_BASE', '30'))
+MAIL_RETRY_MAX = int(os.getenv('MAIL_RETRY_MAX', '3600'))
+# Seconds a claimed message stays invisible to other senders; a crashed sender's claims expire after this
+MAIL_CLAIM_SECONDS = 300
+
+def enqueue_mail(cursor, recipient: str, subject: str, body: str) -> None:
+    """
+    Adds a message to `mail_outbox` using the caller's cursor.
+
+    The row is committed (or rolled back) with the caller's transaction, so
+    a message is only ever sent for data that was actually saved.
+    """
+    cursor.execute(
+        "INSERT INTO mail_outbox (recipient, subject, body) VALUES (%s, %s, %s)",
+        (recipient, subject, body)
+    )
+
+
+class OutboxSender:
+    """
+    Delivers `mail_outbox` rows from a background thread.
+
+    Request handlers only insert outbox rows (see `enqueue_mail`) and call
+    `wake()`, so they never wait on the mail server. The sender claims due
+    messages in batches with `FOR UPDATE SKIP LOCKED`, which lets every
+    worker process run a sender without sending a message twice, and sends
+    them all over one SMTP connection that stays open until the outbox is
+    drained. Failed messages are retried with exponential backoff up to
+    MAIL_MAX_ATTEMPTS times.
+    """
+
+    def __init__(self, batch_size: int = MAIL_BATCH_SIZE, poll_interval: float = MAIL_POLL_INTERVAL):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+
+        self._app = None
+        self._mail: Optional[Mail] = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._atexit_registered = False
+
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+        self.connections = 0
+
+    def init_app(self, app) -> None:
+        """Configures Flask-Mail from the MAIL_* environment variables and starts the sender on first request."""
+        app.config.setdefault('MAIL_SERVER', os.getenv('MAIL_SERVER', 'localhost'))
+        app.config.setdefault('MAIL_PORT', int(os.getenv('MAIL_PORT', '25')))
+        app.config.setdefault('MAIL_USE_TLS', os.getenv('MAIL_USE_TLS', '').lower() in ('1', 'true', 'yes'))
+        app.config.setdefault('MAIL_USE_SSL', os.getenv('MAIL_USE_SSL', '').lower() in ('1', 'true', 'yes'))
+        app.config.setdefault('MAIL_USERNAME', os.getenv('MAIL_USERNAME'))
+        app.config.setdefault('MAIL_PASSWORD', os.getenv('MAIL_PASSWORD'))
+        app.config.setdefault('MAIL_DEFAULT_SENDER', os.getenv('MAIL_DEFAULT_SENDER', 'no-reply@gymmonk.local'))
+        self._app = app
+        self._mail = Mail(app)
+        # The master process of a preloaded server never handles requests, so only workers start a sender
+        app.before_request(self._ensure_started)
+
+    def wake(self) -> None:
+        """Asks the sender to look at the outbox now instead of at the next poll."""
+        self._ensure_started()
+        self._wake.set()
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Finishes the batch in progress and stops the sender thread."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None or not thread.is_alive():
+            return
+        self._stop.set()
+        self._wake.set()
+        thread.join(timeout)
+        if thread.is_alive():
+            logging.error("mail-outbox: timed out waiting for the sender to finish its batch.")
+
+    def reset_after_fork(self) -> None:
+        """Forgets the parent's thread handle in a freshly forked worker."""
+        with self._lock:
+            self._thread = None
+            self._pid = None
+            self._wake = threading.Event()
+            self._stop = threading.Event()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns delivery counters for this process."""
+        with self._lock:
+            return {
+                "running": self._thread is not None and self._thread.is_alive(),
+                "sent": self.sent,
+                "retried": self.retried,
+                "failed": self.failed,
+                "smtp_connections": self.connections,
+            }
+
+    def drain(self) -> int:
+        """
+        Sends every message that is currently due, reusing one SMTP connection.
+
+        Returns:
+            int: The number of messages claimed (sent, rescheduled or failed).
+        """
+        batch = self._claim()
+        handled = len(batch)
+        if not batch:
+            return handled
+        with self._app.app_context():
+            try:
+                with self._mail.connect() as smtp:
+                    with self._lock:
+                        self.connections += 1
+                    while batch:
+                        self._send_batch(smtp, batch)
+                        batch = [] if self._stop.is_set() else self._claim()
+                        handled += len(batch)
+            except (smtplib.SMTPException, OSError) as e:
+                # Could not connect, or the server dropped the connection; whatever is left of the batch is retried
+                logging.warning(f"mail-outbox: SMTP connection failed: {e}")
+                self._reschedule(batch, str(e))
+        return handled
+
+    # --- Private Helper Methods ---
+
+    def _ensure_started(self) -> None:
+        """Starts the sender thread on first use (and again in a forked child)."""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        if self._app is None:
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='mail-outbox', daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.stop)
+                self._atexit_registered = True
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.drain()
+            except Exception as e:
+                logging.error(f"mail-outbox: unexpected error while draining: {e}")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def _claim(self) -> list:
+        """Locks the next batch of due messages and hides them from other senders for MAIL_CLAIM_SECONDS."""
+        try:
+            with db_connection() as conn, conn.cursor() as cursor:
+                # autocommit is off, so the locking read opens the claim transaction
+                cursor.execute('''
+                    SELECT id, recipient, subject, body, attempts FROM mail_outbox
+                    WHERE status = 'pending' AND next_attempt_at <= NOW()
+                    ORDER BY next_attempt_at, id
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                ''', (self.batch_size,))
+                rows = cursor.fetchall()
+                if rows:
+                    placeholders = ', '.join(['%s'] * len(rows))
+                    cursor.execute(
+                        f"UPDATE mail_outbox SET attempts = attempts + 1, "
+                        f"next_attempt_at = NOW() + INTERVAL %s SECOND WHERE id IN ({placeholders})",
+                        (MAIL_CLAIM_SECONDS, *[row[0] for row in rows])
+                    )
+                conn.commit()
+                return [(id_, recipient, subject, body, attempts + 1) for id_, recipient, subject, body, attempts in rows]
+        except Error as e:
+            logging.error(f"mail-outbox: could not claim messages: {e}")
+        return []
+
+    def _send_batch(self, smtp, batch: list) -> None:
+        """Sends one claimed batch. Raises if the connection itself breaks, leaving unsent messages to the caller."""
+        sent, failed = [], []
+        try:
+            while batch:
+                id_, recipient, subject, body, attempts = batch[0]
+                try:
+                    smtp.send(Message(subject=subject, recipients=[recipient], body=body))
+                    sent.append(id_)
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError, smtplib.SMTPSenderRefused) as e:
+                    # Refused by the server for this message only; the connection is still usable
+                    failed.append((batch[0], str(e)))
+                batch.pop(0)
+        finally:
+            self._mark_sent(sent)
+            for message, error in failed:
+                self._reschedule([message], error)
+
+    def _mark_sent(self, ids: list) -> None:
+        if not ids:
+            return
+        placeholders = ', '.join(['%s'] * len(ids))
+        try:
+            with db_connection() as conn, conn.cursor() as cursor:
+                cursor.execute(
+                    # The body may carry a secret such as a reset link; nobody needs it once it is delivered
+                    f"UPDATE mail_outbox SET status = 'sent', sent_at = NOW(), last_error = NULL, body = '' "
+                    f"WHERE id IN ({placeholders})",
+                    tuple(ids)
+                )
+                conn.commit()
+        except Error as e:
+            # The claim expires and the messages are sent again; duplicates beat losing a reset link
+            logging.error(f"mail-outbox: sent {len(ids)} messages but could not record it: {e}")
+        with self._lock:
+            self.sent += len(ids)
+
+    def _reschedule(self, messages: list, error: str) -> None:
+        """Schedules failed messages for a retry with exponential backoff, or marks them failed."""
+        retry, give_up = [], []
+        for id_, _, _, _, attempts in messages:
+            if attempts >= MAIL_MAX_ATTEMPTS:
+                give_up.append((error[:500], id_))
+            else:
+                delay = min(MAIL_RETRY_BASE * 2 ** (attempts - 1), MAIL_RETRY_MAX)
+                retry.append((delay, error[:500], id_))
+        try:
+            with db_connection() as conn, conn.cursor() as cursor:
+                if retry:
+                    cursor.executemany(
+                        "UPDATE mail_outbox SET next_attempt_at = NOW() + INTERVAL %s SECOND, last_error = %s WHERE id = %s",
+                        retry
+                    )
+                if give_up:
+                    cursor.executemany(
+                        "UPDATE mail_outbox SET status = 'failed', last_error = %s, body = '' WHERE id = %s", give_up
+                    )
+                conn.commit()
+        except Error as e:
+            logging.error(f"mail-outbox: could not reschedule {len(messages)} messages: {e}")
+        with self._lock:
+            self.retried += len(retry)
+            self.failed += len(give_up)
+        if give_up:
+            logging.error(f"mail-outbox: gave up on {len(give_up)} messages after {MAIL_MAX_ATTEMPTS} attempts: {error}")
+
+
+# Shared sender; main.create_app binds it to the app
+outbox_sender = OutboxSender()
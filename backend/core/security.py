@@ -1,19 +1,83 @@
 import bcrypt
 import logging
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 # Configure logging for the security module
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def hash_password(password: str) -> str:
+# --- bcrypt Work Settings ---
+# Work factor for new hashes. Each +1 doubles the cost of hashing and verifying.
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '12'))
+# Processes dedicated to bcrypt. 0 runs bcrypt in the calling thread instead.
+BCRYPT_WORKERS = int(os.getenv('BCRYPT_WORKERS', str(os.cpu_count() or 1)))
+# Hash/verify jobs allowed in flight at once; callers beyond that wait for a slot.
+BCRYPT_MAX_PENDING = int(os.getenv('BCRYPT_MAX_PENDING', str(max(BCRYPT_WORKERS, 1) * 4)))
+# Seconds a caller waits for a free slot before the request is rejected as busy.
+BCRYPT_QUEUE_TIMEOUT = float(os.getenv('BCRYPT_QUEUE_TIMEOUT', '5'))
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(BCRYPT_MAX_PENDING)
+
+
+class HashingBusyError(RuntimeError):
+    """Raised when every bcrypt slot stays busy for longer than BCRYPT_QUEUE_TIMEOUT."""
+
+
+def _hashpw(password_bytes: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds))
+
+def _checkpw(password_bytes: bytes, hashed_bytes: bytes) -> bool:
+    return bcrypt.checkpw(password_bytes, hashed_bytes)
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Returns this process's bcrypt worker pool, creating it on first use (and again after a fork)."""
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        with _executor_lock:
+            if _executor is None or _executor_pid != os.getpid():
+                # spawn, not fork: the web process is multi-threaded by the time this runs
+                _executor = ProcessPoolExecutor(
+                    max_workers=BCRYPT_WORKERS,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                _executor_pid = os.getpid()
+    return _executor
+
+def _run_bcrypt(fn, *args):
+    """
+    Runs a bcrypt call in the worker pool and blocks the calling thread until it finishes.
+
+    The wait releases the GIL, so the web worker keeps serving other requests
+    while a login is being verified. At most BCRYPT_MAX_PENDING calls are
+    in flight; further callers wait for a slot.
+    """
+    if BCRYPT_WORKERS <= 0:
+        return fn(*args)
+    if not _slots.acquire(timeout=BCRYPT_QUEUE_TIMEOUT):
+        raise HashingBusyError("Password hashing is saturated, try again shortly")
+    try:
+        return _get_executor().submit(fn, *args).result()
+    finally:
+        _slots.release()
+
+def hash_password(password: str, rounds: int = None) -> str:
     """
     Generates a bcrypt hash of a plain-text password.
 
     This function takes a plain-text password, generates a salt,
     and then hashes the password with the salt. The resulting hash
     is decoded to a UTF-8 string so it can be easily stored in the database.
+    The work is done in the bcrypt worker pool, not the calling thread.
 
     Args:
         password (str): The user's plain-text password.
+        rounds (int): bcrypt work factor. Defaults to BCRYPT_ROUNDS.
 
     Returns:
         str: The hashed password as a string, ready for database storage.
@@ -21,16 +85,61 @@ def hash_password(password: str) -> str:
     try:
         # Encode the password string to bytes, which is required by bcrypt
         password_bytes = password.encode('utf-8')
-        # Generate a salt to protect against rainbow table attacks
-        salt = bcrypt.gensalt()
-        # Hash the password with the generated salt
-        hashed_pw_bytes = bcrypt.hashpw(password_bytes, salt)
+        # Hash the password with a fresh salt at the configured cost
+        hashed_pw_bytes = _run_bcrypt(_hashpw, password_bytes, rounds or BCRYPT_ROUNDS)
         # Decode the resulting bytes back to a string for storage
         return hashed_pw_bytes.decode('utf-8')
     except Exception as e:
         logging.error(f"Error occurred during password hashing: {e}")
         raise
 
+def hash_passwords(passwords: list) -> list:
+    """
+    Hashes several passwords in parallel across the bcrypt worker pool.
+
+    Every job holds one of the shared BCRYPT_MAX_PENDING slots, exactly like a
+    single hash or a login, and one call keeps at most BCRYPT_WORKERS jobs in
+    flight. A large batch therefore takes turns with logins instead of
+    queueing thousands of jobs ahead of them.
+
+    Args:
+        passwords (list): Plain-text passwords.
+
+    Returns:
+        list: The hashes, in the same order as the input.
+
+    Raises:
+        HashingBusyError: If no bcrypt slot freed up in time.
+    """
+    if BCRYPT_WORKERS <= 0:
+        return [hash_password(p) for p in passwords]
+    executor = _get_executor()
+    hashes = [None] * len(passwords)
+    in_flight = deque()
+    try:
+        for index, password in enumerate(passwords):
+            if len(in_flight) >= BCRYPT_WORKERS:
+                done_index, future = in_flight.popleft()
+                hashes[done_index] = future.result().decode('utf-8')
+            if not _slots.acquire(timeout=BCRYPT_QUEUE_TIMEOUT):
+                raise HashingBusyError("Password hashing is saturated, try again shortly")
+            try:
+                future = executor.submit(_hashpw, password.encode('utf-8'), BCRYPT_ROUNDS)
+            except BaseException:
+                _slots.release()
+                raise
+            # The slot is handed back when the job finishes (or is cancelled), whoever is waiting on it
+            future.add_done_callback(lambda _: _slots.release())
+            in_flight.append((index, future))
+        while in_flight:
+            done_index, future = in_flight.popleft()
+            hashes[done_index] = future.result().decode('utf-8')
+    finally:
+        # On an error, drop the jobs that have not started yet; their slots are released by the callback
+        for _, future in in_flight:
+            future.cancel()
+    return hashes
+
 def verify_password(plain_password: str, hashed_password_str: str) -> bool:
     """
     Verifies a plain-text password against a stored bcrypt hash.
@@ -44,16 +153,31 @@ def verify_password(plain_password: str, hashed_password_str: str) -> bool:
 
     Returns:
         bool: True if the password matches the hash, False otherwise.
+
+    Raises:
+        HashingBusyError: If no bcrypt slot freed up in time.
     """
     try:
         # Encode both the plain password and the stored hash to bytes
         plain_password_bytes = plain_password.encode('utf-8')
         hashed_password_bytes = hashed_password_str.encode('utf-8')
         # Use bcrypt's checkpw function to securely compare them
-        return bcrypt.checkpw(plain_password_bytes, hashed_password_bytes)
+        return _run_bcrypt(_checkpw, plain_password_bytes, hashed_password_bytes)
+    except HashingBusyError:
+        # Being busy is not a failed login; let the route answer 503
+        raise
     except Exception as e:
         logging.error(f"Error occurred during password verification: {e}")
         # Return False in case of an error to prevent potential security bypasses
         return False
 
+def needs_rehash(hashed_password_str: str) -> bool:
+    """
+    Checks whether a stored hash was made with a different work factor than BCRYPT_ROUNDS.
 
+    bcrypt hashes look like `$2b$12$<salt+hash>`, where the third field is the cost.
+    """
+    try:
+        return int(hashed_password_str.split('$')[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
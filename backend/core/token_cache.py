@@ -0,0 +1,82 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class TokenCache:
+    """
+    A bounded LRU cache of verified JWT claims.
+
+    Entries are keyed on a SHA-256 digest of the signing secret and the token,
+    so rotating the secret makes every previously cached token miss and go
+    through full verification again. Each entry is kept only until the
+    token's own `exp` claim (capped at `max_ttl` seconds).
+    """
+
+    def __init__(self, max_size: int = 1024, max_ttl: float = 300.0):
+        """
+        Args:
+            max_size (int): Maximum number of tokens kept in the cache.
+            max_ttl (float): Upper bound in seconds on how long any entry is trusted.
+        """
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(secret: str, token: str) -> bytes:
+        return hashlib.sha256(f"{secret}\0{token}".encode('utf-8')).digest()
+
+    def get(self, secret: str, token: str) -> Optional[Dict[str, Any]]:
+        """Returns a copy of the cached claims for the token, or None if it is not cached or expired."""
+        key = self._key(secret, token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, claims = entry
+            if now >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return dict(claims)
+
+    def put(self, secret: str, token: str, claims: Dict[str, Any]) -> None:
+        """Caches verified claims until the token's expiry, evicting the least recently used entry if full."""
+        now = time.time()
+        expires_at = now + self.max_ttl
+        if 'exp' in claims:
+            expires_at = min(expires_at, float(claims['exp']))
+        if expires_at <= now:
+            return
+
+        key = self._key(secret, token)
+        with self._lock:
+            self._entries[key] = (expires_at, dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drops every cached token, e.g. after revoking credentials."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the cache size and hit/miss counters."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,28 @@
+import os
+from datetime import datetime
+
+from database.batch_writer import BatchWriter
+
+# Login attempts are written in the background so logins never wait on the audit INSERT
+login_audit = BatchWriter(
+    'login-audit',
+    batch_size=int(os.getenv('AUDIT_BATCH_SIZE', '200')),
+    flush_interval=float(os.getenv('AUDIT_FLUSH_INTERVAL', '1')),
+    max_queue=int(os.getenv('AUDIT_MAX_QUEUE', '10000'))
+)
+
+# One statement per login table; the table and column names are fixed, never user input
+_STATEMENTS = {
+    'ALD': "INSERT INTO ALD (ad_id, login_time, login_status) VALUES (%s, %s, %s)",
+    'ELD': "INSERT INTO ELD (emp_id, login_time, login_status) VALUES (%s, %s, %s)",
+    'MLD': "INSERT INTO MLD (mem_id, login_time, login_status) VALUES (%s, %s, %s)",
+}
+
+def record_login(table: str, user_id: int, status: str) -> None:
+    """
+    Queues a login attempt for the ALD, ELD or MLD table.
+
+    The attempt time is captured now rather than when the batch is written,
+    so `login_time` stays accurate however long the row waits in the queue.
+    """
+    login_audit.submit(_STATEMENTS[table], (user_id, datetime.now(), status))
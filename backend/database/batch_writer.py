@@ -0,0 +1,189 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict
+
+from mysql.connector import Error
+from database.connection import db_connection
+
+# Configure logging for the batch writer module
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+_STOP = object()
+
+
+class BatchWriter:
+    """
+    Queues INSERT rows in memory and writes them from a background thread.
+
+    Rows are grouped by statement and written with `executemany` (which the
+    MySQL driver turns into multi-row INSERTs) whenever `batch_size` rows are
+    waiting or `flush_interval` seconds have passed. The queue is bounded:
+    when it is full, `submit` blocks until the writer thread makes room, so a
+    slow database slows producers down instead of losing rows. Callers that
+    can ask their client to resend pass `block=False` and get False back
+    once the queue has stayed full for `put_timeout` seconds. Everything
+    still queued is written when the process exits.
+    """
+
+    def __init__(self, name: str, batch_size: int = 200, flush_interval: float = 1.0,
+                 max_queue: int = 10000, put_timeout: float = 0.05, max_retries: int = 3):
+        self.name = name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.put_timeout = put_timeout
+        self.max_retries = max_retries
+
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._pid = None
+        self._atexit_registered = False
+
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.rows_rejected = 0
+        self.blocked_submits = 0
+        self.batches = 0
+
+    def submit(self, statement: str, row: tuple, block: bool = True) -> bool:
+        """
+        Queues one row for `statement`.
+
+        When the queue is full this waits for room; with `block=False` it
+        gives up after `put_timeout` seconds and returns False instead, and
+        the row is not queued.
+        """
+        self._ensure_started()
+        item = (statement, row)
+        try:
+            self._queue.put(item, timeout=self.put_timeout)
+            return True
+        except queue.Full:
+            if not block:
+                with self._lock:
+                    self.rows_rejected += 1
+                return False
+        with self._lock:
+            self.blocked_submits += 1
+        while True:
+            with self._lock:
+                thread = self._thread
+            if thread is None or not thread.is_alive():
+                # Stopped (process exit) with the queue still full; nothing will make room, so write it here
+                self._write({statement: [row]})
+                return True
+            try:
+                self._queue.put(item, timeout=1.0)
+                return True
+            except queue.Full:
+                continue
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Writes every queued row and stops the background thread."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            logging.error(f"{self.name}: timed out draining {self._queue.qsize()} queued rows on shutdown.")
+
+    def reset_after_fork(self) -> None:
+        """Discards the parent's queue and thread handle in a freshly forked worker."""
+        with self._lock:
+            self._queue = queue.Queue(maxsize=self.max_queue)
+            self._thread = None
+            self._pid = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns queue depth and write counters."""
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "max_queue": self.max_queue,
+                "rows_written": self.rows_written,
+                "rows_failed": self.rows_failed,
+                "rows_rejected": self.rows_rejected,
+                "blocked_submits": self.blocked_submits,
+                "batches": self.batches,
+            }
+
+    # --- Private Helper Methods ---
+
+    def _ensure_started(self) -> None:
+        """Starts the writer thread on first use (and again in a forked child)."""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid is not None and self._pid != os.getpid():
+                # Threads do not survive fork; rows queued in the parent belong to the parent
+                self._queue = queue.Queue(maxsize=self.max_queue)
+                self._thread = None
+            if self._thread is None:
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+                if not self._atexit_registered:
+                    atexit.register(self.stop)
+                    self._atexit_registered = True
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = defaultdict(list)
+            count = 0
+            deadline = time.monotonic() + self.flush_interval
+            while count < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                statement, row = item
+                batch[statement].append(row)
+                count += 1
+
+            if stopping:
+                # Drain whatever is left so no queued rows are lost on shutdown
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not _STOP:
+                        batch[item[0]].append(item[1])
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: Dict[str, list]) -> None:
+        """Writes grouped rows in one transaction, retrying with backoff on database errors."""
+        total = sum(len(rows) for rows in batch.values())
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                with db_connection() as conn, conn.cursor() as cursor:
+                    for statement, rows in batch.items():
+                        cursor.executemany(statement, rows)
+                    conn.commit()
+                with self._lock:
+                    self.rows_written += total
+                    self.batches += 1
+                return
+            except Error as e:
+                logging.warning(f"{self.name}: write of {total} rows failed (attempt {attempt}): {e}")
+                time.sleep(min(0.1 * 2 ** attempt, 2.0))
+        with self._lock:
+            self.rows_failed += total
+        logging.error(f"{self.name}: dropped {total} rows after {self.max_retries} failed attempts.")
@@ -1,8 +1,16 @@
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, errorcode
 import os
+import threading
+from contextlib import contextmanager
 from dotenv import load_dotenv
+from flask import g, has_app_context
 import logging
+import time
+
+from core.instrumentation import instrument_connection, record_acquire
+from database.pool import ConnectionPool
+from database.migrations import apply_migrations, LATEST_VERSION
 
 # Load environment variables from a .env file
 load_dotenv()
@@ -10,6 +18,11 @@ load_dotenv()
 # Configure logging to display info level messages
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Server to connect to; override to point the app (or the load test) at another instance
+MYSQL_HOST = os.getenv('MYSQL_HOST', 'localhost')
+MYSQL_PORT = int(os.getenv('MYSQL_PORT', '3306'))
+MYSQL_USER = os.getenv('MYSQL_USER', 'root')
+
 def get_db_connection():
     """
     Establishes a connection to the MySQL database.
@@ -17,201 +30,357 @@ def get_db_connection():
     """
     try:
         connection = mysql.connector.connect(
-            host='localhost',
-            user='root',
+            host=MYSQL_HOST,
+            port=MYSQL_PORT,
+            user=MYSQL_USER,
             password=os.getenv('MYSQL_PASSWORD'),
             database='GymDB',
-            charset='utf8mb4'
+            charset='utf8mb4',
+            # Buffer results so several cursors can share one request-scoped connection
+            buffered=True
         )
         if connection.is_connected():
-            logging.info("Successfully connected to the GymDB database.")
+            logging.debug("Opened a new connection to the GymDB database.")
             return connection
     except Error as e:
         logging.error(f"Error while connecting to MySQL: {e}")
         # Re-raise the exception to be handled by the caller
         raise
 
+# --- Connection Pool ---
+# Pool sizing can be tuned per deployment through the environment.
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '10'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '5'))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> ConnectionPool:
+    """Returns the process-wide connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(get_db_connection, size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT)
+                logging.info(f"Created database connection pool (size={DB_POOL_SIZE}, timeout={DB_POOL_TIMEOUT}s).")
+    return _pool
+
+@contextmanager
+def db_connection():
+    """
+    Provides a pooled database connection.
+
+    Inside a Flask request the same connection is shared by every model call
+    and handed back to the pool by `release_request_connection` when the app
+    context tears down. Outside a request (scripts, background jobs) the
+    connection is returned to the pool as soon as the block exits.
+    """
+    if has_app_context():
+        conn = g.get('_db_conn')
+        if conn is None:
+            started = time.perf_counter()
+            conn = get_pool().acquire()
+            record_acquire(time.perf_counter() - started)
+            g._db_conn = conn
+        yield instrument_connection(conn)
+        return
+
+    pool = get_pool()
+    conn = pool.acquire()
+    try:
+        yield instrument_connection(conn)
+    finally:
+        pool.release(conn)
+
+@contextmanager
+def dedicated_connection():
+    """
+    Provides a pooled connection that is never shared with the current request.
+
+    For response generators, which keep running after the request context
+    has been torn down. If the block does not finish normally (an error, or
+    the client disconnecting mid-stream) the connection may still hold
+    unread rows, so it is closed rather than returned to the pool.
+    """
+    pool = get_pool()
+    conn = pool.acquire()
+    try:
+        yield instrument_connection(conn)
+    except BaseException:
+        pool.release(conn, discard=True)
+        raise
+    pool.release(conn)
+
+def release_request_connection(exception=None):
+    """Flask `teardown_appcontext` hook that returns the request's connection to the pool."""
+    conn = g.pop('_db_conn', None)
+    if conn is not None:
+        get_pool().release(conn)
+
+def reset_pool_after_fork():
+    """
+    Forgets the pool inherited from the parent in a freshly forked worker.
+
+    The parent's sockets are dropped without closing them (a close would
+    end the parent's sessions too); the worker opens its own on first use.
+    """
+    global _pool
+    with _pool_lock:
+        _pool = None
+
+def close_pool():
+    """Closes every idle pooled connection; called when a worker shuts down."""
+    if _pool is not None:
+        _pool.close_all()
+
+def pool_stats() -> dict:
+    """Returns the connection pool gauges (in-use count, wait times, ...) for export."""
+    return get_pool().stats()
+
+# Name of the MySQL advisory lock that serializes schema changes across workers
+SCHEMA_LOCK_NAME = 'gymdb_schema_setup'
+SCHEMA_LOCK_TIMEOUT = int(os.getenv('SCHEMA_LOCK_TIMEOUT', '60'))
+
+def _create_tables(cursor):
+    """Creates the base GymMonk tables. Every statement is safe to re-run."""
+    # Admin table to store administrator credentials
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ADMIN(
+            ad_ID INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(50) NOT NULL,
+            username VARCHAR(50) UNIQUE NOT NULL,
+            password VARCHAR(255) NOT NULL
+        );
+    ''')
+
+    # Admin Login Details (ALD) table to log admin sign-ins
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ALD(
+            login_id INT AUTO_INCREMENT PRIMARY KEY,
+            ad_id INT,
+            login_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            user_status ENUM('active','deactivated') DEFAULT 'active',
+            login_status VARCHAR(50) NOT NULL DEFAULT 'Login Successful',
+            FOREIGN KEY (ad_id) REFERENCES ADMIN(ad_ID) ON DELETE CASCADE
+        );
+    ''')
+
+    # Employee table for staff like trainers and IT personnel
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS Employee(
+            user_id INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            email VARCHAR(100) UNIQUE NOT NULL,
+            password VARCHAR(255) NOT NULL,
+            salary INT,
+            role ENUM('IT', 'Trainer') NOT NULL,
+            join_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    ''')
+
+    # Employee Login Details (ELD) table to log employee sign-ins
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ELD(
+            login_id INT AUTO_INCREMENT PRIMARY KEY,
+            emp_id INT,
+            login_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            user_status ENUM('active','deactivated') DEFAULT 'active',
+            login_status VARCHAR(50) NOT NULL DEFAULT 'Login Successful',
+            FOREIGN KEY (emp_id) REFERENCES Employee(user_id) ON DELETE CASCADE
+        );
+    ''')
+
+    # Members table for gym clients
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS Members(
+            member_ID INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            email VARCHAR(100) UNIQUE NOT NULL,
+            password VARCHAR(255) NOT NULL,
+            phone_number VARCHAR(20),
+            membership_plan VARCHAR(50),
+            join_date DATE NOT NULL,
+            status ENUM('active', 'inactive', 'frozen') DEFAULT 'active',
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        );
+    ''')
+
+    # Member Login Details (MLD) table to log member sign-ins
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS MLD(
+            login_id INT AUTO_INCREMENT PRIMARY KEY,
+            mem_id INT,
+            login_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            user_status ENUM('active','deactivated') DEFAULT 'active',
+            login_status VARCHAR(50) NOT NULL DEFAULT 'Login Successful',
+            FOREIGN KEY (mem_id) REFERENCES Members(member_ID) ON DELETE CASCADE
+        );
+    ''')
+
+    # Equipment table to track gym assets
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS Equipment(
+            e_code INT AUTO_INCREMENT PRIMARY KEY,
+            e_name VARCHAR(50),
+            e_qty INT,
+            e_unit_price INT,
+            e_category VARCHAR(50)
+        );
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS attendance (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            mem_id INT NOT NULL,
+            check_in DATETIME NOT NULL,
+            check_out DATETIME,                 
+            FOREIGN KEY (mem_id) REFERENCES Members(member_ID)
+        );
+    ''')
+    # check_out -- NULL until they leave
+
+    # Hourly visit counts rolled up from attendance for the dashboard heatmap
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS attendance_hourly (
+            visit_date DATE NOT NULL,
+            visit_hour TINYINT NOT NULL,
+            visits INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (visit_date, visit_hour)
+        );
+    ''')
+
+    # Members currently inside the gym, maintained by the occupancy tracker
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS occupancy_inside (
+            member_id INT PRIMARY KEY,
+            checked_in_at DATETIME NOT NULL
+        );
+    ''')
+
+    # Resume points for bulk swipe imports (see import_attendance.py)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS import_checkpoints (
+            source VARCHAR(255) PRIMARY KEY,
+            byte_offset BIGINT NOT NULL DEFAULT 0,
+            open_swipes LONGTEXT,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        );
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS progress_logs (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            mem_id INT NOT NULL,
+            log_date DATE NOT NULL,
+            weight_kg DECIMAL(5,2),
+            body_fat_pct DECIMAL(4,2),
+            notes TEXT,
+            logged_by INT,                       
+            FOREIGN KEY (mem_id) REFERENCES Members(member_ID)
+        );
+    ''')
+    # logged_by -- employee/trainer user_id
+
+    #Payment/Revenue Logs
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS payments (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            mem_id INT NOT NULL,
+            amount DECIMAL(10,2) NOT NULL,
+            payment_date DATE NOT NULL,
+            payment_method VARCHAR(50),
+            plan_type VARCHAR(50),           
+            status ENUM('paid','pending','failed') DEFAULT 'paid',
+            FOREIGN KEY (mem_id) REFERENCES Members(member_ID)
+        );
+    ''')
+    # plan_type -- Monthly, Quarterly, Yearly
+
+
+    # Member Reviews
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS reviews (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            member_id INT NOT NULL,
+            rating TINYINT CHECK (rating BETWEEN 1 AND 5),
+            review_text TEXT,
+            category VARCHAR(50),              
+            submitted_at DATETIME DEFAULT NOW(),
+            FOREIGN KEY (member_id) REFERENCES Members(member_ID)
+        );
+    ''')
+    # category -- Equipment, Trainer, Cleanliness etc.
+
+    #Equipment Usage
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS equipment_usage (
+            id              INT AUTO_INCREMENT PRIMARY KEY,
+            equipment_id    INT NOT NULL,
+            used_by         INT,                  
+            used_at         DATETIME DEFAULT NOW(),
+            duration_mins   INT,
+            FOREIGN KEY (equipment_id) REFERENCES Equipment(e_code)
+        );
+    ''')
+    # used_by -- member_id, nullable
+
+def _schema_version_of(cursor) -> int:
+    """Reads the recorded schema version, or 0 if the database or version table is missing."""
+    try:
+        cursor.execute("SELECT COALESCE(MAX(version), 0) FROM GymDB.schema_migrations")
+        return int(cursor.fetchall()[0][0])
+    except Error as e:
+        if e.errno in (errorcode.ER_BAD_DB_ERROR, errorcode.ER_NO_SUCH_TABLE):
+            return 0
+        raise
+
 def setup_database():
     """
-    Sets up the database and creates all necessary tables if they don't exist.
-    This function is idempotent and can be run multiple times safely.
+    Brings the database schema up to date.
+
+    When the stored schema version already matches the latest migration this
+    costs one connection and one query. Otherwise the base tables and any
+    pending migrations are applied while holding a MySQL advisory lock, so
+    several workers booting at once never run the DDL concurrently.
     """
     try:
-        # Connect to MySQL server without specifying a database to create it
+        # Connect to MySQL server without specifying a database so it can be created
         with mysql.connector.connect(
-            host='localhost',
-            user='root',
+            host=MYSQL_HOST,
+            port=MYSQL_PORT,
+            user=MYSQL_USER,
             password=os.getenv('MYSQL_PASSWORD'),
             charset='utf8mb4'
         ) as conn:
             with conn.cursor() as cursor:
-                # Create the database if it doesn't already exist
-                cursor.execute("CREATE DATABASE IF NOT EXISTS GymDB")
-                logging.info("Database 'GymDB' checked/created.")
-                
-                # Switch to the GymDB database for subsequent operations
-                cursor.execute("USE GymDB")
-                
-                #-------------TABLES CREATION-----------------------------
-
-                # Admin table to store administrator credentials
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS ADMIN(
-                        ad_ID INT AUTO_INCREMENT PRIMARY KEY,
-                        name VARCHAR(50) NOT NULL,
-                        username VARCHAR(50) UNIQUE NOT NULL,
-                        password VARCHAR(255) NOT NULL
-                    );
-                ''')
-                
-                # Admin Login Details (ALD) table to log admin sign-ins
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS ALD(
-                        login_id INT AUTO_INCREMENT PRIMARY KEY,
-                        ad_id INT,
-                        login_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        user_status ENUM('active','deactivated') DEFAULT 'active',
-                        login_status VARCHAR(50) NOT NULL DEFAULT 'Login Successful',
-                        FOREIGN KEY (ad_id) REFERENCES ADMIN(ad_ID) ON DELETE CASCADE
-                    );
-                ''')
-
-                # Employee table for staff like trainers and IT personnel
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS Employee(
-                        user_id INT AUTO_INCREMENT PRIMARY KEY,
-                        name VARCHAR(100) NOT NULL,
-                        email VARCHAR(100) UNIQUE NOT NULL,
-                        password VARCHAR(255) NOT NULL,
-                        salary INT,
-                        role ENUM('IT', 'Trainer') NOT NULL,
-                        join_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    );
-                ''')
-
-                # Employee Login Details (ELD) table to log employee sign-ins
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS ELD(
-                        login_id INT AUTO_INCREMENT PRIMARY KEY,
-                        emp_id INT,
-                        login_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        user_status ENUM('active','deactivated') DEFAULT 'active',
-                        login_status VARCHAR(50) NOT NULL DEFAULT 'Login Successful',
-                        FOREIGN KEY (emp_id) REFERENCES Employee(user_id) ON DELETE CASCADE
-                    );
-                ''')
-
-                # Members table for gym clients
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS Members(
-                        member_ID INT AUTO_INCREMENT PRIMARY KEY,
-                        name VARCHAR(100) NOT NULL,
-                        email VARCHAR(100) UNIQUE NOT NULL,
-                        password VARCHAR(255) NOT NULL,
-                        phone_number VARCHAR(20),
-                        membership_plan VARCHAR(50),
-                        join_date DATE NOT NULL,
-                        status ENUM('active', 'inactive', 'frozen') DEFAULT 'active',
-                        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
-                    );
-                ''')
-
-                # Member Login Details (MLD) table to log member sign-ins
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS MLD(
-                        login_id INT AUTO_INCREMENT PRIMARY KEY,
-                        mem_id INT,
-                        login_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        user_status ENUM('active','deactivated') DEFAULT 'active',
-                        login_status VARCHAR(50) NOT NULL DEFAULT 'Login Successful',
-                        FOREIGN KEY (mem_id) REFERENCES Members(member_ID) ON DELETE CASCADE
-                    );
-                ''')
-                
-                # Equipment table to track gym assets
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS Equipment(
-                        e_code INT AUTO_INCREMENT PRIMARY KEY,
-                        e_name VARCHAR(50),
-                        e_qty INT,
-                        e_unit_price INT,
-                        e_category VARCHAR(50)
-                    );
-                ''')
-
-                cursor.execute('''
-                    CREATE TABLE attendance (
-                        id INT AUTO_INCREMENT PRIMARY KEY,
-                        mem_id INT NOT NULL,
-                        check_in DATETIME NOT NULL,
-                        check_out DATETIME,                 
-                        FOREIGN KEY (mem_id) REFERENCES Members(member_ID)
-                    );
-                ''')
-                # check_out -- NULL until they leave
-
-                cursor.execute('''
-                    CREATE TABLE progress_logs (
-                        id INT AUTO_INCREMENT PRIMARY KEY,
-                        mem_id INT NOT NULL,
-                        log_date DATE NOT NULL,
-                        weight_kg DECIMAL(5,2),
-                        body_fat_pct DECIMAL(4,2),
-                        notes TEXT,
-                        logged_by INT,                       
-                        FOREIGN KEY (mem_id) REFERENCES members(member_ID)
-                    );
-                ''')
-                # logged_by -- employee/trainer user_id
-                
-                #Payment/Revenue Logs
-                cursor.execute('''
-                    CREATE TABLE payments (
-                        id INT AUTO_INCREMENT PRIMARY KEY,
-                        mem_id INT NOT NULL,
-                        amount DECIMAL(10,2) NOT NULL,
-                        payment_date DATE NOT NULL,
-                        payment_method VARCHAR(50),
-                        plan_type VARCHAR(50),           
-                        status ENUM('paid','pending','failed') DEFAULT 'paid',
-                        FOREIGN KEY (mem_id) REFERENCES Members(member_ID)
-                    );
-                ''')
-                # plan_type -- Monthly, Quarterly, Yearly
-
-
-                # Member Reviews
-                cursor.execute('''
-                    CREATE TABLE reviews (
-                        id INT AUTO_INCREMENT PRIMARY KEY,
-                        member_id INT NOT NULL,
-                        rating TINYINT CHECK (rating BETWEEN 1 AND 5),
-                        review_text TEXT,
-                        category VARCHAR(50),              
-                        submitted_at DATETIME DEFAULT NOW(),
-                        FOREIGN KEY (member_id) REFERENCES members(id)
-                    );
-                ''')
-                # category -- Equipment, Trainer, Cleanliness etc.
-                
-                #Equipment Usage
-                cursor.execute('''
-                    CREATE TABLE equipment_usage (
-                        id              INT AUTO_INCREMENT PRIMARY KEY,
-                        equipment_id    INT NOT NULL,
-                        used_by         INT,                  
-                        used_at         DATETIME DEFAULT NOW(),
-                        duration_mins   INT,
-                        FOREIGN KEY (equipment_id) REFERENCES equipment(id)
-                    );
-                ''')
-                # used_by -- member_id, nullable
-                
-
-                conn.commit()
-                # Updated logging message to be more accurate
-                logging.info("All tables for GymMonk have been checked/created successfully.")
+                # Fast path: the schema is current, nothing to do
+                if _schema_version_of(cursor) >= LATEST_VERSION:
+                    logging.debug("GymDB schema is current.")
+                    return
+
+                cursor.execute("SELECT GET_LOCK(%s, %s)", (SCHEMA_LOCK_NAME, SCHEMA_LOCK_TIMEOUT))
+                if cursor.fetchall()[0][0] != 1:
+                    raise Error(msg=f"Timed out waiting for the '{SCHEMA_LOCK_NAME}' lock")
+                try:
+                    # Another worker may have finished the upgrade while we waited
+                    if _schema_version_of(cursor) >= LATEST_VERSION:
+                        return
+
+                    # Create the database if it doesn't already exist
+                    cursor.execute("CREATE DATABASE IF NOT EXISTS GymDB")
+                    # Switch to the GymDB database for subsequent operations
+                    cursor.execute("USE GymDB")
+                    _create_tables(cursor)
+                    conn.commit()
+                    logging.info("All tables for GymMonk have been checked/created successfully.")
+
+                    # Indexes and later schema changes are applied as versioned migrations
+                    version = apply_migrations(conn)
+                    logging.info(f"GymDB schema is at version {version}.")
+                finally:
+                    cursor.execute("SELECT RELEASE_LOCK(%s)", (SCHEMA_LOCK_NAME,))
+                    cursor.fetchall()
 
     except Error as e:
         logging.error(f"Error during database setup: {e}")
@@ -0,0 +1,522 @@
+import argparse
+import logging
+from mysql.connector import Error, errorcode
+from typing import Callable, List, NamedTuple, Union
+
+# Configure logging for the migrations module
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+Step = Union[str, Callable]
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    steps: List[Step]
+
+
+def add_index(table: str, index_name: str, columns: str, kind: str = 'INDEX') -> Callable:
+    """
+    Returns a migration step that adds an index with online DDL.
+
+    The index is skipped if it already exists, and the DDL falls back to the
+    server's default algorithm if ALGORITHM=INPLACE, LOCK=NONE is not supported
+    for this change (e.g. FULLTEXT indexes).
+
+    Args:
+        kind (str): 'INDEX', 'UNIQUE INDEX' or 'FULLTEXT INDEX'.
+    """
+    def step(cursor):
+        cursor.execute(
+            "SELECT 1 FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s LIMIT 1",
+            (table, index_name)
+        )
+        if cursor.fetchall():
+            logging.info(f"Index {index_name} on {table} already exists, skipping.")
+            return
+        ddl = f"ALTER TABLE {table} ADD {kind} {index_name} {columns}"
+        try:
+            # Online DDL: reads and writes to the table keep working while the index builds
+            cursor.execute(f"{ddl}, ALGORITHM=INPLACE, LOCK=NONE")
+        except Error as e:
+            if e.errno not in (errorcode.ER_ALTER_OPERATION_NOT_SUPPORTED,
+                               errorcode.ER_ALTER_OPERATION_NOT_SUPPORTED_REASON):
+                raise
+            logging.warning(f"Online DDL not available for {index_name}, using a locking ALTER: {e}")
+            cursor.execute(ddl)
+        logging.info(f"Added index {index_name} on {table}{columns}.")
+    step.__name__ = f"add_index_{index_name}"
+    return step
+
+
+def locked_backfill(locks: str, *statements: str) -> Callable:
+    """
+    Returns a migration step that runs `statements` in one transaction under LOCK TABLES.
+
+    Summary tables are rebuilt after their triggers exist, with the source
+    table read-locked: LOCK TABLES waits for open writes to it to commit and
+    blocks new ones, so no row can be counted both by its trigger and by the
+    backfill. On an error the rebuild is rolled back before the tables are
+    unlocked.
+
+    Args:
+        locks (str): The LOCK TABLES list, e.g. "payments READ, revenue_monthly WRITE".
+    """
+    def step(cursor):
+        cursor.execute(f"LOCK TABLES {locks}")
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        finally:
+            cursor.execute("UNLOCK TABLES")
+    step.__name__ = f"locked_backfill_{locks.split()[0]}"
+    return step
+
+
+def _revenue_delta(row: str, sign: str = '') -> str:
+    """Upsert that adds (sign='') or removes (sign='-') one payment row from `revenue_monthly`."""
+    return f'''
+        INSERT INTO revenue_monthly (month, status, plan_type, payment_method, total, payments)
+        VALUES ({row}.payment_date - INTERVAL (DAYOFMONTH({row}.payment_date) - 1) DAY,
+                COALESCE({row}.status, ''), COALESCE({row}.plan_type, ''), COALESCE({row}.payment_method, ''),
+                {sign}{row}.amount, {sign}1)
+        ON DUPLICATE KEY UPDATE total = total + VALUES(total), payments = payments + VALUES(payments)
+    '''
+
+def _attendance_delta(row: str, sign: str = '') -> str:
+    """Upsert that adds (sign='') or removes (sign='-') one visit from `attendance_hourly`."""
+    return f'''
+        INSERT INTO attendance_hourly (visit_date, visit_hour, visits)
+        VALUES (DATE({row}.check_in), HOUR({row}.check_in), {sign}1)
+        ON DUPLICATE KEY UPDATE visits = visits + VALUES(visits)
+    '''
+
+# Longest plausible usage session; longer readings are clipped so one stuck sensor can't skew a month
+MAX_SESSION_MINUTES = 240
+
+def _hour_start(value: str) -> str:
+    """SQL for the start of the clock hour containing the DATETIME `value`."""
+    return f"TIMESTAMP(DATE({value}), MAKETIME(HOUR({value}), 0, 0))"
+
+def _usage_delta(row: str, sign: str = '') -> str:
+    """
+    Block that adds (sign='') or removes (sign='-') one usage session from `equipment_usage_hourly`.
+
+    The session's minutes are spread over the clock hours it overlaps; the
+    session itself is counted in the hour it started.
+    """
+    return f'''
+        BEGIN
+            DECLARE hour_start DATETIME;
+            DECLARE session_end DATETIME;
+            IF {row}.used_at IS NOT NULL AND {row}.duration_mins > 0 THEN
+                SET session_end = {row}.used_at + INTERVAL LEAST({row}.duration_mins, {MAX_SESSION_MINUTES}) MINUTE;
+                SET hour_start = {_hour_start(f'{row}.used_at')};
+                WHILE hour_start < session_end DO
+                    INSERT INTO equipment_usage_hourly (equipment_id, usage_hour, busy_minutes, sessions)
+                    VALUES ({row}.equipment_id, hour_start,
+                            {sign}TIMESTAMPDIFF(SECOND, GREATEST({row}.used_at, hour_start),
+                                                LEAST(session_end, hour_start + INTERVAL 1 HOUR)) / 60,
+                            {sign}(hour_start <= {row}.used_at))
+                    ON DUPLICATE KEY UPDATE busy_minutes = busy_minutes + VALUES(busy_minutes),
+                                            sessions = sessions + VALUES(sessions);
+                    SET hour_start = hour_start + INTERVAL 1 HOUR;
+                END WHILE;
+            END IF;
+        END
+    '''
+
+def _review_delta(table: str, keys: str, key_values: str, row: str, sign: str = '') -> str:
+    """Upsert that adds (sign='') or removes (sign='-') one review from a review stats table."""
+    stars = ', '.join(f"{sign}COALESCE({row}.rating = {n}, 0)" for n in range(1, 6))
+    return f'''
+        INSERT INTO {table} ({keys}, reviews, rated, rating_sum, stars_1, stars_2, stars_3, stars_4, stars_5)
+        VALUES ({key_values}, {sign}1, {sign}({row}.rating IS NOT NULL), {sign}COALESCE({row}.rating, 0), {stars})
+        ON DUPLICATE KEY UPDATE reviews = reviews + VALUES(reviews), rated = rated + VALUES(rated),
+                                rating_sum = rating_sum + VALUES(rating_sum),
+                                stars_1 = stars_1 + VALUES(stars_1), stars_2 = stars_2 + VALUES(stars_2),
+                                stars_3 = stars_3 + VALUES(stars_3), stars_4 = stars_4 + VALUES(stars_4),
+                                stars_5 = stars_5 + VALUES(stars_5)
+    '''
+
+def _review_stats_delta(row: str, sign: str = '') -> str:
+    """Both review stats upserts (all-time per category, then per category and week) for one review."""
+    category = f"COALESCE({row}.category, '')"
+    submitted_at = f"COALESCE({row}.submitted_at, NOW())"
+    week = f"DATE({submitted_at}) - INTERVAL WEEKDAY({submitted_at}) DAY"
+    return (f"{_review_delta('review_stats', 'category', category, row, sign)}; "
+            f"{_review_delta('review_stats_weekly', 'category, week_start', f'{category}, {week}', row, sign)}")
+
+# Histogram columns shared by the review stats tables
+_REVIEW_COUNTERS = '''
+            reviews INT NOT NULL DEFAULT 0,
+            rated INT NOT NULL DEFAULT 0,
+            rating_sum INT NOT NULL DEFAULT 0,
+            stars_1 INT NOT NULL DEFAULT 0,
+            stars_2 INT NOT NULL DEFAULT 0,
+            stars_3 INT NOT NULL DEFAULT 0,
+            stars_4 INT NOT NULL DEFAULT 0,
+            stars_5 INT NOT NULL DEFAULT 0,'''
+
+# Sums and counters of every review column for a GROUP BY backfill
+_REVIEW_SUMS = ("COUNT(*), COUNT(rating), COALESCE(SUM(rating), 0), "
+                + ', '.join(f"COALESCE(SUM(rating = {n}), 0)" for n in range(1, 6)))
+
+# Recomputes the revenue summary rows from payments; used by REVENUE_REBUILD.
+# Rows the triggers already wrote are overwritten, never added to, so a rerun can't double count.
+REVENUE_BACKFILL = '''
+    INSERT INTO revenue_monthly (month, status, plan_type, payment_method, total, payments)
+    SELECT payment_date - INTERVAL (DAYOFMONTH(payment_date) - 1) DAY,
+           COALESCE(status, ''), COALESCE(plan_type, ''), COALESCE(payment_method, ''),
+           SUM(amount), COUNT(*)
+    FROM payments
+    GROUP BY 1, 2, 3, 4
+    ON DUPLICATE KEY UPDATE total = VALUES(total), payments = VALUES(payments)
+'''
+
+# Rebuilds the revenue summary from scratch with payments read-locked; used by migration 4 and backfill_revenue.py
+REVENUE_REBUILD = locked_backfill("payments READ, revenue_monthly WRITE", "DELETE FROM revenue_monthly", REVENUE_BACKFILL)
+
+# Rebuilds the hourly visit counts from scratch; used by migration 10
+ATTENDANCE_BACKFILL = '''
+    INSERT INTO attendance_hourly (visit_date, visit_hour, visits)
+    SELECT DATE(check_in), HOUR(check_in), COUNT(*)
+    FROM attendance
+    GROUP BY 1, 2
+'''
+
+# Rebuilds the hourly equipment usage from scratch; used by migration 11.
+# Each session is joined with the hour offsets it can span and clipped to each hour.
+USAGE_BACKFILL = f'''
+    INSERT INTO equipment_usage_hourly (equipment_id, usage_hour, busy_minutes, sessions)
+    SELECT equipment_id, hour_start,
+           SUM(TIMESTAMPDIFF(SECOND, GREATEST(used_at, hour_start), LEAST(session_end, hour_start + INTERVAL 1 HOUR)) / 60),
+           SUM(hour_start <= used_at)
+    FROM (
+        SELECT equipment_id, used_at,
+               used_at + INTERVAL LEAST(duration_mins, {MAX_SESSION_MINUTES}) MINUTE AS session_end,
+               {_hour_start('used_at')} + INTERVAL hour_offsets.n HOUR AS hour_start
+        FROM equipment_usage
+        JOIN ({' UNION ALL '.join(f'SELECT {n} AS n' for n in range(MAX_SESSION_MINUTES // 60 + 1))}) hour_offsets
+        WHERE used_at IS NOT NULL AND duration_mins > 0
+    ) spans
+    WHERE hour_start < session_end
+    GROUP BY equipment_id, hour_start
+'''
+
+# Ordered list of schema changes. Never edit an applied migration; append a new one instead.
+MIGRATIONS = [
+    Migration(1, "Members (name, member_ID) index for keyset pagination", [
+        add_index('Members', 'idx_members_name_id', '(name, member_ID)'),
+    ]),
+    Migration(2, "Indexes for hot lookup and analytics range-scan columns", [
+        add_index('Members', 'idx_members_phone', '(phone_number)'),
+        add_index('attendance', 'idx_attendance_mem_check_in', '(mem_id, check_in)'),
+        add_index('attendance', 'idx_attendance_check_in', '(check_in)'),
+        add_index('payments', 'idx_payments_date_status', '(payment_date, status)'),
+        add_index('ALD', 'idx_ald_login_time', '(login_time)'),
+        add_index('ELD', 'idx_eld_login_time', '(login_time)'),
+        add_index('MLD', 'idx_mld_login_time', '(login_time)'),
+    ]),
+    Migration(3, "FULLTEXT index on member names for fuzzy search", [
+        add_index('Members', 'ft_members_name', '(name)', kind='FULLTEXT INDEX'),
+    ]),
+    Migration(4, "revenue_monthly summary maintained by triggers on payments", [
+        '''
+        CREATE TABLE IF NOT EXISTS revenue_monthly (
+            month DATE NOT NULL,
+            status VARCHAR(10) NOT NULL,
+            plan_type VARCHAR(50) NOT NULL,
+            payment_method VARCHAR(50) NOT NULL,
+            total DECIMAL(14,2) NOT NULL DEFAULT 0,
+            payments INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (month, status, plan_type, payment_method)
+        )
+        ''',
+        "DROP TRIGGER IF EXISTS trg_payments_revenue_insert",
+        "DROP TRIGGER IF EXISTS trg_payments_revenue_update",
+        "DROP TRIGGER IF EXISTS trg_payments_revenue_delete",
+        f"CREATE TRIGGER trg_payments_revenue_insert AFTER INSERT ON payments FOR EACH ROW {_revenue_delta('NEW')}",
+        f"CREATE TRIGGER trg_payments_revenue_update AFTER UPDATE ON payments FOR EACH ROW "
+        f"BEGIN {_revenue_delta('OLD', '-')}; {_revenue_delta('NEW')}; END",
+        f"CREATE TRIGGER trg_payments_revenue_delete AFTER DELETE ON payments FOR EACH ROW {_revenue_delta('OLD', '-')}",
+        REVENUE_REBUILD,
+    ]),
+    Migration(5, "Members join_date and membership_plan indexes for dashboard aggregates", [
+        add_index('Members', 'idx_members_join_date', '(join_date)'),
+        add_index('Members', 'idx_members_plan', '(membership_plan)'),
+    ]),
+    Migration(6, "progress_logs (mem_id, log_date) index for member trends", [
+        add_index('progress_logs', 'idx_progress_mem_date', '(mem_id, log_date)'),
+    ]),
+    Migration(7, "equipment_usage_hourly rollup for utilization analytics", [
+        '''
+        CREATE TABLE IF NOT EXISTS equipment_usage_hourly (
+            equipment_id INT NOT NULL,
+            usage_hour DATETIME NOT NULL,
+            busy_minutes DECIMAL(10,2) NOT NULL DEFAULT 0,
+            sessions INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (equipment_id, usage_hour),
+            KEY idx_usage_hourly_hour (usage_hour)
+        )
+        ''',
+    ]),
+    Migration(8, "review_stats and review_stats_weekly maintained by triggers on reviews", [
+        # submitted_at is nullable; give legacy rows a date so the feed and the weekly stats agree on it
+        "UPDATE reviews SET submitted_at = NOW() WHERE submitted_at IS NULL",
+        f'''
+        CREATE TABLE IF NOT EXISTS review_stats (
+            category VARCHAR(50) NOT NULL,{_REVIEW_COUNTERS}
+            PRIMARY KEY (category)
+        )
+        ''',
+        f'''
+        CREATE TABLE IF NOT EXISTS review_stats_weekly (
+            category VARCHAR(50) NOT NULL,
+            week_start DATE NOT NULL,{_REVIEW_COUNTERS}
+            PRIMARY KEY (category, week_start),
+            KEY idx_review_stats_week (week_start)
+        )
+        ''',
+        "DROP TRIGGER IF EXISTS trg_reviews_stats_insert",
+        "DROP TRIGGER IF EXISTS trg_reviews_stats_update",
+        "DROP TRIGGER IF EXISTS trg_reviews_stats_delete",
+        f"CREATE TRIGGER trg_reviews_stats_insert AFTER INSERT ON reviews FOR EACH ROW "
+        f"BEGIN {_review_stats_delta('NEW')}; END",
+        f"CREATE TRIGGER trg_reviews_stats_update AFTER UPDATE ON reviews FOR EACH ROW "
+        f"BEGIN {_review_stats_delta('OLD', '-')}; {_review_stats_delta('NEW')}; END",
+        f"CREATE TRIGGER trg_reviews_stats_delete AFTER DELETE ON reviews FOR EACH ROW "
+        f"BEGIN {_review_stats_delta('OLD', '-')}; END",
+        "DELETE FROM review_stats",
+        "DELETE FROM review_stats_weekly",
+        f'''
+        INSERT INTO review_stats (category, reviews, rated, rating_sum, stars_1, stars_2, stars_3, stars_4, stars_5)
+        SELECT COALESCE(category, ''), {_REVIEW_SUMS}
+        FROM reviews
+        GROUP BY 1
+        ''',
+        f'''
+        INSERT INTO review_stats_weekly (category, week_start, reviews, rated, rating_sum,
+                                         stars_1, stars_2, stars_3, stars_4, stars_5)
+        SELECT COALESCE(category, ''),
+               DATE(COALESCE(submitted_at, NOW())) - INTERVAL WEEKDAY(COALESCE(submitted_at, NOW())) DAY, {_REVIEW_SUMS}
+        FROM reviews
+        GROUP BY 1, 2
+        ''',
+        add_index('reviews', 'idx_reviews_submitted_id', '(submitted_at, id)'),
+        add_index('reviews', 'idx_reviews_category_submitted', '(category, submitted_at, id)'),
+    ]),
+    Migration(9, "password_resets tokens and the mail_outbox", [
+        '''
+        CREATE TABLE IF NOT EXISTS password_resets (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            member_id INT NOT NULL,
+            token_hash CHAR(64) NOT NULL,
+            expires_at DATETIME NOT NULL,
+            used_at DATETIME NULL,
+            created_at DATETIME NOT NULL DEFAULT NOW(),
+            UNIQUE KEY uq_password_resets_token (token_hash),
+            KEY idx_password_resets_member (member_id, created_at),
+            FOREIGN KEY (member_id) REFERENCES Members(member_ID) ON DELETE CASCADE
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS mail_outbox (
+            id BIGINT AUTO_INCREMENT PRIMARY KEY,
+            recipient VARCHAR(255) NOT NULL,
+            subject VARCHAR(255) NOT NULL,
+            body TEXT NOT NULL,
+            status ENUM('pending', 'sent', 'failed') NOT NULL DEFAULT 'pending',
+            attempts INT NOT NULL DEFAULT 0,
+            next_attempt_at DATETIME NOT NULL DEFAULT NOW(),
+            last_error VARCHAR(500) NULL,
+            created_at DATETIME NOT NULL DEFAULT NOW(),
+            sent_at DATETIME NULL,
+            KEY idx_mail_outbox_due (status, next_attempt_at)
+        )
+        ''',
+    ]),
+    Migration(10, "attendance_hourly maintained by triggers on attendance", [
+        "DROP TRIGGER IF EXISTS trg_attendance_hourly_insert",
+        "DROP TRIGGER IF EXISTS trg_attendance_hourly_update",
+        "DROP TRIGGER IF EXISTS trg_attendance_hourly_delete",
+        f"CREATE TRIGGER trg_attendance_hourly_insert AFTER INSERT ON attendance FOR EACH ROW {_attendance_delta('NEW')}",
+        # Check-outs update attendance rows too; only a moved check_in changes the counts
+        f"CREATE TRIGGER trg_attendance_hourly_update AFTER UPDATE ON attendance FOR EACH ROW "
+        f"IF NOT (OLD.check_in <=> NEW.check_in) THEN {_attendance_delta('OLD', '-')}; {_attendance_delta('NEW')}; END IF",
+        f"CREATE TRIGGER trg_attendance_hourly_delete AFTER DELETE ON attendance FOR EACH ROW {_attendance_delta('OLD', '-')}",
+        locked_backfill("attendance READ, attendance_hourly WRITE", "DELETE FROM attendance_hourly", ATTENDANCE_BACKFILL),
+    ]),
+    Migration(11, "equipment_usage_hourly maintained by triggers on equipment_usage", [
+        "DROP TRIGGER IF EXISTS trg_equipment_usage_hourly_insert",
+        "DROP TRIGGER IF EXISTS trg_equipment_usage_hourly_update",
+        "DROP TRIGGER IF EXISTS trg_equipment_usage_hourly_delete",
+        f"CREATE TRIGGER trg_equipment_usage_hourly_insert AFTER INSERT ON equipment_usage FOR EACH ROW "
+        f"{_usage_delta('NEW')}",
+        f"CREATE TRIGGER trg_equipment_usage_hourly_update AFTER UPDATE ON equipment_usage FOR EACH ROW "
+        f"BEGIN {_usage_delta('OLD', '-')}; {_usage_delta('NEW')}; END",
+        f"CREATE TRIGGER trg_equipment_usage_hourly_delete AFTER DELETE ON equipment_usage FOR EACH ROW "
+        f"{_usage_delta('OLD', '-')}",
+        locked_backfill("equipment_usage READ, equipment_usage_hourly WRITE",
+                        "DELETE FROM equipment_usage_hourly", USAGE_BACKFILL),
+        # The id watermarks of the old refresh-on-read rollups are no longer used
+        "DROP TABLE IF EXISTS rollup_watermarks",
+    ]),
+    Migration(12, "clear the bodies of delivered and abandoned outbox mail", [
+        # Sent reset emails kept their plaintext link; the sender now clears the body when it is done
+        "UPDATE mail_outbox SET body = '' WHERE status IN ('sent', 'failed')",
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(cursor) -> int:
+    """Returns the highest applied migration version, or 0 for a fresh database."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+    ''')
+    cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")
+    return int(cursor.fetchall()[0][0])
+
+def apply_migrations(conn) -> int:
+    """
+    Applies every migration newer than the recorded schema version, in order.
+
+    Each migration's version is recorded as soon as it completes, so a failed
+    run resumes from the first migration that did not finish.
+
+    Returns:
+        int: The schema version after applying migrations.
+    """
+    with conn.cursor() as cursor:
+        version = current_version(cursor)
+        for migration in MIGRATIONS:
+            if migration.version <= version:
+                continue
+            logging.info(f"Applying migration {migration.version}: {migration.description}")
+            for step in migration.steps:
+                if callable(step):
+                    step(cursor)
+                else:
+                    cursor.execute(step)
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                (migration.version, migration.description)
+            )
+            conn.commit()
+            version = migration.version
+    return version
+
+
+# --- Index usage check ---
+
+# Hot queries and the index each one is expected to use
+HOT_QUERIES = [
+    ("Member.phone_no_exists",
+     "SELECT phone_number FROM Members WHERE phone_number = '5550100'",
+     'idx_members_phone'),
+    ("Member list page",
+     "SELECT member_ID, name FROM Members WHERE name > 'M' OR (name = 'M' AND member_ID > 0) "
+     "ORDER BY name, member_ID LIMIT 50",
+     'idx_members_name_id'),
+    ("Member search by name prefix",
+     "SELECT member_ID, name FROM Members WHERE name LIKE 'Jo%' ORDER BY name LIMIT 20",
+     'idx_members_name_id'),
+    ("Member growth by month",
+     "SELECT join_date - INTERVAL (DAYOFMONTH(join_date) - 1) DAY AS month, COUNT(*) FROM Members "
+     "WHERE join_date >= '2025-01-01' GROUP BY month",
+     'idx_members_join_date'),
+    ("Member count by plan",
+     "SELECT membership_plan, COUNT(*) FROM Members GROUP BY membership_plan",
+     'idx_members_plan'),
+    ("Attendance for a member over a range",
+     "SELECT check_in, check_out FROM attendance WHERE mem_id = 1 "
+     "AND check_in >= '2025-01-01' AND check_in < '2025-02-01'",
+     'idx_attendance_mem_check_in'),
+    ("Progress trend for a member",
+     "SELECT log_date, weight_kg FROM progress_logs WHERE mem_id = 1 AND log_date >= '2025-01-01'",
+     'idx_progress_mem_date'),
+    ("Latest reviews feed",
+     "SELECT id, rating FROM reviews WHERE submitted_at < '2025-01-01' ORDER BY submitted_at DESC, id DESC LIMIT 20",
+     'idx_reviews_submitted_id'),
+    ("Due outbox mail",
+     "SELECT id FROM mail_outbox WHERE status = 'pending' AND next_attempt_at <= '2025-01-01' ORDER BY next_attempt_at, id LIMIT 50",
+     'idx_mail_outbox_due'),
+    ("Attendance over a date range",
+     "SELECT COUNT(*) FROM attendance WHERE check_in >= '2025-01-01' AND check_in < '2025-01-02'",
+     'idx_attendance_check_in'),
+    ("Paid revenue over a date range",
+     "SELECT SUM(amount) FROM payments WHERE payment_date BETWEEN '2025-01-01' AND '2025-01-31' AND status = 'paid'",
+     'idx_payments_date_status'),
+    ("Member logins over a range",
+     "SELECT COUNT(*) FROM MLD WHERE login_time >= '2025-01-01' AND login_time < '2025-01-02'",
+     'idx_mld_login_time'),
+]
+
+# Below this many rows the optimizer may rightly prefer a table scan
+MIN_ROWS_FOR_INDEX_CHECK = 1000
+
+def check_index_usage(conn) -> list:
+    """
+    Runs EXPLAIN on each hot query and reports whether it uses its expected index.
+
+    Returns:
+        list[dict]: One entry per query with its status: 'ok', 'failed', or
+        'skipped' when the table is too small for the result to be meaningful.
+    """
+    results = []
+    with conn.cursor(dictionary=True) as cursor:
+        for name, query, expected in HOT_QUERIES:
+            cursor.execute(f"EXPLAIN {query}")
+            plan = cursor.fetchall()[0]
+            cursor.execute(
+                "SELECT table_rows FROM information_schema.tables "
+                "WHERE table_schema = DATABASE() AND table_name = %s",
+                (plan['table'],)
+            )
+            table_rows = int((cursor.fetchall() or [{'table_rows': 0}])[0]['table_rows'] or 0)
+
+            if plan['key'] == expected:
+                status = 'ok'
+            elif table_rows < MIN_ROWS_FOR_INDEX_CHECK:
+                status = 'skipped'
+            else:
+                status = 'failed'
+            results.append({
+                "query": name,
+                "expected": expected,
+                "key": plan['key'],
+                "possible_keys": plan['possible_keys'],
+                "rows": table_rows,
+                "status": status,
+            })
+    return results
+
+
+if __name__ == '__main__':
+    from dotenv import load_dotenv
+    load_dotenv()
+    from database.connection import db_connection
+
+    parser = argparse.ArgumentParser(description="Apply schema migrations or check index usage.")
+    parser.add_argument('--explain', action='store_true',
+                        help="EXPLAIN the hot queries and exit non-zero if one skips its index")
+    args = parser.parse_args()
+
+    with db_connection() as conn:
+        if args.explain:
+            report = check_index_usage(conn)
+            for row in report:
+                print(f"[{row['status']:>7}] {row['query']}: key={row['key']} "
+                      f"(expected {row['expected']}, {row['rows']} rows)")
+            raise SystemExit(1 if any(row['status'] == 'failed' for row in report) else 0)
+        print(f"Schema is at version {apply_migrations(conn)}.")
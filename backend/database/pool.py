@@ -0,0 +1,165 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Any
+
+from mysql.connector import errors
+
+# Configure logging for the pool module
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class ConnectionPool:
+    """
+    A bounded, thread-safe pool of MySQL connections.
+
+    At most `size` connections exist at any time. Borrowers wait up to
+    `timeout` seconds for a free connection before a PoolError is raised,
+    and every connection is health-checked before it is handed out so a
+    connection dropped by the server is transparently replaced.
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int = 10, timeout: float = 5.0):
+        """
+        Args:
+            factory: Callable that opens a brand new database connection.
+            size (int): Maximum number of open connections.
+            timeout (float): Seconds to wait for a free connection before giving up.
+        """
+        if size < 1:
+            raise ValueError("Connection pool size must be at least 1")
+        self._factory = factory
+        self.size = size
+        self.timeout = timeout
+
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._open = 0
+        self._in_use = 0
+
+        # Counters exported through stats()
+        self._acquired_total = 0
+        self._timeouts_total = 0
+        self._replaced_total = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+
+    def acquire(self):
+        """
+        Borrows a healthy connection from the pool, opening a new one if the
+        pool has not reached its size limit yet.
+
+        Raises:
+            PoolError: If no connection became available within the timeout.
+        """
+        started = time.perf_counter()
+        deadline = started + self.timeout
+
+        with self._available:
+            while not self._idle and self._open >= self.size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._timeouts_total += 1
+                    raise errors.PoolError(
+                        f"Timed out after {self.timeout}s waiting for a database connection "
+                        f"({self._in_use}/{self.size} in use)"
+                    )
+                self._available.wait(remaining)
+
+            conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                # Reserve the slot before connecting so we never exceed the limit
+                self._open += 1
+            self._in_use += 1
+
+        try:
+            if conn is None:
+                conn = self._factory()
+            elif not self._is_healthy(conn):
+                self._close_quietly(conn)
+                with self._lock:
+                    self._replaced_total += 1
+                conn = self._factory()
+        except Exception:
+            with self._available:
+                self._open -= 1
+                self._in_use -= 1
+                self._available.notify()
+            raise
+
+        waited = time.perf_counter() - started
+        with self._lock:
+            self._acquired_total += 1
+            self._wait_seconds_total += waited
+            self._wait_seconds_max = max(self._wait_seconds_max, waited)
+        return conn
+
+    def release(self, conn, discard: bool = False) -> None:
+        """
+        Returns a borrowed connection to the pool, discarding any open transaction.
+
+        With discard=True the connection is closed instead, e.g. when it was
+        abandoned in the middle of reading an unbuffered result.
+        """
+        healthy = not discard
+        try:
+            if healthy and conn.in_transaction:
+                conn.rollback()
+        except errors.Error as e:
+            logging.warning(f"Discarding pooled connection that failed to reset: {e}")
+            healthy = False
+
+        with self._available:
+            self._in_use -= 1
+            if healthy:
+                self._idle.append(conn)
+            else:
+                self._open -= 1
+            self._available.notify()
+
+        if not healthy:
+            self._close_quietly(conn)
+
+    def close_all(self) -> None:
+        """Closes every idle connection. Borrowed connections are closed when released."""
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open -= len(idle)
+        for conn in idle:
+            self._close_quietly(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns a snapshot of the pool's gauges and counters."""
+        with self._lock:
+            return {
+                "size": self.size,
+                "open": self._open,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "acquired_total": self._acquired_total,
+                "timeouts_total": self._timeouts_total,
+                "replaced_total": self._replaced_total,
+                "wait_seconds_total": round(self._wait_seconds_total, 6),
+                "wait_seconds_max": round(self._wait_seconds_max, 6),
+            }
+
+    # --- Private Helper Methods ---
+
+    @staticmethod
+    def _is_healthy(conn) -> bool:
+        """Pings the server to make sure an idle connection is still usable."""
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except errors.Error:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn) -> None:
+        try:
+            conn.close()
+        except errors.Error:
+            pass
@@ -0,0 +1,59 @@
+"""
+Gunicorn settings for serving wsgi:app in production.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Every setting can be overridden through the environment (see README).
+"""
+import logging
+import os
+
+# --- Server Settings ---
+bind = os.getenv('WEB_BIND', '127.0.0.1:5000')
+# Each worker also runs its own bcrypt process pool (BCRYPT_WORKERS) and DB pool (DB_POOL_SIZE)
+workers = int(os.getenv('WEB_WORKERS', str(os.cpu_count() or 1)))
+# Threads per worker; more than one uses the threaded (gthread) worker
+threads = int(os.getenv('WEB_THREADS', '4'))
+worker_class = 'gthread' if threads > 1 else 'sync'
+# Seconds an idle client connection is kept open for the next request
+keepalive = int(os.getenv('WEB_KEEPALIVE', '5'))
+timeout = int(os.getenv('WEB_TIMEOUT', '30'))
+# Seconds in-flight requests get to finish after SIGTERM before workers are killed
+graceful_timeout = int(os.getenv('WEB_GRACEFUL_TIMEOUT', '30'))
+
+# Build the app once in the master so the schema check runs once, then fork
+preload_app = True
+
+
+# --- Worker Lifecycle Hooks ---
+
+def post_fork(server, worker):
+    """Drops connections, threads and queues inherited from the master; each worker opens its own."""
+    from database.connection import reset_pool_after_fork
+    from database.audit import login_audit
+    from api.equipment_usage import usage_writer
+    from core.mail_outbox import outbox_sender
+
+    reset_pool_after_fork()
+    login_audit.reset_after_fork()
+    usage_writer.reset_after_fork()
+    outbox_sender.reset_after_fork()
+
+def worker_exit(server, worker):
+    """
+    Runs once the worker has stopped accepting requests and finished the
+    in-flight ones (gunicorn's graceful SIGTERM handling): flushes the
+    background writers, then closes the worker's database connections.
+    """
+    from database.connection import close_pool
+    from database.audit import login_audit
+    from api.equipment_usage import usage_writer
+    from core.mail_outbox import outbox_sender
+
+    try:
+        login_audit.stop()
+        usage_writer.stop()
+        outbox_sender.stop()
+    finally:
+        close_pool()
+    logging.info(f"Worker {worker.pid} drained and closed its database connections.")
@@ -0,0 +1,187 @@
+import argparse
+import json
+import logging
+import os
+from datetime import datetime
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+from mysql.connector import Error
+from database.connection import db_connection, setup_database
+
+# Configure logging for the importer
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+INSERT_ATTENDANCE = "INSERT INTO attendance (mem_id, check_in, check_out) VALUES (%s, %s, %s)"
+SAVE_CHECKPOINT = """
+    INSERT INTO import_checkpoints (source, byte_offset, open_swipes) VALUES (%s, %s, %s)
+    ON DUPLICATE KEY UPDATE byte_offset = VALUES(byte_offset), open_swipes = VALUES(open_swipes)
+"""
+
+
+class SwipeImporter:
+    """
+    Streams a turnstile dump (`timestamp,member_id,event_type`) into the
+    attendance table.
+
+    Each `swipe_in` is paired with the same member's next `swipe_out`. Rows
+    are written with batched `executemany` calls, and the byte offset reached
+    plus the still-open swipes are saved in `import_checkpoints` inside the
+    same transaction as each chunk, so an interrupted import resumes exactly
+    where it stopped without duplicating or losing sessions.
+    """
+
+    def __init__(self, path: str, source: str, chunk_size: int = 5000, keep_unmatched: bool = False):
+        self.path = path
+        self.source = source
+        self.chunk_size = chunk_size
+        self.keep_unmatched = keep_unmatched
+
+        self.open_swipes: dict = {}  # member_id -> check_in timestamp of the pending swipe_in
+        self.pending: list = []      # attendance rows waiting for the next batch write
+        self.known_members: set = set()
+
+        self.counts = {
+            "rows_read": 0,
+            "sessions_written": 0,
+            "unmatched_in": 0,
+            "unmatched_out": 0,
+            "unknown_member": 0,
+            "malformed": 0,
+        }
+
+    def run(self, restart: bool = False) -> dict:
+        """Imports the file, resuming from the saved checkpoint unless `restart` is set."""
+        with db_connection() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT member_ID FROM Members")
+            self.known_members = {row[0] for row in cursor.fetchall()}
+
+            offset = 0
+            if restart:
+                cursor.execute("DELETE FROM import_checkpoints WHERE source = %s", (self.source,))
+                conn.commit()
+            else:
+                offset = self._load_checkpoint(cursor)
+
+            with open(self.path, 'rb') as f:
+                if offset == 0:
+                    f.readline()  # Skip the header row
+                    offset = f.tell()
+                else:
+                    f.seek(offset)
+                    logging.info(f"Resuming '{self.source}' from byte {offset}.")
+
+                rows_in_chunk = 0
+                for raw in iter(f.readline, b''):
+                    offset += len(raw)
+                    self._consume(raw)
+                    rows_in_chunk += 1
+                    if rows_in_chunk >= self.chunk_size:
+                        self._flush(conn, cursor, offset)
+                        rows_in_chunk = 0
+
+            # Swipes still open at the end of the file stay in the checkpoint so an
+            # appended or resumed file can close them; optionally write them as open visits.
+            if self.keep_unmatched:
+                for member_id, check_in in self.open_swipes.items():
+                    self.pending.append((member_id, check_in, None))
+                self.counts["unmatched_in"] += len(self.open_swipes)
+                self.open_swipes.clear()
+            self._flush(conn, cursor, offset)
+
+        self.counts["still_open"] = len(self.open_swipes)
+        return self.counts
+
+    # --- Private Helper Methods ---
+
+    def _consume(self, raw: bytes):
+        """Parses one CSV line and pairs it with the member's open swipe."""
+        self.counts["rows_read"] += 1
+        try:
+            # The dump never quotes fields, so a plain split is enough and much faster than csv
+            timestamp, member_id, event_type = raw.decode('utf-8').rstrip('\r\n').split(',')
+            member_id = int(member_id)
+            datetime.fromisoformat(timestamp)
+        except (ValueError, UnicodeDecodeError):
+            self.counts["malformed"] += 1
+            return
+
+        if member_id not in self.known_members:
+            self.counts["unknown_member"] += 1
+            return
+
+        if event_type == 'swipe_in':
+            previous = self.open_swipes.get(member_id)
+            if previous is not None:
+                # Two swipe_ins in a row: the earlier one never got a swipe_out
+                self.counts["unmatched_in"] += 1
+                if self.keep_unmatched:
+                    self.pending.append((member_id, previous, None))
+            self.open_swipes[member_id] = timestamp
+        elif event_type == 'swipe_out':
+            check_in = self.open_swipes.pop(member_id, None)
+            if check_in is None:
+                self.counts["unmatched_out"] += 1
+            else:
+                self.pending.append((member_id, check_in, timestamp))
+        else:
+            self.counts["malformed"] += 1
+
+    def _flush(self, conn, cursor, offset: int):
+        """Writes pending sessions and the checkpoint in a single transaction."""
+        if self.pending:
+            cursor.executemany(INSERT_ATTENDANCE, self.pending)
+        cursor.execute(SAVE_CHECKPOINT, (self.source, offset, json.dumps(self.open_swipes)))
+        conn.commit()
+        self.counts["sessions_written"] += len(self.pending)
+        logging.info(f"Committed {len(self.pending)} sessions ({self.counts['rows_read']} rows read).")
+        self.pending = []
+
+    def _load_checkpoint(self, cursor) -> int:
+        """Restores the byte offset and open swipes saved by a previous run."""
+        cursor.execute(
+            "SELECT byte_offset, open_swipes FROM import_checkpoints WHERE source = %s",
+            (self.source,)
+        )
+        row = cursor.fetchone()
+        if not row:
+            return 0
+        byte_offset, open_swipes = row
+        # JSON object keys are strings; member ids are ints everywhere else
+        self.open_swipes = {int(k): v for k, v in json.loads(open_swipes or '{}').items()}
+        return int(byte_offset)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import turnstile swipe events into the attendance table.")
+    parser.add_argument('path', help="CSV file with timestamp,member_id,event_type rows")
+    parser.add_argument('--source', help="Checkpoint name (defaults to the file name)")
+    parser.add_argument('--chunk-size', type=int, default=5000, help="Rows read per committed batch")
+    parser.add_argument('--keep-unmatched', action='store_true',
+                        help="Write swipe_ins without a swipe_out as visits with no check_out")
+    parser.add_argument('--restart', action='store_true', help="Ignore any saved checkpoint")
+    args = parser.parse_args()
+
+    setup_database()
+
+    importer = SwipeImporter(
+        path=args.path,
+        source=args.source or os.path.basename(args.path),
+        chunk_size=args.chunk_size,
+        keep_unmatched=args.keep_unmatched
+    )
+    try:
+        counts = importer.run(restart=args.restart)
+    except Error as e:
+        logging.error(f"Import stopped by a database error; rerun to resume from the last checkpoint: {e}")
+        raise SystemExit(1)
+
+    print("--- Import summary ---")
+    for key, value in counts.items():
+        print(f"   - {key}: {value}")
+
+
+if __name__ == '__main__':
+    main()
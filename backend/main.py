@@ -3,42 +3,94 @@ from flask_cors import CORS
 import os
 
 # Import the blueprints from the api folder
-from api.auth_routes import auth_bp
+from api.auth_routes import auth_bp, token_cache
 from api.member_routes import member_bp
 from api.employee_routes import employee_bp
 from api.equipment_routes import equipment_bp
+from api.analytics_routes import analytics_bp
+from api.occupancy_routes import occupancy_bp
+from api.progress_routes import progress_bp
+from api.review_routes import review_bp
+from api.export_routes import export_bp
 
-# Import the database setup function
-from database.connection import setup_database
+# Import the database setup and connection pool helpers
+from database.connection import setup_database, release_request_connection, pool_stats
+from database.audit import login_audit
+from api.equipment_usage import usage_writer
+from api.equipment import catalogue_cache
+from api.user import member_stats_cache
+from core import instrumentation
+from core.mail_outbox import outbox_sender
 
-# --- Database Setup ---
-# This command will run when the application starts, ensuring the database
-# and all necessary tables are created before the server accepts requests.
-setup_database()
-# --------------------
+def create_app(setup_schema: bool = True) -> Flask:
+    """
+    Builds the Flask application with every blueprint registered.
 
-# Create the Flask app
-app = Flask(__name__)
+    Used by the development server below and by the production entry point
+    (wsgi.py), which calls it once in the pre-fork master process.
 
-# Load secret key from environment variables for JWT
-app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'a_default_fallback_secret_key')
+    Args:
+        setup_schema (bool): Bring the database schema up to date first. Once
+            the schema is current this is a single version lookup; otherwise
+            the tables and pending migrations are applied before the app
+            accepts requests.
+    """
+    if setup_schema:
+        setup_database()
 
-# Enable CORS (Cross-Origin Resource Sharing)
-CORS(app,supports_credentials=True, origins=["http://127.0.0.1:5500"])
+    app = Flask(__name__)
 
-# A simple test route to make sure the server is running
-@app.route('/api/ping', methods=['GET'])
-def ping_pong():
-    return jsonify({"message": "pong!"}), 200
+    # Load secret key from environment variables for JWT
+    app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'a_default_fallback_secret_key')
 
-# Register the blueprints with their respective URL prefixes
-app.register_blueprint(auth_bp, url_prefix='/api/auth')
-app.register_blueprint(member_bp, url_prefix='/api/members')
-app.register_blueprint(employee_bp, url_prefix='/api/employees')
-app.register_blueprint(equipment_bp, url_prefix='/api/equipment')
+    # Enable CORS (Cross-Origin Resource Sharing)
+    CORS(app,supports_credentials=True, origins=["http://127.0.0.1:5500"])
+
+    # Return each request's pooled database connection once the request is done
+    app.teardown_appcontext(release_request_connection)
+
+    # Opt-in Server-Timing headers and Prometheus metrics at /api/metrics (INSTRUMENTATION_ENABLED=1)
+    instrumentation.init_app(app, pool_stats=pool_stats)
+
+    # Flask-Mail settings and the background sender that delivers the mail outbox
+    outbox_sender.init_app(app)
+
+    # A simple test route to make sure the server is running
+    @app.route('/api/ping', methods=['GET'])
+    def ping_pong():
+        return jsonify({"message": "pong!"}), 200
+
+    # Exposes connection pool usage and token cache hit rates for monitoring
+    @app.route('/api/health', methods=['GET'])
+    def health():
+        return jsonify({
+            "status": "ok",
+            "pid": os.getpid(),
+            "db_pool": pool_stats(),
+            "token_cache": token_cache.stats(),
+            "login_audit": login_audit.stats(),
+            "equipment_usage_writer": usage_writer.stats(),
+            "equipment_cache": catalogue_cache.stats(),
+            "member_stats_cache": member_stats_cache.stats(),
+            "mail_outbox": outbox_sender.stats()
+        }), 200
+
+    # Register the blueprints with their respective URL prefixes
+    app.register_blueprint(auth_bp, url_prefix='/api/auth')
+    app.register_blueprint(member_bp, url_prefix='/api/members')
+    app.register_blueprint(employee_bp, url_prefix='/api/employees')
+    app.register_blueprint(equipment_bp, url_prefix='/api/equipment')
+    app.register_blueprint(analytics_bp, url_prefix='/api/analytics')
+    app.register_blueprint(occupancy_bp, url_prefix='/api/occupancy')
+    app.register_blueprint(progress_bp, url_prefix='/api/progress')
+    app.register_blueprint(review_bp, url_prefix='/api/reviews')
+    app.register_blueprint(export_bp, url_prefix='/api/exports')
+
+    return app
 
 
 if __name__ == '__main__':
+    # Development server only; use wsgi.py (see gunicorn.conf.py) in production.
     # The server will run on http://127.0.0.1:5000
     # The debug=True flag allows the server to auto-reload when you save changes
-    app.run(debug=True, port=5000)
+    create_app().run(debug=True, port=5000)
@@ -0,0 +1,292 @@
+"""
+Shared fixtures: an SMTP stand-in on localhost and an in-memory double of
+the tables used by the password reset flow and the mail outbox.
+
+Run from the backend folder:
+    python -m pytest
+"""
+import os
+import re
+import socketserver
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from itertools import count
+
+# Cheap, in-process bcrypt for tests; must be set before core.security is imported
+os.environ.setdefault('BCRYPT_WORKERS', '0')
+os.environ.setdefault('BCRYPT_ROUNDS', '4')
+
+import pytest
+from flask import Flask
+
+
+# --- SMTP stand-in ---
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough SMTP for smtplib: EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP and QUIT."""
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode('ascii'))
+
+    def handle(self):
+        standin = self.server.standin
+        with standin.lock:
+            standin.connections += 1
+        self.reply("220 stand-in ready")
+        sender, recipients = None, []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('utf-8').strip()
+            verb = command[:4].upper()
+            if verb in ('EHLO', 'HELO'):
+                self.reply("250 stand-in")
+            elif verb == 'MAIL':
+                sender, recipients = command.split(':', 1)[1].strip().strip('<>'), []
+                self.reply("250 OK")
+            elif verb == 'RCPT':
+                address = command.split(':', 1)[1].strip().strip('<>')
+                if address in standin.refused:
+                    self.reply("550 No such user")
+                else:
+                    recipients.append(address)
+                    self.reply("250 OK")
+            elif verb == 'DATA':
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while True:
+                    line = self.rfile.readline()
+                    if not line or line == b'.\r\n':
+                        break
+                    data.append(line)
+                with standin.lock:
+                    standin.attempts += 1
+                    drop = standin.drop_at == standin.attempts
+                if drop:
+                    # Hang up without acknowledging the message, like a crashed or restarted server
+                    return
+                with standin.lock:
+                    standin.messages.append((sender, recipients, b''.join(data).decode('utf-8')))
+                self.reply("250 OK queued")
+            elif verb == 'RSET':
+                sender, recipients = None, []
+                self.reply("250 OK")
+            elif verb == 'NOOP':
+                self.reply("250 OK")
+            elif verb == 'QUIT':
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class SMTPStandIn:
+    """
+    A local SMTP server that records every accepted message.
+
+    `refused` holds addresses rejected at RCPT time; `drop_at` makes the
+    server hang up on the n-th DATA it receives (counted across connections).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.messages = []
+        self.connections = 0
+        self.attempts = 0
+        self.refused = set()
+        self.drop_at = None
+        self._server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), _SMTPHandler)
+        self._server.daemon_threads = True
+        self._server.standin = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._stopped = False
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._stopped:
+            return
+        self._stopped = True
+        self._server.shutdown()
+        self._server.server_close()
+
+    def recipients(self) -> list:
+        with self.lock:
+            return [address for _, recipients, _ in self.messages for address in recipients]
+
+
+@pytest.fixture
+def smtp_server():
+    standin = SMTPStandIn().start()
+    yield standin
+    standin.stop()
+
+
+# --- In-memory database double ---
+
+class FakeDB:
+    """
+    The Members, password_resets and mail_outbox rows the reset flow and the
+    outbox sender touch, with NOW() evaluated in Python.
+
+    Only the statements those modules issue are understood; anything else
+    fails the test, so a changed query can't silently bypass the double.
+    """
+
+    def __init__(self):
+        self.members = {}
+        self.password_resets = []
+        self.mail_outbox = {}
+        self._ids = count(1)
+
+    def add_member(self, email: str, name: str = 'Test Member', password: str = 'x') -> int:
+        member_ID = next(self._ids)
+        self.members[member_ID] = {'member_ID': member_ID, 'name': name, 'email': email, 'password': password}
+        return member_ID
+
+    def add_mail(self, recipient: str, subject: str = 'Hello', body: str = 'Body', **fields) -> int:
+        id_ = next(self._ids)
+        self.mail_outbox[id_] = {
+            'id': id_, 'recipient': recipient, 'subject': subject, 'body': body, 'status': 'pending',
+            'attempts': 0, 'next_attempt_at': datetime.now() - timedelta(seconds=1), 'last_error': None,
+            'sent_at': None, **fields,
+        }
+        return id_
+
+    def make_due(self) -> None:
+        """Moves every pending message's next attempt into the past, as if its backoff had elapsed."""
+        for mail in self.mail_outbox.values():
+            if mail['status'] == 'pending':
+                mail['next_attempt_at'] = datetime.now() - timedelta(seconds=1)
+
+    @contextmanager
+    def connection(self):
+        yield _FakeConnection(self)
+
+
+class _FakeConnection:
+    def __init__(self, db):
+        self.db = db
+
+    def cursor(self):
+        return _FakeCursor(self.db)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class _FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return list(self.rows)
+
+    def executemany(self, query, seq_params):
+        for params in seq_params:
+            self.execute(query, params)
+
+    def execute(self, query, params=()):
+        sql = re.sub(r'\s+', ' ', query).strip()
+        db, now = self.db, datetime.now()
+        self.rows, self.rowcount = [], 0
+
+        if sql.startswith("SELECT member_ID, name FROM Members WHERE email = %s"):
+            self.rows = [(m['member_ID'], m['name']) for m in db.members.values() if m['email'] == params[0]]
+        elif sql.startswith("SELECT 1 FROM password_resets WHERE member_id = %s AND created_at > NOW() - INTERVAL %s SECOND"):
+            member_ID, seconds = params
+            if any(r['member_id'] == member_ID and r['created_at'] > now - timedelta(seconds=seconds)
+                   for r in db.password_resets):
+                self.rows = [(1,)]
+        elif sql.startswith("INSERT INTO password_resets (member_id, token_hash, expires_at)"):
+            member_ID, token_hash, minutes = params
+            db.password_resets.append({'member_id': member_ID, 'token_hash': token_hash, 'used_at': None,
+                                       'expires_at': now + timedelta(minutes=minutes), 'created_at': now})
+        elif sql.startswith("INSERT INTO mail_outbox (recipient, subject, body)"):
+            db.add_mail(*params)
+        elif sql.startswith("SELECT member_id FROM password_resets WHERE token_hash = %s AND used_at IS NULL AND expires_at > NOW()"):
+            self.rows = [(r['member_id'],) for r in db.password_resets
+                         if r['token_hash'] == params[0] and r['used_at'] is None and r['expires_at'] > now]
+        elif sql.startswith("UPDATE Members SET password = %s WHERE member_ID = %s"):
+            db.members[params[1]]['password'] = params[0]
+        elif sql.startswith("UPDATE password_resets SET used_at = NOW() WHERE member_id = %s AND used_at IS NULL"):
+            for r in db.password_resets:
+                if r['member_id'] == params[0] and r['used_at'] is None:
+                    r['used_at'] = now
+        elif sql.startswith("SELECT id, recipient, subject, body, attempts FROM mail_outbox WHERE status = 'pending' AND next_attempt_at <= NOW()"):
+            due = sorted((m for m in db.mail_outbox.values()
+                          if m['status'] == 'pending' and m['next_attempt_at'] <= now),
+                         key=lambda m: (m['next_attempt_at'], m['id']))
+            self.rows = [(m['id'], m['recipient'], m['subject'], m['body'], m['attempts']) for m in due[:params[0]]]
+        elif sql.startswith("UPDATE mail_outbox SET attempts = attempts + 1, next_attempt_at = NOW() + INTERVAL %s SECOND WHERE id IN"):
+            for id_ in params[1:]:
+                db.mail_outbox[id_]['attempts'] += 1
+                db.mail_outbox[id_]['next_attempt_at'] = now + timedelta(seconds=params[0])
+        elif sql.startswith("UPDATE mail_outbox SET status = 'sent', sent_at = NOW(), last_error = NULL, body = '' WHERE id IN"):
+            for id_ in params:
+                db.mail_outbox[id_].update(status='sent', sent_at=now, last_error=None, body='')
+        elif sql.startswith("UPDATE mail_outbox SET next_attempt_at = NOW() + INTERVAL %s SECOND, last_error = %s WHERE id = %s"):
+            seconds, error, id_ = params
+            db.mail_outbox[id_].update(next_attempt_at=now + timedelta(seconds=seconds), last_error=error)
+        elif sql.startswith("UPDATE mail_outbox SET status = 'failed', last_error = %s, body = '' WHERE id = %s"):
+            error, id_ = params
+            db.mail_outbox[id_].update(status='failed', last_error=error, body='')
+        else:
+            raise AssertionError(f"FakeDB does not understand: {sql}")
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    import core.mail_outbox
+    import api.password_reset
+
+    db = FakeDB()
+    monkeypatch.setattr(core.mail_outbox, 'db_connection', db.connection)
+    monkeypatch.setattr(api.password_reset, 'db_connection', db.connection)
+    return db
+
+
+# --- Mail sender and app ---
+
+@pytest.fixture
+def make_sender(smtp_server, fake_db):
+    """Builds OutboxSender instances bound to a mail-only app that points at the stand-in."""
+    from core.mail_outbox import OutboxSender
+
+    def make(**kwargs):
+        mail_app = Flask('mail-test')
+        mail_app.config.update(MAIL_SERVER='127.0.0.1', MAIL_PORT=smtp_server.port, MAIL_SUPPRESS_SEND=False,
+                               MAIL_DEFAULT_SENDER='no-reply@gymmonk.test')
+        sender = OutboxSender(**kwargs)
+        sender.init_app(mail_app)
+        return sender
+    return make
+
+
+@pytest.fixture
+def client(fake_db):
+    """A test client serving the auth routes against the database double."""
+    from api.auth_routes import auth_bp
+
+    app = Flask('auth-test')
+    app.register_blueprint(auth_bp, url_prefix='/api/auth')
+    return app.test_client()
@@ -0,0 +1,48 @@
+import threading
+import time
+
+from database.batch_writer import BatchWriter
+
+
+def _writer(monkeypatch, **kwargs):
+    """A BatchWriter whose writes are recorded instead of sent to MySQL; `gate` holds every write until set."""
+    writer = BatchWriter('test-writer', **kwargs)
+    writer.written, writer.gate = [], threading.Event()
+
+    def write(batch):
+        writer.gate.wait()
+        writer.written.extend(row for rows in batch.values() for row in rows)
+    monkeypatch.setattr(writer, '_write', write)
+    return writer
+
+
+def test_full_queue_blocks_the_producer_instead_of_losing_rows(monkeypatch):
+    writer = _writer(monkeypatch, batch_size=1, flush_interval=0.01, max_queue=2, put_timeout=0.01)
+    for i in range(3):
+        writer.submit("INSERT", (i,))
+    time.sleep(0.05)
+
+    done = threading.Event()
+    threading.Thread(target=lambda: (writer.submit("INSERT", (3,)), done.set()), daemon=True).start()
+    assert not done.wait(0.2)
+
+    writer.gate.set()
+    assert done.wait(2)
+    writer.stop()
+    assert writer.written == [(0,), (1,), (2,), (3,)]
+    assert writer.stats()['blocked_submits'] == 1
+    assert writer.stats()['rows_rejected'] == 0
+
+
+def test_non_blocking_submit_reports_a_full_queue(monkeypatch):
+    writer = _writer(monkeypatch, batch_size=1, flush_interval=0.01, max_queue=1, put_timeout=0.01)
+    writer.submit("INSERT", (0,))
+    time.sleep(0.05)
+    assert writer.submit("INSERT", (1,), block=False)
+
+    assert writer.submit("INSERT", (2,), block=False) is False
+
+    writer.gate.set()
+    writer.stop()
+    assert writer.written == [(0,), (1,)]
+    assert writer.stats()['rows_rejected'] == 1
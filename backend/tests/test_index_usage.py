@@ -0,0 +1,115 @@
+"""
+EXPLAIN regression test for the hot queries in database.migrations.HOT_QUERIES.
+
+Seeds enough rows for the optimizer's choice to mean something, refreshes
+the table statistics with ANALYZE TABLE and asserts that each hot query
+uses its index, so a dropped index or a query rewrite that stops using
+one fails the suite.
+
+It needs a throwaway MySQL server and only runs when asked to:
+    RUN_DB_TESTS=1 MYSQL_PORT=3307 MYSQL_PASSWORD=bench python -m pytest tests/test_index_usage.py
+(e.g. after `docker run -d -p 3307:3306 -e MYSQL_ROOT_PASSWORD=bench mysql:8`). Seeded rows
+use example.test addresses and are kept, so re-runs only top the tables up.
+"""
+import os
+import random
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from database.migrations import HOT_QUERIES
+
+pytestmark = pytest.mark.skipif(
+    os.getenv('RUN_DB_TESTS', '').lower() not in ('1', 'true', 'yes'),
+    reason="needs a throwaway MySQL server; set RUN_DB_TESTS=1 and MYSQL_HOST/MYSQL_PORT/MYSQL_PASSWORD"
+)
+
+# Rows per seeded table; well above the sizes where a table scan is the cheaper plan
+SEED_MEMBERS = 5000
+SEED_ROWS = 20000
+
+FIRST_NAMES = ['John', 'Joanna', 'Maya', 'Liam', 'Zara', 'Noah', 'Isha', 'Omar', 'Chloe', 'Ravi', 'Elena', 'Kenji']
+LAST_NAMES = ['Sharma', 'Smith', 'Khan', 'Garcia', 'Chen', 'Patel', 'Nguyen', 'Silva', 'Mehta', 'Brown']
+PLANS = ['Monthly', 'Quarterly', 'Yearly']
+CATEGORIES = ['Equipment', 'Trainer', 'Cleanliness', 'Staff']
+# Ten years of history, so the one-day and one-month ranges in HOT_QUERIES are a small slice
+HISTORY_START, HISTORY_DAYS = date(2016, 1, 1), 3650
+
+
+def _top_up(cursor, table: str, target: int, insert: str, make_row) -> None:
+    """Inserts rows made by make_row() until `table` holds at least `target` rows."""
+    cursor.execute(f"SELECT COUNT(*) FROM {table}")
+    missing = target - cursor.fetchone()[0]
+    for start in range(0, max(missing, 0), 1000):
+        cursor.executemany(insert, [make_row() for _ in range(min(1000, missing - start))])
+
+
+def _seed(conn) -> None:
+    rng = random.Random(2024)
+
+    def day() -> date:
+        return HISTORY_START + timedelta(days=rng.randrange(HISTORY_DAYS))
+
+    def moment() -> datetime:
+        return datetime.combine(day(), time(rng.randrange(6, 22), rng.randrange(60)))
+
+    with conn.cursor() as cursor:
+        cursor.executemany(
+            "INSERT IGNORE INTO Members (name, email, password, phone_number, membership_plan, join_date) "
+            "VALUES (%s, %s, %s, %s, %s, %s)",
+            [(f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", f"index.member{i}@example.test", 'x',
+              f"556{i:07d}", rng.choice(PLANS), day()) for i in range(1, SEED_MEMBERS + 1)]
+        )
+        cursor.execute("SELECT member_ID FROM Members")
+        member_ids = [row[0] for row in cursor.fetchall()]
+
+        def visit():
+            check_in = moment()
+            return rng.choice(member_ids), check_in, check_in + timedelta(minutes=rng.randrange(30, 120))
+
+        _top_up(cursor, 'attendance', SEED_ROWS,
+                "INSERT INTO attendance (mem_id, check_in, check_out) VALUES (%s, %s, %s)", visit)
+        _top_up(cursor, 'payments', SEED_ROWS,
+                "INSERT INTO payments (mem_id, amount, payment_date, payment_method, plan_type, status) "
+                "VALUES (%s, %s, %s, %s, %s, %s)",
+                lambda: (rng.choice(member_ids), rng.randrange(20, 500), day(), rng.choice(['card', 'cash', 'upi']),
+                         rng.choice(PLANS), rng.choices(['paid', 'pending', 'failed'], weights=[90, 7, 3])[0]))
+        _top_up(cursor, 'progress_logs', SEED_ROWS,
+                "INSERT INTO progress_logs (mem_id, log_date, weight_kg, body_fat_pct) VALUES (%s, %s, %s, %s)",
+                lambda: (rng.choice(member_ids), day(), rng.randrange(50, 110), rng.randrange(10, 35)))
+        _top_up(cursor, 'reviews', SEED_ROWS,
+                "INSERT INTO reviews (member_id, rating, review_text, category, submitted_at) VALUES (%s, %s, %s, %s, %s)",
+                lambda: (rng.choice(member_ids), rng.randint(1, 5), 'Seeded review', rng.choice(CATEGORIES), moment()))
+        _top_up(cursor, 'MLD', SEED_ROWS,
+                "INSERT INTO MLD (mem_id, login_time) VALUES (%s, %s)",
+                lambda: (rng.choice(member_ids), moment()))
+        # Almost everything in a real outbox has been sent; the due index serves the few pending rows
+        _top_up(cursor, 'mail_outbox', SEED_ROWS,
+                "INSERT INTO mail_outbox (recipient, subject, body, status, next_attempt_at) VALUES (%s, %s, %s, %s, %s)",
+                lambda: ('index.member@example.test', 'Seeded', 'Seeded',
+                         rng.choices(['sent', 'pending', 'failed'], weights=[95, 4, 1])[0], moment()))
+        conn.commit()
+
+        # Fresh statistics, so the plans reflect the seeded data rather than a stale estimate
+        for table in ('Members', 'attendance', 'payments', 'progress_logs', 'reviews', 'MLD', 'mail_outbox'):
+            cursor.execute(f"ANALYZE TABLE {table}")
+            cursor.fetchall()
+
+
+@pytest.fixture(scope='module')
+def index_report():
+    from database.connection import db_connection, setup_database
+    from database.migrations import check_index_usage
+
+    setup_database()
+    with db_connection() as conn:
+        _seed(conn)
+        return {row['query']: row for row in check_index_usage(conn)}
+
+
+@pytest.mark.parametrize('name', [name for name, _, _ in HOT_QUERIES])
+def test_hot_query_uses_its_index(index_report, name):
+    row = index_report[name]
+    assert row['key'] == row['expected'], (
+        f"{name} uses {row['key']!r} instead of {row['expected']} (possible keys: {row['possible_keys']})"
+    )
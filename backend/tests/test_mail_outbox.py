@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from core import mail_outbox
+from core.mail_outbox import MAIL_MAX_ATTEMPTS, MAIL_RETRY_BASE
+
+
+def _assert_retry_in(mail: dict, seconds: int) -> None:
+    delay = (mail['next_attempt_at'] - datetime.now()).total_seconds()
+    assert seconds - 5 < delay <= seconds
+
+
+def test_drain_sends_everything_due_over_one_connection(make_sender, smtp_server, fake_db):
+    """Claims run in batches, but every batch reuses the connection opened for the first."""
+    sender = make_sender(batch_size=2)
+    ids = [fake_db.add_mail(f"member{i}@example.com", subject=f"Message {i}") for i in range(5)]
+    fake_db.add_mail("later@example.com", next_attempt_at=datetime.now() + timedelta(hours=1))
+
+    assert sender.drain() == 5
+
+    assert sorted(smtp_server.recipients()) == [f"member{i}@example.com" for i in range(5)]
+    assert smtp_server.connections == 1
+    assert all(fake_db.mail_outbox[id_]['status'] == 'sent' for id_ in ids)
+    assert fake_db.mail_outbox[6]['status'] == 'pending'
+    assert sender.stats()['sent'] == 5
+    assert sender.stats()['smtp_connections'] == 1
+
+
+def test_drain_with_nothing_due_opens_no_connection(make_sender, smtp_server, fake_db):
+    sender = make_sender()
+    fake_db.add_mail("later@example.com", next_attempt_at=datetime.now() + timedelta(hours=1))
+
+    assert sender.drain() == 0
+    assert smtp_server.connections == 0
+
+
+def test_refused_recipient_is_rescheduled_and_the_rest_still_go_out(make_sender, smtp_server, fake_db):
+    sender = make_sender()
+    smtp_server.refused.add("bounce@example.com")
+    ok_before = fake_db.add_mail("first@example.com")
+    refused = fake_db.add_mail("bounce@example.com")
+    ok_after = fake_db.add_mail("last@example.com")
+
+    assert sender.drain() == 3
+
+    assert smtp_server.recipients() == ["first@example.com", "last@example.com"]
+    assert smtp_server.connections == 1
+    assert fake_db.mail_outbox[ok_before]['status'] == 'sent'
+    assert fake_db.mail_outbox[ok_after]['status'] == 'sent'
+    mail = fake_db.mail_outbox[refused]
+    assert mail['status'] == 'pending'
+    assert mail['attempts'] == 1
+    assert 'bounce@example.com' in mail['last_error']
+    _assert_retry_in(mail, MAIL_RETRY_BASE)
+    assert sender.stats()['retried'] == 1
+
+
+def test_retry_delay_doubles_with_each_attempt(make_sender, smtp_server, fake_db):
+    sender = make_sender()
+    smtp_server.refused.add("bounce@example.com")
+    id_ = fake_db.add_mail("bounce@example.com", attempts=2)
+
+    sender.drain()
+
+    mail = fake_db.mail_outbox[id_]
+    assert mail['attempts'] == 3
+    _assert_retry_in(mail, MAIL_RETRY_BASE * 4)
+
+
+def test_retry_delay_is_capped(make_sender, smtp_server, fake_db, monkeypatch):
+    monkeypatch.setattr(mail_outbox, 'MAIL_MAX_ATTEMPTS', 20)
+    sender = make_sender()
+    smtp_server.refused.add("bounce@example.com")
+    id_ = fake_db.add_mail("bounce@example.com", attempts=15)
+
+    sender.drain()
+
+    _assert_retry_in(fake_db.mail_outbox[id_], mail_outbox.MAIL_RETRY_MAX)
+
+
+def test_gives_up_after_the_last_attempt(make_sender, smtp_server, fake_db):
+    sender = make_sender()
+    smtp_server.refused.add("bounce@example.com")
+    id_ = fake_db.add_mail("bounce@example.com", attempts=MAIL_MAX_ATTEMPTS - 1)
+
+    sender.drain()
+
+    mail = fake_db.mail_outbox[id_]
+    assert mail['status'] == 'failed'
+    assert mail['attempts'] == MAIL_MAX_ATTEMPTS
+    assert mail['body'] == ''
+    assert sender.stats()['failed'] == 1
+
+    # A failed message is never claimed again
+    fake_db.make_due()
+    assert sender.drain() == 0
+
+
+def test_dropped_connection_reschedules_the_unsent_rest(make_sender, smtp_server, fake_db):
+    """The server hangs up on the second message: the first stays sent, the others are retried later."""
+    sender = make_sender()
+    smtp_server.drop_at = 2
+    ids = [fake_db.add_mail(f"member{i}@example.com") for i in range(4)]
+
+    assert sender.drain() == 4
+
+    assert smtp_server.recipients() == ["member0@example.com"]
+    assert fake_db.mail_outbox[ids[0]]['status'] == 'sent'
+    for id_ in ids[1:]:
+        mail = fake_db.mail_outbox[id_]
+        assert mail['status'] == 'pending'
+        assert mail['attempts'] == 1
+        _assert_retry_in(mail, MAIL_RETRY_BASE)
+
+    # Once the backoff has elapsed the rest go out over a new connection, the sent one is not repeated
+    fake_db.make_due()
+    assert sender.drain() == 3
+    assert sorted(smtp_server.recipients()) == [f"member{i}@example.com" for i in range(4)]
+    assert smtp_server.connections == 2
+    assert all(fake_db.mail_outbox[id_]['status'] == 'sent' for id_ in ids)
+
+
+def test_unreachable_server_reschedules_the_batch(make_sender, smtp_server, fake_db):
+    sender = make_sender()
+    smtp_server.stop()
+    ids = [fake_db.add_mail(f"member{i}@example.com") for i in range(3)]
+
+    assert sender.drain() == 3
+
+    for id_ in ids:
+        mail = fake_db.mail_outbox[id_]
+        assert mail['status'] == 'pending'
+        assert mail['attempts'] == 1
+        assert mail['last_error']
+    assert sender.stats()['smtp_connections'] == 0
+
+
+@pytest.mark.parametrize('batch_size', [1, 50])
+def test_message_content_reaches_the_server(make_sender, smtp_server, fake_db, batch_size):
+    sender = make_sender(batch_size=batch_size)
+    fake_db.add_mail("member@example.com", subject="Reset your password", body="Open this link")
+
+    sender.drain()
+
+    mail_from, recipients, data = smtp_server.messages[0]
+    assert mail_from == "no-reply@gymmonk.test"
+    assert recipients == ["member@example.com"]
+    assert "Subject: Reset your password" in data
+    assert "Open this link" in data
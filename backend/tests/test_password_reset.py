@@ -0,0 +1,81 @@
+import logging
+import re
+
+from core.security import verify_password
+
+
+def _token_from(message: str) -> str:
+    return re.search(r'\?token=([\w-]+)', message).group(1)
+
+
+def test_reset_flow_end_to_end(client, make_sender, smtp_server, fake_db):
+    """Request a reset, deliver the email through the outbox, then use its link once."""
+    member_ID = fake_db.add_member("member@example.com", name="Asha")
+
+    response = client.post('/api/auth/forgot-password', json={"email": "member@example.com"})
+    assert response.status_code == 200
+    assert [m['recipient'] for m in fake_db.mail_outbox.values()] == ["member@example.com"]
+    # The request itself sends nothing; delivery is the outbox sender's job
+    assert smtp_server.messages == []
+
+    make_sender().drain()
+    _, recipients, data = smtp_server.messages[0]
+    assert recipients == ["member@example.com"]
+    assert "Hi Asha" in data
+    token = _token_from(data)
+    # Only the token's hash is stored, and the delivered email no longer holds the link
+    assert all(token not in str(r) for r in fake_db.password_resets)
+    assert all(token not in str(m) for m in fake_db.mail_outbox.values())
+
+    response = client.post('/api/auth/reset-password', json={"token": token, "new_password": "n3w-passw0rd"})
+    assert response.status_code == 200
+    assert verify_password("n3w-passw0rd", fake_db.members[member_ID]['password'])
+
+    response = client.post('/api/auth/reset-password', json={"token": token, "new_password": "an0ther-one"})
+    assert response.status_code == 400
+    assert verify_password("n3w-passw0rd", fake_db.members[member_ID]['password'])
+
+
+def test_repeat_requests_within_the_cooldown_send_one_email(client, fake_db):
+    fake_db.add_member("member@example.com")
+
+    for _ in range(3):
+        assert client.post('/api/auth/forgot-password', json={"email": "member@example.com"}).status_code == 200
+
+    assert len(fake_db.mail_outbox) == 1
+
+
+def test_unknown_email_looks_the_same_and_is_not_logged(client, fake_db, caplog):
+    fake_db.add_member("member@example.com")
+
+    with caplog.at_level(logging.DEBUG):
+        unknown = client.post('/api/auth/forgot-password', json={"email": "stranger@example.com"})
+    known = client.post('/api/auth/forgot-password', json={"email": "member@example.com"})
+
+    assert unknown.status_code == known.status_code == 200
+    assert unknown.get_json() == known.get_json()
+    assert [m['recipient'] for m in fake_db.mail_outbox.values()] == ["member@example.com"]
+    assert "stranger@example.com" not in caplog.text
+
+
+def test_forgot_password_requires_an_email(client, fake_db):
+    assert client.post('/api/auth/forgot-password', json={}).status_code == 400
+    assert client.post('/api/auth/forgot-password', json={"email": ["a@example.com"]}).status_code == 400
+    assert fake_db.mail_outbox == {}
+
+
+def test_non_object_bodies_are_rejected(client, fake_db):
+    for route in ('/api/auth/forgot-password', '/api/auth/reset-password'):
+        assert client.post(route, json=["member@example.com"]).status_code == 400
+        assert client.post(route, json="member@example.com").status_code == 400
+
+
+def test_reset_rejects_bad_tokens_and_short_passwords(client, fake_db):
+    response = client.post('/api/auth/reset-password', json={"token": "not-a-token", "new_password": "long-enough"})
+    assert response.status_code == 400
+
+    response = client.post('/api/auth/reset-password', json={"token": "not-a-token", "new_password": "short"})
+    assert response.status_code == 422
+
+    response = client.post('/api/auth/reset-password', json={"new_password": "long-enough"})
+    assert response.status_code == 400
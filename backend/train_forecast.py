@@ -0,0 +1,35 @@
+import argparse
+import logging
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+from api.forecast import MODEL_PATH, hourly_visits_from_csv, hourly_visits_from_db, train
+
+# Configure logging for the training script
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def main():
+    """
+    Retrains the peak-hour traffic forecast.
+
+    Meant to run on a schedule (e.g. nightly cron), never on the request
+    path. The running API picks up the new model file automatically.
+    """
+    parser = argparse.ArgumentParser(description="Train the gym traffic forecast model.")
+    parser.add_argument('--csv', help="Train from a turnstile dump instead of the attendance rollup")
+    parser.add_argument('--output', default=MODEL_PATH, help="Where to save the fitted model")
+    args = parser.parse_args()
+
+    counts = hourly_visits_from_csv(args.csv) if args.csv else hourly_visits_from_db()
+    summary = train(counts, path=args.output)
+
+    print("--- Forecast model trained ---")
+    for key, value in summary.items():
+        print(f"   - {key}: {value}")
+
+
+if __name__ == '__main__':
+    main()
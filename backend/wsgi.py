@@ -0,0 +1,12 @@
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+from main import create_app
+
+# Production entry point, served by a pre-forking WSGI server:
+#     gunicorn -c gunicorn.conf.py wsgi:app
+# The app (and the schema check) is built once in the master process;
+# gunicorn.conf.py resets per-process state in each forked worker.
+app = create_app()